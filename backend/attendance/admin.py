@@ -1,7 +1,32 @@
 from django.contrib import admin
+from edu_track.admin import LargeTableAdmin
 from .models import Attendance, StudentAttendance, StudentMark
 
 # Register your models here.
-admin.site.register(Attendance)
-admin.site.register(StudentAttendance)
-admin.site.register(StudentMark)
\ No newline at end of file
+@admin.register(Attendance)
+class AttendanceAdmin(LargeTableAdmin):
+    list_display = ('lecture', 'time')
+    # __str__ shows the course title
+    list_select_related = ('lecture__course', 'lecture__location')
+    raw_id_fields = ('lecture',)
+    ordering = ('-id',)
+
+
+@admin.register(StudentAttendance)
+class StudentAttendanceAdmin(LargeTableAdmin):
+    list_display = ('student', 'attendance', 'present', 'ip')
+    # __str__ goes student -> attendance -> lecture -> course
+    list_select_related = ('student', 'attendance__lecture__course')
+    list_filter = ('present',)
+    search_fields = ('student__username__exact',)
+    raw_id_fields = ('attendance', 'student')
+    ordering = ('-id',)
+
+
+@admin.register(StudentMark)
+class StudentMarkAdmin(LargeTableAdmin):
+    list_display = ('student', 'lecture', 'attendance_mark', 'instructor_mark', 'final_mark')
+    list_select_related = ('student', 'lecture__course', 'lecture__location')
+    search_fields = ('student__username__exact',)
+    raw_id_fields = ('student', 'lecture')
+    ordering = ('-id',)
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.4 on 2026-10-19 00:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0004_alter_studentattendance_ip'),
+        ('lecture', '0006_clash_check_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['lecture', 'time'], name='attendance_lecture_time'),
+        ),
+        migrations.AddIndex(
+            model_name='studentattendance',
+            index=models.Index(condition=models.Q(('present', True)), fields=['student', 'attendance'], name='student_attendance_present'),
+        ),
+    ]
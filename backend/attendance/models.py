@@ -12,6 +12,9 @@ class Attendance(models.Model):
     lecture = models.ForeignKey(Lecture, on_delete=models.CASCADE, related_name="attendances")
     time = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [models.Index(fields=['lecture', 'time'], name='attendance_lecture_time')]
+
     def clean(self):
         checktime = self.time or timezone.now()
         day = weekday[checktime.weekday()]
@@ -32,6 +35,11 @@ class StudentAttendance(models.Model):
 
     class Meta:
         unique_together = ("attendance", "student")
+        indexes = [
+            # calculate_attendance_mark counts a student's present rows per lecture. Partial, because
+            # Django filters present=True as a bare `WHERE present`, which a (student, present) index can't seek on
+            models.Index(fields=['student', 'attendance'], condition=models.Q(present=True), name='student_attendance_present'),
+        ]
 
     def __str__(self):
         return f"{self.student.username} - {self.attendance.lecture.course.title} ({'Present' if self.present else 'Absent'})"
@@ -1,3 +1,64 @@
-from django.test import TestCase
+from edu_track.testing import QueryBudgetTestCase
+from .models import Attendance, StudentAttendance, StudentMark
 
-# Create your tests here.
+
+class AttendanceQueryBudgetTests(QueryBudgetTestCase):
+    routes = {
+        "Attendance-list", "Attendance-create", "Attendance-retrieve",
+        "StudentAttendance-list", "StudentAttendance-create", "StudentAttendance-retrieve", "StudentAttendance-update",
+        "StudentMark-list", "StudentMark-create", "StudentMark-retrieve", "StudentMark-update", "StudentMark-recalculate",
+    }
+
+    def own_attendance(self):
+        return StudentAttendance.objects.filter(student=self.user).first()
+
+    def test_list_attendance(self):
+        self.assertBudget("get", "/attendance/", 2)
+
+    def test_retrieve_attendance(self):
+        self.assertBudget("get", f"/attendance/{self.data.attendances[0].id}/", 2)
+
+    def test_create_attendance(self):
+        self.assertBudget("post", "/attendance/create/", 104, status=201, data={"lecture": self.data.lectures[0].id})
+
+    def test_list_student_attendance(self):
+        self.assertBudget("get", "/attendance/students/", 2)
+
+    def test_retrieve_student_attendance(self):
+        self.assertBudget("get", f"/attendance/students/{self.own_attendance().id}/", 2)
+
+    def test_create_student_attendance(self):
+        attendance = Attendance.objects.create(lecture=self.data.lectures[0])
+        self.assertBudget("post", "/attendance/students/create/", 5, status=201, data={
+            # A student outside the lecture, who got no row when the session was opened
+            "attendance": attendance.id, "student": self.data.students[-1].id, "present": True,
+        })
+
+    def test_update_own_attendance(self):
+        self.assertBudget("patch", f"/attendance/students/{self.own_attendance().id}/update/", 4, data={"present": True})
+
+    def test_list_marks(self):
+        self.assertBudget("get", "/attendance/marks/", 2)
+
+    def test_retrieve_mark(self):
+        mark = StudentMark.objects.filter(student=self.user).first()
+        self.assertBudget("get", f"/attendance/marks/{mark.id}/", 2)
+
+    def test_create_mark_updates_existing(self):
+        mark = StudentMark.objects.filter(student=self.user).first()
+        self.assertBudget("post", "/attendance/marks/create/", 3, data={
+            "student": self.user.id, "lecture": mark.lecture_id, "instructor_mark": 20,
+        })
+
+    def test_update_mark(self):
+        mark = StudentMark.objects.filter(student=self.user).first()
+        self.assertBudget("patch", f"/attendance/marks/{mark.id}/update/", 5, data={"instructor_mark": 12})
+
+    def test_recalculate(self):
+        self.assertBudget("post", "/attendance/marks/recalculate/", 127, data={"lecture_id": self.data.lectures[0].id})
+
+    def test_hot_filters_use_indexes(self):
+        lecture = self.data.lectures[0]
+        self.assertUsesIndex(StudentMark.objects.filter(lecture=lecture))
+        self.assertUsesIndex(Attendance.objects.filter(lecture=lecture))
+        self.assertUsesIndex(StudentAttendance.objects.filter(attendance__lecture=lecture, student=self.user, present=True))
@@ -2,4 +2,10 @@ from django.contrib import admin
 from .models import Course
 
 # Register your models here.
-admin.site.register(Course)
\ No newline at end of file
+@admin.register(Course)
+class CourseAdmin(admin.ModelAdmin):
+    list_display = ('title', 'slug')
+    list_filter = ('programs__faculty',)
+    ordering = ('title',)
+    search_fields = ('title', 'slug')
+    autocomplete_fields = ('programs',)
@@ -0,0 +1,10 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from edu_track.catalog import bump_catalog_version
+from edu_track.conditional import track_versions
+from .models import Course
+
+post_save.connect(bump_catalog_version, sender=Course, dispatch_uid="course_catalog_version_save")
+post_delete.connect(bump_catalog_version, sender=Course, dispatch_uid="course_catalog_version_delete")
+m2m_changed.connect(bump_catalog_version, sender=Course.programs.through, dispatch_uid="course_catalog_version_programs")
+
+track_versions(Course)
@@ -1,3 +1,119 @@
+from unittest import mock
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import caches
 from django.test import TestCase
+from rest_framework.test import APIClient
+from edu_track.response_cache import response_cache
+from edu_track.testing import QueryBudgetTestCase
+from faculty.models import Faculty
+from program.models import Program
+from university.models import University
+from user.models import User
+from .models import Course
 
-# Create your tests here.
+
+class CourseQueryBudgetTests(QueryBudgetTestCase):
+    routes = {"Course-list", "Course-create", "Course-retrieve", "Course-update", "Course-destroy"}
+
+    def test_list(self):
+        self.assertBudget("get", "/course/", 5)
+
+    def test_list_cached(self):
+        self.client.get("/course/")
+        self.assertBudget("get", "/course/", 3)
+
+    def test_retrieve(self):
+        self.assertBudget("get", "/course/course-0/", 4)
+
+    def test_create(self):
+        self.assertBudget("post", "/course/create/", 10, status=201, data={
+            "title": "Course X", "slug": "course-x", "programs": [program.id for program in self.data.programs[:3]],
+        })
+
+    def test_update(self):
+        self.assertBudget("patch", "/course/course-0/update/", 4, data={"title": "Renamed"})
+
+    def test_destroy(self):
+        Course.objects.create(title="Empty", slug="empty")
+        self.assertBudget("delete", "/course/empty/delete/", 6, status=204)
+
+
+class CourseReadCachingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username="reader", email="reader@edutrack.test")
+        cls.group = Group.objects.create(name="Readers")
+        cls.group.permissions.set(Permission.objects.filter(content_type__app_label="course"))
+        cls.user.groups.add(cls.group)
+        cls.course = Course.objects.create(title="Algorithms", slug="algorithms")
+
+    def setUp(self):
+        for alias in ("default", "responses"):
+            caches[alias].clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_versions_shared_with_the_response_cache(self):
+        url = f"/course/{self.course.slug}/"
+        etag = self.client.get(url)["ETag"]
+        # Another worker has its own default cache but shares the response cache, and with it the versions
+        caches["default"].clear()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        caches["responses"].clear()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_etag_304_until_a_change(self):
+        url = f"/course/{self.course.slug}/"
+        etag = self.client.get(url)["ETag"]
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual((response.status_code, response.content), (304, b""))
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=f'W/{etag}, "other"').status_code, 304)
+
+        # Any save of the model bumps its version, so the old ETag no longer matches
+        Course.objects.create(title="Unrelated", slug="unrelated")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+        etag = response["ETag"]
+        self.course.programs.add(Program.objects.create(name="CS", slug="cs", faculty=self.faculty()))
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_etag_depends_on_permission_scope(self):
+        url = "/course/"
+        etag = self.client.get(url)["ETag"]
+        other = User.objects.create(username="other", email="other@edutrack.test")
+        other.groups.add(self.group, Group.objects.create(name="Extra"))
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def faculty(self):
+        university = University.objects.create(name="EduTrack", slug="edutrack", logo="")
+        return Faculty.objects.create(name="Science", slug="science", logo="", university=university)
+
+    def test_response_cache_invalidation(self):
+        self.assertEqual(self.client.get("/course/")["X-Cache"], "MISS")
+        self.assertEqual(self.client.get("/course/")["X-Cache"], "HIT")
+        Course.objects.create(title="Compilers", slug="compilers")
+        response = self.client.get("/course/")
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(len(response.data), 2)
+
+    def test_single_flight(self):
+        cache = response_cache()
+        entry = ([{"id": 1}], {})
+        # Another worker holds the lock and stores the entry while this one waits
+        with mock.patch.object(cache, "add", return_value=False), \
+                mock.patch.object(cache, "get", side_effect=[None, None, entry]), \
+                mock.patch.object(cache, "delete") as delete:
+            response = self.client.get("/course/")
+        self.assertEqual((response["X-Cache"], response.data), ("HIT", [{"id": 1}]))
+        delete.assert_not_called()
+
+        # A waiter that times out computes the response itself but leaves the owner's lock alone
+        with mock.patch("edu_track.response_cache.SINGLE_FLIGHT_WAIT", 0.01), \
+                mock.patch.object(cache, "add", return_value=False), \
+                mock.patch.object(cache, "delete") as delete:
+            response = self.client.get("/course/")
+        self.assertEqual(response["X-Cache"], "MISS")
+        delete.assert_not_called()
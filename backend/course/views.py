@@ -1,11 +1,15 @@
 from rest_framework.generics import ListAPIView, CreateAPIView, RetrieveAPIView, DestroyAPIView, UpdateAPIView
+from edu_track.conditional import ConditionalGetMixin
+from edu_track.response_cache import CachedResponseMixin
 from .models import Course
 from .serializers import CourseSerializer
 from  user.permissions import GroupPermission
 
 # Create your views here.
-class ListCourse(ListAPIView):
-    queryset =  Course.objects.all()
+class ListCourse(ConditionalGetMixin, CachedResponseMixin, ListAPIView):
+    etag_models = (Course,)
+    cache_timeout = 30 * 60
+    queryset =  Course.objects.prefetch_related('programs')
     serializer_class = CourseSerializer
     permission_classes = [type('CustomPerm',(GroupPermission,),{'required_permission': 'course.view_course'})]
 
@@ -14,7 +18,8 @@ class CreateCourse(CreateAPIView):
     serializer_class = CourseSerializer
     permission_classes = [type('CustomPerm',(GroupPermission,),{'required_permission': 'course.add_course'})]
 
-class RetrieveCourse(RetrieveAPIView):
+class RetrieveCourse(ConditionalGetMixin, RetrieveAPIView):
+    etag_models = (Course,)
     queryset =  Course.objects.all()
     serializer_class = CourseSerializer
     lookup_field = "slug"
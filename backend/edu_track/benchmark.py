@@ -0,0 +1,324 @@
+"""
+Scenario load benchmarks against a local server seeded by generate_university.
+
+Each scenario is a generator that yields waves of API calls: the calls of one
+wave run concurrently on `users` worker threads (the virtual users), and the
+wave's parsed responses are sent back into the generator so it can build the
+next one. The data each scenario needs (lectures, enrolled students, marks) is
+read from the same database the server uses, and every virtual user gets a JWT
+minted locally, so no time is spent logging in.
+
+Scenarios write to the database (attendance sessions, marks, enrolments,
+imported users); for comparable numbers run them on a freshly generated one.
+"""
+import datetime
+import json
+import os
+import platform
+import threading
+import time
+from collections import defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from urllib.parse import urlsplit
+import numpy as np
+import pandas as pd
+import requests
+from django.conf import settings
+from django.db.models import Count
+from rest_framework_simplejwt.tokens import RefreshToken
+from attendance.models import StudentAttendance, StudentMark
+from lecture.models import Lecture
+from program.models import Program
+from user.models import User
+
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1"}
+REQUEST_TIMEOUT = 120
+# Endpoints with fewer requests than this are compared but never flagged, their p95 is noise
+MIN_COMPARED_REQUESTS = 20
+# Students per uploaded roster; each new one costs a password hash
+ROSTER_ROWS = 20
+XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# `label` groups latencies per endpoint, so it holds the route, not the ids
+Call = namedtuple("Call", "user method path label data files expect", defaults=(None, None, (200,)))
+
+
+class BenchmarkError(Exception):
+    pass
+
+
+def baseline_path():
+    return getattr(settings, "BENCHMARK_BASELINE", os.path.join(settings.BASE_DIR, "var", "benchmarks", "baseline.json"))
+
+
+def check_local(url):
+    host = urlsplit(url).hostname
+    if host not in LOCAL_HOSTS:
+        raise BenchmarkError(f"Benchmarks only run against a local server, not {host or url!r}.")
+
+
+class Bench:
+    def __init__(self, url, prefix="syn", users=20, iterations=5, seed=42):
+        check_local(url)
+        self.url = url.rstrip("/")
+        self.prefix = prefix
+        self.users = users
+        self.iterations = iterations
+        self.rng = np.random.default_rng(seed)
+        self.tokens = {}
+        self.samples = defaultdict(list)
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    # --- fixtures, read from the seeded database ---
+
+    def lectures(self):
+        return Lecture.objects.filter(course__slug__startswith=f"{self.prefix}-")
+
+    def sample(self, items, count):
+        items = list(items)
+        if not items:
+            raise BenchmarkError(f"No generated data with prefix '{self.prefix}'; run generate_university first.")
+        picks = self.rng.choice(len(items), size=min(count, len(items)), replace=False)
+        return [items[i] for i in picks.tolist()]
+
+    def token(self, user):
+        if user.pk not in self.tokens:
+            self.tokens[user.pk] = str(RefreshToken.for_user(user).access_token)
+        return self.tokens[user.pk]
+
+    # --- running ---
+
+    def session(self):
+        if not hasattr(self.local, "session"):
+            self.local.session = requests.Session()
+        return self.local.session
+
+    def send(self, call):
+        kwargs = {"files": call.files, "data": call.data} if call.files else {"json": call.data}
+        start = time.perf_counter()
+        try:
+            response = self.session().request(
+                call.method, self.url + call.path, headers={"Authorization": f"Bearer {self.token(call.user)}"},
+                timeout=REQUEST_TIMEOUT, **kwargs,
+            )
+            ok = response.status_code in call.expect
+        except requests.RequestException:
+            response, ok = None, False
+        elapsed = time.perf_counter() - start
+        with self.lock:
+            self.samples[call.label].append((elapsed, ok))
+        if ok and response.headers.get("Content-Type", "").startswith("application/json"):
+            return response.json()
+        return None
+
+    def run(self, name):
+        """Drive one scenario and return its per-endpoint summary."""
+        self.samples = defaultdict(list)
+        waves = SCENARIOS[name](self)
+        responses = None
+        start = time.perf_counter()
+        with ThreadPoolExecutor(self.users, thread_name_prefix=f"vu-{name}") as pool:
+            try:
+                while True:
+                    calls = waves.send(responses)
+                    # Tokens are minted here, so worker threads never touch the database
+                    for call in calls:
+                        self.token(call.user)
+                    responses = list(pool.map(self.send, calls))
+            except StopIteration:
+                pass
+        return summarize(self.samples, time.perf_counter() - start)
+
+    def report(self, names, log=print):
+        try:
+            requests.get(self.url + "/catalog/", timeout=10)
+        except requests.RequestException as e:
+            raise BenchmarkError(f"No server at {self.url} ({e.__class__.__name__}); start one with manage.py runserver.")
+        scenarios = {}
+        for name in names:
+            log(f"{name}: running")
+            scenarios[name] = self.run(name)
+            log(f"{name}: {scenarios[name]['requests']} requests in {scenarios[name]['seconds']}s")
+        return {
+            "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "url": self.url,
+            "users": self.users,
+            "iterations": self.iterations,
+            "database": settings.DATABASES["default"]["ENGINE"].rsplit(".", 1)[-1],
+            "python": platform.python_version(),
+            "scenarios": scenarios,
+        }
+
+
+def summarize(samples, seconds):
+    """Throughput and latency percentiles per endpoint label."""
+    endpoints = {}
+    for label, rows in sorted(samples.items()):
+        latencies = np.array([elapsed for elapsed, _ in rows]) * 1000
+        endpoints[label] = {
+            "requests": len(rows),
+            "errors": sum(not ok for _, ok in rows),
+            "throughput_rps": round(len(rows) / seconds, 2) if seconds else 0.0,
+            "mean_ms": round(float(latencies.mean()), 1),
+            "p50_ms": round(float(np.percentile(latencies, 50)), 1),
+            "p95_ms": round(float(np.percentile(latencies, 95)), 1),
+            "p99_ms": round(float(np.percentile(latencies, 99)), 1),
+        }
+    total = sum(endpoint["requests"] for endpoint in endpoints.values())
+    return {
+        "seconds": round(seconds, 2),
+        "requests": total,
+        "throughput_rps": round(total / seconds, 2) if seconds else 0.0,
+        "endpoints": endpoints,
+    }
+
+
+def compare(report, baseline, tolerance=0.1):
+    """
+    Per endpoint changes against a baseline report. An endpoint regresses when its
+    p95 grew or its throughput dropped by more than `tolerance` (a fraction).
+    """
+    rows = []
+    for name, scenario in report["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name, {}).get("endpoints", {})
+        for label, now in scenario["endpoints"].items():
+            old = before.get(label)
+            if not old:
+                continue
+            change = {
+                key: round((now[key] - old[key]) / old[key], 3) if old[key] else None
+                for key in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms")
+            }
+            regressed = now["requests"] >= MIN_COMPARED_REQUESTS and (
+                (change["p95_ms"] or 0) > tolerance or (change["throughput_rps"] or 0) < -tolerance
+            )
+            rows.append({"scenario": name, "endpoint": label, "change": change, "regressed": regressed})
+    return rows
+
+
+def load_report(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_report(report, path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+# --- scenarios ---
+
+def checkin(bench):
+    """Lecture start: the instructor opens a session, then every enrolled student checks in at once."""
+    lectures = bench.lectures().filter(instructor__isnull=False).distinct().annotate(size=Count("students")).filter(size__gt=0).order_by("-size")
+    for lecture in bench.sample(lectures[:bench.iterations * 4], bench.iterations):
+        instructor = lecture.instructor.first()
+        created, = yield [Call(instructor, "POST", "/attendance/create/", "POST /attendance/create/", {"lecture": lecture.id}, expect=(201,))]
+        if not created:
+            continue
+        rows = StudentAttendance.objects.filter(attendance_id=created["id"]).select_related("student")
+        yield [
+            Call(row.student, "PATCH", f"/attendance/students/{row.id}/update/", "PATCH /attendance/students/{id}/update/", {"present": True})
+            for row in rows
+        ]
+
+
+def grading(bench):
+    """Instructors open their grade book, then enter instructor marks one student at a time."""
+    instructors = bench.sample(
+        User.objects.filter(username__startswith=f"{bench.prefix}-staff", lectures_taught__isnull=False).distinct(), bench.users
+    )
+    yield [Call(user, "GET", "/attendance/marks/?page_size=50", "GET /attendance/marks/") for user in instructors]
+    calls = []
+    for user in instructors:
+        marks = StudentMark.objects.filter(lecture__instructor=user).order_by("id")[:bench.iterations * 10]
+        calls += [
+            Call(user, "PATCH", f"/attendance/marks/{mark.id}/update/", "PATCH /attendance/marks/{id}/update/",
+                 {"instructor_mark": int(bench.rng.integers(40, 90))})
+            for mark in marks
+        ]
+    # Interleave instructors instead of one grade book after another
+    yield [calls[i] for i in bench.rng.permutation(len(calls)).tolist()]
+
+
+def enrollment(bench):
+    """Term start: students register for the courses they take, all at once."""
+    lectures = bench.lectures().values_list("id", flat=True)
+    students = bench.sample(User.objects.filter(lectures_attended__in=lectures).distinct()[:20_000], bench.users * bench.iterations)
+    courses = defaultdict(set)
+    for student_id, course_id in Lecture.students.through.objects.filter(user__in=students).values_list("user_id", "lecture__course_id"):
+        courses[student_id].add(course_id)
+    yield [
+        Call(student, "POST", "/lecture/enroll/", "POST /lecture/enroll/",
+             {"studentid": student.id, "courseids": sorted(courses[student.id])}, expect=(200, 201))
+        for student in students
+    ]
+
+
+def roster(run, index, rows, programs, version):
+    frame = pd.DataFrame({
+        "الرقم القومي": [f"31{run:06d}{index:02d}{i:04d}" for i in range(rows)],
+        "الاسم بالانجليزي": [f"Imported Student{index}-{i}" for i in range(rows)],
+        "الكلية": [programs[i % len(programs)].faculty.name for i in range(rows)],
+        "القسم": [programs[i % len(programs)].name for i in range(rows)],
+        "المستوى": [str(1 + i % 4) for i in range(rows)],
+        "رقم الهاتف": [f"01{version}{index:02d}{i:06d}" for i in range(rows)],
+    })
+    buffer = BytesIO()
+    frame.to_excel(buffer, sheet_name="Sheet1", index=False)
+    return buffer.getvalue()
+
+
+def excel_import(bench):
+    """Registrars upload new student rosters concurrently, then upload them again with changed phone numbers."""
+    staff = bench.sample(User.objects.filter(username__startswith=f"{bench.prefix}-staff"), 1)[0]
+    programs = list(Program.objects.filter(slug__startswith=f"{bench.prefix}-").select_related("faculty")[:20])
+    # New national ids every run, so the first wave always creates users (and hashes their passwords)
+    run = int(time.time()) % 1_000_000
+    uploads = min(bench.users, 2) * bench.iterations
+    for version, label in ((0, "POST /upload-excel/ (new)"), (1, "POST /upload-excel/ (update)")):
+        yield [
+            Call(staff, "POST", "/upload-excel/", label, expect=(201,), files={
+                "file": (f"roster-{index}.xlsx", roster(run, index, ROSTER_ROWS, programs, version), XLSX),
+            })
+            for index in range(uploads)
+        ]
+
+
+def dashboard(bench):
+    """Home page loads: the requests a student's or an instructor's dashboard makes."""
+    lectures = bench.lectures().values_list("id", flat=True)
+    students = bench.sample(User.objects.filter(lectures_attended__in=lectures).distinct()[:20_000], bench.users * bench.iterations)
+    instructors = bench.sample(User.objects.filter(lectures_taught__in=lectures).distinct(), max(1, len(students) // 5))
+    calls = []
+    for student in students:
+        calls += [
+            Call(student, "GET", "/auth/users/me/", "GET /auth/users/me/"),
+            Call(student, "GET", "/lecture/", "GET /lecture/"),
+            Call(student, "GET", "/course/", "GET /course/"),
+            Call(student, "GET", "/survey/", "GET /survey/"),
+            Call(student, "GET", "/catalog/", "GET /catalog/"),
+        ]
+    for instructor in instructors:
+        calls += [
+            Call(instructor, "GET", "/auth/users/me/", "GET /auth/users/me/"),
+            Call(instructor, "GET", "/lecture/", "GET /lecture/"),
+            Call(instructor, "GET", "/attendance/marks/?page_size=50", "GET /attendance/marks/"),
+            Call(instructor, "GET", f"/survey/results/?by=question&instructor={instructor.id}", "GET /survey/results/"),
+        ]
+    yield calls
+
+
+SCENARIOS = {
+    "dashboard": dashboard,
+    "grading": grading,
+    "checkin": checkin,
+    "enrollment": enrollment,
+    "excel-import": excel_import,
+}
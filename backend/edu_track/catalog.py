@@ -0,0 +1,97 @@
+import hashlib
+import json
+from collections import defaultdict
+from django.core.cache import cache
+from .storage import media_storage
+from django.http import HttpResponse, HttpResponseNotModified
+from rest_framework.views import APIView
+from course.models import Course
+from faculty.models import Faculty
+from location.models import Location
+from program.models import Program
+from university.models import University
+from user.permissions import GroupPermission
+from .versions import bump, get_version
+
+# Bumped by every catalog model signal (see <app>/signals.py), so the cached tree
+# and its ETag change together
+CATALOG_VERSION = "catalog"
+CATALOG_CACHE_TIMEOUT = 24 * 60 * 60
+
+
+def bump_catalog_version(sender=None, **kwargs):
+    """Signal receiver for catalog saves, deletes and m2m changes."""
+    bump(CATALOG_VERSION)
+
+
+def build_tree(absolute_uri=lambda url: url):
+    """
+    University -> faculties (with locations) -> programs -> courses, one query per level.
+    Courses shared between programs appear under each of them.
+    """
+    def logo(name):
+        return absolute_uri(media_storage().url(name)) if name else None
+
+    courses = defaultdict(list)
+    for program_id, course_id, title, slug in (
+        Course.programs.through.objects.order_by("course_id")
+        .values_list("program_id", "course_id", "course__title", "course__slug")
+    ):
+        courses[program_id].append({"id": course_id, "title": title, "slug": slug})
+
+    locations = defaultdict(list)
+    for faculty_id, location_id, name, slug, capacity in (
+        Location.faculties.through.objects.order_by("location_id")
+        .values_list("faculty_id", "location_id", "location__name", "location__slug", "location__capacity")
+    ):
+        locations[faculty_id].append({"id": location_id, "name": name, "slug": slug, "capacity": capacity})
+
+    programs = defaultdict(list)
+    for program in Program.objects.order_by("id").values("id", "name", "slug", "faculty_id"):
+        programs[program.pop("faculty_id")].append({**program, "courses": courses[program["id"]]})
+
+    faculties = defaultdict(list)
+    for faculty in Faculty.objects.order_by("id").values("id", "name", "slug", "logo", "university_id"):
+        faculties[faculty.pop("university_id")].append({
+            **faculty,
+            "logo": logo(faculty["logo"]),
+            "locations": locations[faculty["id"]],
+            "programs": programs[faculty["id"]],
+        })
+
+    return [
+        {**university, "logo": logo(university["logo"]), "faculties": faculties[university["id"]]}
+        for university in University.objects.order_by("id").values("id", "name", "slug", "logo")
+    ]
+
+
+def cached_tree(request):
+    """(etag, json bytes) for the current catalog version, built at most once per version and host."""
+    version = get_version(CATALOG_VERSION)
+    # Logos are absolute URLs, so the host is part of the key
+    key = f"catalog:tree:{version}:{request.get_host()}"
+    entry = cache.get(key)
+    if entry is None:
+        body = json.dumps(build_tree(request.build_absolute_uri), ensure_ascii=False, separators=(",", ":")).encode()
+        entry = (f'"{hashlib.sha256(body).hexdigest()[:32]}"', body)
+        cache.set(key, entry, CATALOG_CACHE_TIMEOUT)
+    return entry
+
+
+class CatalogTree(APIView):
+    """
+    The whole organization catalog in one response, served from a cached blob.
+    Clients revalidate with If-None-Match and get a 304 until something changes.
+    """
+    permission_classes = [type('CustomPerm',(GroupPermission,),{'required_permission': 'university.view_university'})]
+
+    def get(self, request):
+        etag, body = cached_tree(request)
+        if etag in [tag.strip().removeprefix("W/") for tag in request.META.get("HTTP_IF_NONE_MATCH", "").split(",")]:
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(body, content_type="application/json")
+        response["ETag"] = etag
+        # Cacheable by the browser, but always revalidated (cheap thanks to the ETag)
+        response["Cache-Control"] = "private, no-cache"
+        return response
@@ -0,0 +1,64 @@
+"""
+The hottest query shapes and the index each one is meant to use.
+
+`manage.py explain_hot_queries` prints their plans (and fails with --check when
+one regresses to a full scan), and the query-budget tests assert the same plans.
+"""
+import re
+from collections import namedtuple
+from django.db import connection
+from attendance.models import Attendance, StudentAttendance
+from lecture.models import Lecture
+from survey.models import SurveyAnswer
+from user.models import User
+
+# index=None: any index will do (the planner picks between several good ones)
+HotQuery = namedtuple("HotQuery", "name queryset index")
+
+
+def hot_queries():
+    """Built around the first lecture that has students, instructors and survey answers; empty when there is none."""
+    lecture = (
+        Lecture.objects.filter(students__isnull=False, instructor__isnull=False, survey_answers__isnull=False)
+        .order_by("id").first()
+    )
+    if lecture is None:
+        return []
+    student = lecture.students.order_by("id").first()
+    instructors = list(lecture.instructor.values_list("id", flat=True))
+    question_id = lecture.survey_answers.values_list("question_id", flat=True).first()
+    national_ids = list(User.objects.exclude(nationalid=None).values_list("nationalid", flat=True)[:50]) or ["0"]
+    slot = {"day": lecture.day, "starttime__lt": lecture.endtime, "endtime__gt": lecture.starttime}
+    return [
+        # LectureSerializer.validate
+        HotQuery("lecture room clash", Lecture.objects.filter(location=lecture.location_id, **slot).exclude(pk=lecture.pk), "lecture_room_day"),
+        HotQuery("lecture instructor clash", Lecture.objects.filter(instructor__in=instructors, **slot).exclude(pk=lecture.pk), None),
+        # StudentMark.calculate_attendance_mark
+        HotQuery("lecture sessions", Attendance.objects.filter(lecture=lecture).order_by("time"), "attendance_lecture_time"),
+        HotQuery(
+            "student presence in a lecture",
+            StudentAttendance.objects.filter(attendance__lecture=lecture, student=student, present=True),
+            "student_attendance_present",
+        ),
+        # Survey results and submissions
+        HotQuery("survey answers of a question", SurveyAnswer.objects.filter(lecture=lecture, question=question_id), None),
+        # user/importer.py
+        HotQuery("users by national id", User.objects.filter(nationalid__in=national_ids), None),
+    ]
+
+
+def plan_problems(queryset, index=None):
+    """EXPLAIN the queryset; problems lists a full scan of its table or a missing expected index."""
+    table = queryset.model._meta.db_table
+    plan = queryset.explain()
+    problems = []
+    if connection.vendor == "sqlite":
+        if re.search(rf"\bSCAN {table}\b(?! USING (COVERING )?INDEX)", plan):
+            problems.append(f"full scan of {table}")
+        elif not re.search(rf"SEARCH {table} USING (COVERING |INTEGER PRIMARY KEY)?", plan):
+            problems.append(f"no index search on {table}")
+    elif connection.vendor == "postgresql" and f"Seq Scan on {table}" in plan:
+        problems.append(f"sequential scan of {table}")
+    if index and index not in plan:
+        problems.append(f"{index} not used")
+    return plan, problems
@@ -0,0 +1,128 @@
+import logging
+import os
+from io import BytesIO
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, UnidentifiedImageError
+from rest_framework import serializers
+
+logger = logging.getLogger(__name__)
+
+# Bounding boxes (width, height) per rendition name; images are never upscaled
+AVATAR_RENDITIONS = {"thumb": (64, 64), "small": (160, 160)}
+LOGO_RENDITIONS = {"thumb": (64, 64), "small": (200, 200)}
+EXAM_RENDITIONS = {"small": (480, 480), "large": (1280, 1280)}
+
+RENDITIONS_DIR = "renditions"
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+
+
+def rendition_name(source_name, spec, fmt):
+    root, _ = os.path.splitext(source_name)
+    return f"{RENDITIONS_DIR}/{spec}/{root}.{fmt}"
+
+
+def fallback_format(image):
+    # WebP for modern browsers, plus PNG for transparent sources and JPEG otherwise
+    has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+    return "png" if has_alpha else "jpeg"
+
+
+def _encode(image, fmt):
+    buffer = BytesIO()
+    if fmt == "webp":
+        image.save(buffer, "WEBP", quality=WEBP_QUALITY, method=4)
+    elif fmt == "png":
+        image.save(buffer, "PNG", optimize=True)
+    else:
+        image.convert("RGB").save(buffer, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+    return buffer.getvalue()
+
+
+def existing_renditions(fieldfile, specs):
+    """{spec: {format: storage name}} when every spec has its WebP and fallback rendition, else None."""
+    names = {}
+    for spec in specs:
+        for fmt in ("webp", "png", "jpeg"):
+            name = rendition_name(fieldfile.name, spec, fmt)
+            if default_storage.exists(name):
+                names.setdefault(spec, {})[fmt] = name
+        if "webp" not in names.get(spec, {}) or len(names[spec]) < 2:
+            return None
+    return names
+
+
+def generate_renditions(fieldfile, specs, force=False):
+    """
+    Write every rendition of `fieldfile` for `specs` that is missing (or all of them with force).
+    Returns {spec: {format: storage name}}; an unreadable source yields {}.
+    """
+    if not fieldfile or not fieldfile.name:
+        return {}
+    if not force:
+        # Checking storage is far cheaper than decoding the original on every save
+        names = existing_renditions(fieldfile, specs)
+        if names is not None:
+            return names
+    names = {}
+    try:
+        with fieldfile.open("rb") as source:
+            original = ImageOps.exif_transpose(Image.open(source))
+            original.load()
+    except (OSError, UnidentifiedImageError, ValueError) as exc:
+        logger.warning("Cannot build renditions for %s: %s", fieldfile.name, exc)
+        return {}
+
+    if original.mode not in ("RGB", "RGBA", "L", "LA"):
+        original = original.convert("RGBA" if "transparency" in original.info else "RGB")
+    fallback = fallback_format(original)
+    for spec, size in specs.items():
+        image = original.copy()
+        image.thumbnail(size, Image.LANCZOS)
+        names[spec] = {}
+        for fmt in ("webp", fallback):
+            name = rendition_name(fieldfile.name, spec, fmt)
+            if force or not default_storage.exists(name):
+                if default_storage.exists(name):
+                    default_storage.delete(name)
+                default_storage.save(name, ContentFile(_encode(image, fmt)))
+            names[spec][fmt] = name
+    return names
+
+
+def rendition_names(fieldfile, specs):
+    """Names of existing renditions, generating them lazily on first use."""
+    if not fieldfile or not fieldfile.name:
+        return {}
+    return generate_renditions(fieldfile, specs)
+
+
+def renditions_on_save(field_name, specs):
+    """post_save receiver that builds renditions as soon as an image is uploaded."""
+    def receiver(sender, instance, update_fields=None, **kwargs):
+        if update_fields is not None and field_name not in update_fields:
+            return
+        generate_renditions(getattr(instance, field_name), specs)
+    return receiver
+
+
+class RenditionsField(serializers.ReadOnlyField):
+    """
+    `{"thumb": {"webp": url, "jpeg": url}, ...}` for an ImageField, so list pages
+    can load small re-encoded images instead of the original upload.
+    """
+
+    def __init__(self, specs, **kwargs):
+        self.specs = specs
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        request = self.context.get("request")
+        urls = {}
+        for spec, formats in rendition_names(value, self.specs).items():
+            urls[spec] = {}
+            for fmt, name in formats.items():
+                url = default_storage.url(name)
+                urls[spec][fmt] = request.build_absolute_uri(url) if request else url
+        return urls or None
@@ -0,0 +1,210 @@
+import contextvars
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import ExitStack
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+from rest_framework.serializers import BaseSerializer
+from .response_cache import response_cache_stats
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the histogram buckets (+Inf is implicit)
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+_current = contextvars.ContextVar("request_metrics", default=None)
+
+
+class RequestMetrics:
+    """What one request spent in SQL and serializers."""
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+        self.slow = []
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper hook
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.queries += 1
+            self.sql_time += elapsed
+            if elapsed * 1000 >= getattr(settings, "SLOW_QUERY_MS", 100):
+                # Only slow statements pay for the stack walk
+                self.slow.append((elapsed, sql, call_site()))
+
+
+def call_site():
+    """file:line in function of the innermost frame in project code (not Django, DRF or this module)."""
+    root = str(settings.BASE_DIR) + os.sep
+    frame = sys._getframe(1)
+    while frame:
+        filename = frame.f_code.co_filename
+        if filename.startswith(root) and "site-packages" not in filename and filename != __file__:
+            return f"{os.path.relpath(filename, root)}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "?"
+
+
+def _timed_data(fget):
+    def data(serializer):
+        metrics = _current.get()
+        # Nested serializers built inside to_representation are part of the outer one's time
+        if metrics is None or metrics.serializer_depth:
+            return fget(serializer)
+        metrics.serializer_depth += 1
+        start = time.perf_counter()
+        try:
+            return fget(serializer)
+        finally:
+            metrics.serializer_time += time.perf_counter() - start
+            metrics.serializer_depth -= 1
+    data._instrumented = True
+    return data
+
+
+def instrument_serializers():
+    # Serializer.data and ListSerializer.data both end up in BaseSerializer.data
+    if not getattr(BaseSerializer.data.fget, "_instrumented", False):
+        BaseSerializer.data = property(_timed_data(BaseSerializer.data.fget))
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                return
+        self.counts[-1] += 1
+
+
+class Registry:
+    """Per-route histograms for this process, rendered in the Prometheus text format."""
+
+    metrics = {
+        "edu_track_request_duration_seconds": ("Time spent in the view, including SQL and serialization.", DURATION_BUCKETS),
+        "edu_track_request_sql_seconds": ("Time spent executing SQL per request.", DURATION_BUCKETS),
+        "edu_track_request_serializer_seconds": ("Time spent in DRF serializers per request.", DURATION_BUCKETS),
+        "edu_track_request_queries": ("SQL statements per request.", QUERY_BUCKETS),
+    }
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {}
+
+    def observe(self, labels, **values):
+        with self.lock:
+            for name, value in values.items():
+                key = (name, labels)
+                if key not in self.histograms:
+                    self.histograms[key] = Histogram(self.metrics[name][1])
+                self.histograms[key].observe(value)
+
+    def render(self):
+        lines = []
+        with self.lock:
+            for name, (help_text, _) in self.metrics.items():
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+                for (metric, labels), histogram in sorted(self.histograms.items()):
+                    if metric != name:
+                        continue
+                    label_text = ",".join(f'{key}="{_escape(value)}"' for key, value in labels)
+                    cumulative = 0
+                    for bound, count in zip((*histogram.buckets, "+Inf"), histogram.counts):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{{{label_text},le="{bound}"}} {cumulative}')
+                    lines.append(f"{name}_sum{{{label_text}}} {histogram.sum}")
+                    lines.append(f"{name}_count{{{label_text}}} {cumulative}")
+
+        lines += ["# HELP edu_track_response_cache_total Cached response lookups by outcome.", "# TYPE edu_track_response_cache_total counter"]
+        for view_name, outcomes in sorted(response_cache_stats().items()):
+            for outcome, value in outcomes.items():
+                lines.append(f'edu_track_response_cache_total{{view="{view_name}",outcome="{outcome}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registry = Registry()
+
+
+def route_of(request):
+    # The URL pattern, not the path, so /lecture/5/ and /lecture/6/ share a histogram
+    match = getattr(request, "resolver_match", None)
+    return match.route if match and match.route else "<unmatched>"
+
+
+class InstrumentationMiddleware:
+    """
+    Counts each request's SQL statements and times SQL, serializers and the whole
+    view. The numbers go out as a Server-Timing header (visible in the browser's
+    network tab), into per-route histograms served by `metrics`, and statements
+    slower than SLOW_QUERY_MS are logged with the project line that ran them.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        instrument_serializers()
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        total = time.perf_counter() - start
+
+        response["Server-Timing"] = ", ".join([
+            f'db;dur={metrics.sql_time * 1000:.1f};desc="{metrics.queries} queries"',
+            f"serializer;dur={metrics.serializer_time * 1000:.1f}",
+            f"view;dur={total * 1000:.1f}",
+        ])
+        registry.observe(
+            (("method", request.method), ("route", route_of(request)), ("status", f"{response.status_code // 100}xx")),
+            edu_track_request_duration_seconds=total,
+            edu_track_request_sql_seconds=metrics.sql_time,
+            edu_track_request_serializer_seconds=metrics.serializer_time,
+            edu_track_request_queries=metrics.queries,
+        )
+        for elapsed, sql, site in sorted(metrics.slow, key=lambda item: item[0], reverse=True)[:getattr(settings, "SLOW_QUERY_LOG_LIMIT", 5)]:
+            logger.warning("Slow query (%.1f ms) in %s %s at %s: %s", elapsed * 1000, request.method, request.path, site, sql)
+        return response
+
+
+def metrics(request):
+    """
+    Prometheus scrape endpoint. Open to METRICS_ALLOWED_IPS, or to anyone
+    sending `Authorization: Bearer <METRICS_TOKEN>` when a token is configured.
+    """
+    token = getattr(settings, "METRICS_TOKEN", None)
+    authorization = request.META.get("HTTP_AUTHORIZATION", "")
+    allowed = request.META.get("REMOTE_ADDR") in getattr(settings, "METRICS_ALLOWED_IPS", ())
+    if token and constant_time_compare(authorization, f"Bearer {token}"):
+        allowed = True
+    if not allowed:
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,162 @@
+import hashlib
+import mimetypes
+import os
+import re
+from functools import lru_cache
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+from .storage import BLOBS_DIR
+
+# blobs/ab/<sha256>.ext is named after its bytes, so it never changes once written
+_BLOB_NAME = re.compile(r"^%s/[0-9a-f]{2}/([0-9a-f]{64})\.\w+$" % BLOBS_DIR)
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+CHUNK_SIZE = 64 * 1024
+
+
+@lru_cache(maxsize=4096)
+def _file_digest(path, size, mtime_ns):
+    # size/mtime are part of the cache key so a replaced file is re-hashed
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def strong_etag(name, path, stat):
+    match = _BLOB_NAME.match(name)
+    digest = match.group(1) if match else _file_digest(path, stat.st_size, stat.st_mtime_ns)
+    return f'"{digest[:32]}"'
+
+
+def _etag_matches(header, etag):
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/"x" matches "x"
+    tags = [tag.strip() for tag in header.split(",")]
+    return etag in tags or f"W/{etag}" in tags
+
+
+def _byte_range(header, size):
+    """(start, end) inclusive for a single `bytes=` range, None to send everything, or False if unsatisfiable."""
+    match = _RANGE.match(header.strip()) if header else None
+    if not match or match.group(1) == match.group(2) == "":
+        return None
+    first, last = match.groups()
+    if first == "":
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def _read_range(path, start, end):
+    with open(path, "rb") as fh:
+        fh.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = fh.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _offload(response, name):
+    """Hand the body to the front proxy when MEDIA_SENDFILE is configured."""
+    backend = getattr(settings, "MEDIA_SENDFILE", None)
+    if backend == "x-accel-redirect":
+        prefix = getattr(settings, "MEDIA_ACCEL_REDIRECT_PREFIX", "/protected-media/")
+        response["X-Accel-Redirect"] = prefix.rstrip("/") + "/" + name
+    elif backend == "x-sendfile":
+        response["X-Sendfile"] = safe_join(settings.MEDIA_ROOT, name)
+    else:
+        return False
+    return True
+
+
+@require_safe
+def serve_media(request, path):
+    """
+    Serve a file from MEDIA_ROOT with strong ETags, Last-Modified, 304s and single byte ranges.
+
+    Content-addressed blobs are marked immutable. With MEDIA_SENDFILE set to
+    "x-accel-redirect" (nginx) or "x-sendfile" (Apache/lighttpd) only the
+    headers are produced here and the proxy streams the bytes.
+    """
+    name = path.lstrip("/")
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, name)
+        stat = os.stat(full_path)
+    except (OSError, ValueError, SuspiciousFileOperation):
+        raise Http404("Media file not found")
+    if not os.path.isfile(full_path):
+        raise Http404("Media file not found")
+
+    etag = strong_etag(name, full_path, stat)
+    immutable = bool(_BLOB_NAME.match(name))
+    headers = {
+        "ETag": etag,
+        "Last-Modified": http_date(stat.st_mtime),
+        "Cache-Control": (
+            f"public, max-age={IMMUTABLE_MAX_AGE}, immutable" if immutable
+            else f"public, max-age={getattr(settings, 'MEDIA_CACHE_MAX_AGE', 3600)}"
+        ),
+        "Accept-Ranges": "bytes",
+    }
+
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+    if if_none_match:
+        not_modified = _etag_matches(if_none_match, etag)
+    else:
+        since = parse_http_date_safe(request.META.get("HTTP_IF_MODIFIED_SINCE", ""))
+        not_modified = since is not None and int(stat.st_mtime) <= since
+    if not_modified:
+        response = HttpResponseNotModified()
+        for key, value in headers.items():
+            response[key] = value
+        return response
+
+    content_type, encoding = mimetypes.guess_type(full_path)
+    content_type = content_type or "application/octet-stream"
+
+    response = HttpResponse(content_type=content_type)
+    if _offload(response, name):
+        for key, value in headers.items():
+            response[key] = value
+        return response
+
+    byte_range = None
+    if_range = request.META.get("HTTP_IF_RANGE")
+    if not if_range or if_range.strip() == etag:
+        byte_range = _byte_range(request.META.get("HTTP_RANGE"), stat.st_size)
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{stat.st_size}"
+        return response
+
+    if byte_range is None:
+        response = FileResponse(open(full_path, "rb"), content_type=content_type)
+        response["Content-Length"] = stat.st_size
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(_read_range(full_path, start, end), status=206, content_type=content_type)
+        response["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+        response["Content-Length"] = end - start + 1
+    if encoding:
+        response["Content-Encoding"] = encoding
+    for key, value in headers.items():
+        response[key] = value
+    return response
@@ -0,0 +1,217 @@
+import base64
+import json
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from django.db.models.query import ValuesIterable
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from .admin import estimated_row_count
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination over a unique ordering such as ("-action_time", "-id").
+
+    Each page is `WHERE (ordering) after <last row> ORDER BY ordering LIMIT n`,
+    so it costs the same on page 1 and page 10,000 when the ordering is indexed.
+    Views pick the ordering with `keyset_ordering`; its last field must be unique.
+    Without one, the queryset's own ordering (order_by() or Meta.ordering) is kept
+    with the primary key appended as a tiebreaker. Works with both model
+    instances and values() rows; ordering columns a values() query leaves out are
+    fetched for the cursor and dropped from the rows.
+
+    `?count=1` adds a total: the table estimate for unfiltered lists, otherwise
+    an exact count capped at `count_cap` rows ("count_exact" says which).
+    """
+    page_size = 50
+    max_page_size = 500
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    count_cap = 10_000
+    ordering = ("-id",)
+    invalid_cursor_message = "Invalid cursor"
+
+    def get_ordering(self, view, queryset=None):
+        declared = getattr(view, "keyset_ordering", None)
+        if declared:
+            return tuple(declared)
+        return self.queryset_ordering(queryset) or tuple(self.ordering)
+
+    def queryset_ordering(self, queryset):
+        """The queryset's ordering made unique with the pk, or None when it can't be seeked on."""
+        if queryset is None:
+            return None
+        ordering = queryset.query.order_by or (queryset.query.default_ordering and queryset.model._meta.ordering)
+        if not ordering:
+            return None
+        opts = queryset.model._meta
+        pk = opts.pk.name
+        result = []
+        for name in ordering:
+            if not isinstance(name, str) or name == "?" or "__" in name.lstrip("-"):
+                return None
+            descending = name.startswith("-")
+            field_name = name.lstrip("-")
+            field_name = pk if field_name == "pk" else field_name
+            try:
+                field = opts.get_field(field_name)
+            except FieldDoesNotExist:
+                return None
+            # seek() compares with < / >, which never matches NULL
+            if field.null:
+                return None
+            result.append(("-" if descending else "") + field_name)
+            if field.primary_key:
+                return tuple(result)
+        return tuple(result) + (("-" if result[-1].startswith("-") else "") + pk,)
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def encode_cursor(self, values):
+        raw = json.dumps(values, default=str, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, request, queryset, ordering):
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            values = json.loads(raw)
+            if not isinstance(values, list) or len(values) != len(ordering):
+                raise ValueError
+            # Round-trip through the model fields so datetimes etc. compare natively
+            return [
+                queryset.model._meta.get_field(name.lstrip("-")).to_python(value)
+                for name, value in zip(ordering, values)
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def seek(self, ordering, position):
+        # (a, b) after (x, y)  ==  a > x OR (a = x AND b > y), with > flipped for descending fields
+        condition = Q()
+        equal = Q()
+        for name, value in zip(ordering, position):
+            field = name.lstrip("-")
+            lookup = "lt" if name.startswith("-") else "gt"
+            condition |= equal & Q(**{f"{field}__{lookup}": value})
+            equal &= Q(**{field: value})
+        return condition
+
+    def row_position(self, row, ordering):
+        fields = [name.lstrip("-") for name in ordering]
+        if isinstance(row, dict):
+            return [row[field] for field in fields]
+        return [getattr(row, row._meta.get_field(field).attname) for field in fields]
+
+    def missing_columns(self, queryset, ordering):
+        """Ordering columns a values() queryset doesn't select."""
+        fields = getattr(queryset, "_fields", None)
+        if not fields or not issubclass(queryset._iterable_class, ValuesIterable):
+            return ()
+        return tuple(name.lstrip("-") for name in ordering if name.lstrip("-") not in fields)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        ordering = self.get_ordering(view, queryset)
+        self.request = request
+        self.page_size_used = self.get_page_size(request)
+        extra = self.missing_columns(queryset, ordering)
+        if extra:
+            queryset = queryset.values(*queryset._fields, *extra)
+        queryset = queryset.order_by(*ordering)
+        self.count = None
+        if request.query_params.get(self.count_query_param) in ("1", "true"):
+            self.count = self.get_count(queryset)
+        position = self.decode_cursor(request, queryset, ordering)
+        if position is not None:
+            queryset = queryset.filter(self.seek(ordering, position))
+
+        rows = list(queryset[:self.page_size_used + 1])
+        self.has_next = len(rows) > self.page_size_used
+        rows = rows[:self.page_size_used]
+        self.next_position = self.row_position(rows[-1], ordering) if self.has_next else None
+        if extra:
+            rows = [{key: value for key, value in row.items() if key not in extra} for row in rows]
+        return rows
+
+    def get_count(self, queryset):
+        """(count, exact) without scanning more than count_cap rows."""
+        if not queryset.query.where:
+            estimate = estimated_row_count(queryset.model, queryset.db)
+            if estimate is not None and estimate > self.count_cap:
+                return estimate, False
+        found = queryset.order_by()[:self.count_cap + 1].count()
+        return min(found, self.count_cap), found <= self.count_cap
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_paginated_response(self, data):
+        body = {"next": self.get_next_link()}
+        if self.count is not None:
+            body["count"], body["count_exact"] = self.count
+        body["results"] = data
+        return Response(body)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "count": {"type": "integer"},
+                "count_exact": {"type": "boolean"},
+                "results": schema,
+            },
+        }
+
+
+class DefaultPagination(KeysetPagination):
+    """
+    Project-wide pagination (REST_FRAMEWORK DEFAULT_PAGINATION_CLASS), ordered by id
+    unless the view's queryset declares an ordering.
+
+    Clients that send `cursor` or `page_size` get the {"next", "results"} envelope.
+    Older clients (the current frontend) that expect a bare array still get one
+    while PAGINATION_COMPAT_BARE_ARRAY is on, but no more than
+    PAGINATION_COMPAT_PAGE_SIZE rows. A cut array says so in X-Truncated, with
+    the next page (an envelope) in the Link and X-Next-Cursor headers.
+    """
+    ordering = ("id",)
+
+    def wants_envelope(self, request):
+        if not getattr(settings, "PAGINATION_COMPAT_BARE_ARRAY", True):
+            return True
+        params = request.query_params
+        return self.cursor_query_param in params or self.page_size_query_param in params
+
+    def get_page_size(self, request):
+        if self.wants_envelope(request):
+            return super().get_page_size(request)
+        return getattr(settings, "PAGINATION_COMPAT_PAGE_SIZE", 1000)
+
+    def get_paginated_response(self, data):
+        if self.wants_envelope(self.request):
+            return super().get_paginated_response(data)
+        headers = {}
+        if self.count is not None:
+            headers["X-Total-Count"] = str(self.count[0])
+        next_link = self.get_next_link()
+        if next_link:
+            headers["Link"] = f'<{next_link}>; rel="next"'
+            headers["X-Next-Cursor"] = self.encode_cursor(self.next_position)
+            headers["X-Truncated"] = "true"
+        return Response(data, headers=headers)
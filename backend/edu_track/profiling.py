@@ -0,0 +1,244 @@
+import cProfile
+import json
+import logging
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import Http404
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+logger = logging.getLogger(__name__)
+
+# Frames kept per stored profile
+TOP_FRAMES = 30
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def profile_dir():
+    return _setting("PROFILING_DIR", os.path.join(settings.BASE_DIR, "var", "profiles"))
+
+
+class ProfileStore:
+    """
+    Bounded on-disk ring buffer of profiles: one JSON file per request, named by
+    time so listing is chronological; past PROFILING_KEEP files the oldest go.
+    """
+
+    def __init__(self, path, keep):
+        self.path = path
+        self.keep = keep
+
+    def save(self, record):
+        os.makedirs(self.path, exist_ok=True)
+        record["id"] = f"{time.time_ns()}-{os.getpid()}-{threading.get_ident()}"
+        tmp = os.path.join(self.path, f".{record['id']}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(record, f)
+        os.replace(tmp, os.path.join(self.path, f"{record['id']}.json"))
+        for name in self.names()[:-self.keep]:
+            try:
+                os.remove(os.path.join(self.path, name))
+            except FileNotFoundError:
+                pass  # another worker pruned it first
+
+    def names(self):
+        try:
+            return sorted(name for name in os.listdir(self.path) if name.endswith(".json"))
+        except FileNotFoundError:
+            return []
+
+    def load(self, profile_id):
+        try:
+            with open(os.path.join(self.path, f"{os.path.basename(profile_id)}.json")) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def summaries(self):
+        # Newest first, without the frames
+        result = []
+        for name in reversed(self.names()):
+            record = self.load(name[:-5])
+            if record:
+                result.append({key: value for key, value in record.items() if key not in ("frames", "stacks")})
+        return result
+
+
+def store():
+    return ProfileStore(profile_dir(), _setting("PROFILING_KEEP", 200))
+
+
+def cprofile_frames(profiler):
+    """Top functions by cumulative time from a finished cProfile run."""
+    stats = pstats.Stats(profiler)
+    rows = []
+    for (filename, line, function), (_, calls, tottime, cumtime, _) in stats.stats.items():
+        rows.append({
+            "function": function,
+            "file": filename,
+            "line": line,
+            "calls": calls,
+            "tottime_ms": round(tottime * 1000, 3),
+            "cumtime_ms": round(cumtime * 1000, 3),
+        })
+    rows.sort(key=lambda row: row["cumtime_ms"], reverse=True)
+    return rows[:TOP_FRAMES]
+
+
+class StackSampler(threading.Thread):
+    """
+    Watchdog thread: every PROFILING_INTERVAL seconds it grabs the current frame
+    of each in-flight request's thread and counts the stacks. The request thread
+    itself does nothing but register and unregister, and the watchdog sleeps on a
+    condition while there are no requests.
+    """
+
+    def __init__(self, interval):
+        super().__init__(name="edu-track-profiler", daemon=True)
+        self.interval = interval
+        self.active = {}
+        self.condition = threading.Condition()
+
+    def register(self, thread_id):
+        with self.condition:
+            self.active[thread_id] = Counter()
+            self.condition.notify()
+
+    def unregister(self, thread_id):
+        """Stop watching the thread and return a copy of its samples."""
+        with self.condition:
+            return Counter(self.active.pop(thread_id, None) or ())
+
+    def run(self):
+        while True:
+            with self.condition:
+                while not self.active:
+                    self.condition.wait()
+                active = dict(self.active)
+            # Walk the stacks outside the lock, count them under it so a finished
+            # request never sees its samples change
+            frames = sys._current_frames()
+            stacks = {
+                thread_id: self.collapse(frames[thread_id])
+                for thread_id in active if frames.get(thread_id) is not None
+            }
+            with self.condition:
+                for thread_id, stack in stacks.items():
+                    # Same Counter, so the thread hasn't moved on to another request meanwhile
+                    if self.active.get(thread_id) is active[thread_id]:
+                        active[thread_id][stack] += 1
+            time.sleep(self.interval)
+
+    @staticmethod
+    def collapse(frame):
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+            frame = frame.f_back
+        return ";".join(reversed(stack))
+
+
+def sampled_frames(samples):
+    """Leaf frames and whole stacks ranked by how often they were seen."""
+    total = sum(samples.values()) or 1
+    leaves = Counter()
+    for stack, count in samples.items():
+        leaves[stack.rsplit(";", 1)[-1]] += count
+    return (
+        [{"frame": frame, "samples": count, "percent": round(100 * count / total, 1)} for frame, count in leaves.most_common(TOP_FRAMES)],
+        [{"stack": stack, "samples": count} for stack, count in samples.most_common(10)],
+    )
+
+
+class ProfilingMiddleware:
+    """
+    Opt-in (PROFILING_ENABLED) profiling of production requests.
+
+    PROFILING_SAMPLE_RATE of requests run under cProfile. Every other request is
+    watched by the stack sampler and kept only if it takes longer than
+    PROFILING_SLOW_MS. When disabled the middleware removes itself at startup.
+    """
+
+    sampler = None
+
+    def __init__(self, get_response):
+        if not _setting("PROFILING_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = _setting("PROFILING_SAMPLE_RATE", 0.01)
+        self.slow_seconds = _setting("PROFILING_SLOW_MS", 1000) / 1000
+        if ProfilingMiddleware.sampler is None:
+            ProfilingMiddleware.sampler = StackSampler(_setting("PROFILING_INTERVAL", 0.01))
+            ProfilingMiddleware.sampler.start()
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        if random.random() < self.sample_rate:
+            profiler = cProfile.Profile()
+            response = profiler.runcall(self.get_response, request)
+            duration = time.perf_counter() - start
+            self.save(request, response, duration, "sampled", lambda: {"kind": "cprofile", "frames": cprofile_frames(profiler)})
+            return response
+
+        thread_id = threading.get_ident()
+        self.sampler.register(thread_id)
+        try:
+            response = self.get_response(request)
+        finally:
+            samples = self.sampler.unregister(thread_id)
+        duration = time.perf_counter() - start
+        if duration >= self.slow_seconds:
+            def sampled_profile():
+                frames, stacks = sampled_frames(samples)
+                return {"kind": "sampling", "samples": sum(samples.values()), "frames": frames, "stacks": stacks}
+            self.save(request, response, duration, "slow", sampled_profile)
+        return response
+
+    def save(self, request, response, duration, reason, build_profile):
+        """Store the profile built by `build_profile()`; a failure is logged, never raised into the response."""
+        try:
+            match = getattr(request, "resolver_match", None)
+            user = getattr(request, "user", None)
+            store().save({
+                "created": time.time(),
+                "method": request.method,
+                "path": request.path,
+                "route": match.route if match else None,
+                "status": response.status_code,
+                "duration_ms": round(duration * 1000, 1),
+                "reason": reason,
+                "user": user.pk if user is not None and user.is_authenticated else None,
+                **build_profile(),
+            })
+        except Exception:
+            logger.exception("Could not save a profile of %s %s", request.method, request.path)
+
+
+class ListProfiles(APIView):
+    """Stored profiles, newest first (staff only)."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(store().summaries())
+
+
+class RetrieveProfile(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, profile_id):
+        record = store().load(profile_id)
+        if record is None:
+            raise Http404("Profile not found")
+        return Response(record)
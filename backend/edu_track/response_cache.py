@@ -0,0 +1,100 @@
+import hashlib
+import threading
+import time
+from collections import Counter
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.response import Response
+from .conditional import model_version_name, permission_scope
+from .routers import primary_reads
+from .versions import get_versions
+
+# Headers worth replaying from a cached list response (bare array totals and next pages)
+REPLAYED_HEADERS = ("Link", "X-Next-Cursor", "X-Truncated", "X-Total-Count")
+# How long a request waits for another worker that is already computing the same entry
+SINGLE_FLIGHT_WAIT = 5.0
+SINGLE_FLIGHT_POLL = 0.05
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def _count(view_name, outcome):
+    with _stats_lock:
+        _stats[(view_name, outcome)] += 1
+
+
+def response_cache_stats():
+    """{view name: {"hit": n, "miss": n, "wait": n}} for this process."""
+    with _stats_lock:
+        stats = {}
+        for (view_name, outcome), value in _stats.items():
+            stats.setdefault(view_name, {"hit": 0, "miss": 0, "wait": 0})[outcome] = value
+        return stats
+
+
+def response_cache():
+    return caches[getattr(settings, "RESPONSE_CACHE_ALIAS", "default")]
+
+
+class CachedResponseMixin:
+    """
+    Caches successful GET responses of a read view.
+
+    Entries are keyed by host, path, query parameters, the user's permission
+    scope and the versions of `cache_models` (default: `etag_models`), so any
+    save/delete/m2m change of those models makes the old entries unreachable.
+    Only one worker recomputes a missing entry; the others wait for it. It reads
+    the primary: a lagging replica would store old data under the new versions.
+    Set `cache_timeout` per view.
+    """
+    cache_models = None
+    cache_timeout = 300
+
+    def get_cache_models(self):
+        return self.cache_models if self.cache_models is not None else getattr(self, "etag_models", ())
+
+    def get_cache_key(self, request):
+        versions = get_versions(*(model_version_name(model) for model in self.get_cache_models()))
+        query = sorted(request.query_params.lists())
+        parts = [
+            type(self).__name__, request.get_host(), request.path, repr(query),
+            permission_scope(request.user), *map(str, versions),
+        ]
+        return "response:" + hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+    def _cached_response(self, entry, outcome):
+        data, headers = entry
+        _count(type(self).__name__, outcome)
+        return Response(data, headers={**headers, "X-Cache": "HIT"})
+
+    def get(self, request, *args, **kwargs):
+        cache = response_cache()
+        key = self.get_cache_key(request)
+        entry = cache.get(key)
+        if entry is not None:
+            return self._cached_response(entry, "hit")
+
+        lock = key + ":lock"
+        locked = cache.add(lock, 1, timeout=int(SINGLE_FLIGHT_WAIT * 2))
+        if not locked:
+            # Someone else is computing this entry; wait for it rather than piling on
+            deadline = time.monotonic() + SINGLE_FLIGHT_WAIT
+            while time.monotonic() < deadline:
+                time.sleep(SINGLE_FLIGHT_POLL)
+                entry = cache.get(key)
+                if entry is not None:
+                    return self._cached_response(entry, "wait")
+        try:
+            with primary_reads():
+                response = super().get(request, *args, **kwargs)
+            if response.status_code == 200:
+                headers = {name: response[name] for name in REPLAYED_HEADERS if response.has_header(name)}
+                cache.set(key, (response.data, headers), self.cache_timeout)
+        finally:
+            # A waiter that gave up computes too, but the lock stays with its owner
+            if locked:
+                cache.delete(lock)
+        _count(type(self).__name__, "miss")
+        response["X-Cache"] = "MISS"
+        return response
@@ -0,0 +1,182 @@
+"""
+Read replicas (REPLICA_DATABASES, see settings.py).
+
+Reads made while serving a GET/HEAD/OPTIONS request go to a random replica that
+is no more than REPLICA_MAX_LAG seconds behind. Everything else reads the
+primary: unsafe requests, the rest of any request once it has written,
+management commands, and for REPLICA_STICKY_SECONDS the requests of a user who
+just wrote, so nobody reads data older than their own write. Code that stores
+what it reads under current version counters (response cache, ETags) reads
+the primary via primary_reads(), or checks replica_reads() to skip storing.
+"""
+import contextlib
+import contextvars
+import os
+import random
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DatabaseError, connections
+from django.utils.functional import empty
+
+PRIMARY = "default"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+# Zero while the standby has replayed everything it received, so an idle primary isn't "lag"
+POSTGRES_LAG_SQL = (
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+_state = contextvars.ContextVar("replica_routing", default=None)
+# alias -> (monotonic time of the check, lag in seconds or None when unreachable)
+_lag = {}
+
+
+def replicas():
+    return getattr(settings, "REPLICA_DATABASES", ())
+
+
+def pin_key(user_id):
+    return f"replica-pin:{user_id}"
+
+
+def _modified(path):
+    return max((os.path.getmtime(name) for name in (str(path), f"{path}-wal") if os.path.exists(name)), default=0.0)
+
+
+def replica_lag(alias):
+    """Seconds `alias` is behind the primary, or None when it can't be reached."""
+    connection = connections[alias]
+    try:
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(POSTGRES_LAG_SQL)
+                return float(cursor.fetchone()[0] or 0)
+        if connection.vendor == "sqlite":
+            # The local stand-in is a copy made by sync_replica. Once the primary changes after
+            # the copy, the replica is missing writes that are up to (now - copy time) old.
+            if not os.path.exists(connection.settings_dict["NAME"]):
+                return None
+            copied = _modified(connection.settings_dict["NAME"])
+            return time.time() - copied if _modified(connections[PRIMARY].settings_dict["NAME"]) > copied else 0.0
+    except (DatabaseError, OSError):
+        return None
+    return 0.0
+
+
+def healthy_replicas():
+    """Replicas within REPLICA_MAX_LAG; each one is probed at most every REPLICA_LAG_CHECK_SECONDS."""
+    now = time.monotonic()
+    interval = getattr(settings, "REPLICA_LAG_CHECK_SECONDS", 1)
+    max_lag = getattr(settings, "REPLICA_MAX_LAG", 5)
+    healthy = []
+    for alias in replicas():
+        checked = _lag.get(alias)
+        if checked is None or now - checked[0] >= interval:
+            checked = _lag[alias] = (now, replica_lag(alias))
+        if checked[1] is not None and checked[1] <= max_lag:
+            healthy.append(alias)
+    return healthy
+
+
+class RoutingState:
+    """Where the current request reads from."""
+
+    def __init__(self, request):
+        self.request = request
+        self.primary = request.method not in SAFE_METHODS
+        self.wrote = False
+        self.pin_checked = False
+        self.replica_reads = 0
+
+    def user(self):
+        # DRF stores the user it authenticated on the request. Django's lazy session
+        # user is left alone: evaluating it would run (and route) a query from in here.
+        user = self.request.__dict__.get("user")
+        user = getattr(user, "_wrapped", user)
+        if user is None or user is empty or not user.is_authenticated:
+            return None
+        return user
+
+    def needs_primary(self):
+        if not self.primary and not self.pin_checked:
+            user = self.user()
+            if user is not None:
+                self.pin_checked = True
+                self.primary = cache.get(pin_key(user.pk)) is not None
+        return self.primary
+
+
+def replica_reads():
+    """How many reads of the current request went to a replica so far."""
+    state = _state.get()
+    return state.replica_reads if state is not None else 0
+
+
+@contextlib.contextmanager
+def primary_reads():
+    """Reads in the block go to the primary, e.g. to fill a cache keyed by current versions."""
+    state = _state.get()
+    if state is None:
+        yield
+        return
+    primary, state.primary = state.primary, True
+    try:
+        yield
+    finally:
+        state.primary = primary or state.wrote
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if not replicas():
+            return None
+        state = _state.get()
+        if state is None or state.needs_primary():
+            return PRIMARY
+        healthy = healthy_replicas()
+        if not healthy:
+            return PRIMARY
+        state.replica_reads += 1
+        return random.choice(healthy)
+
+    def db_for_write(self, model, **hints):
+        if not replicas():
+            return None
+        state = _state.get()
+        if state is not None:
+            state.primary = state.wrote = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {PRIMARY, *replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema from the primary
+        return False if db in replicas() else None
+
+
+class ReplicaRoutingMiddleware:
+    """Tracks each request's routing state and pins users who wrote to the primary for a while."""
+
+    def __init__(self, get_response):
+        if not replicas():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state = RoutingState(request)
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        if state.wrote:
+            user = state.user()
+            if user is not None:
+                cache.set(pin_key(user.pk), True, getattr(settings, "REPLICA_STICKY_SECONDS", 10))
+        return response
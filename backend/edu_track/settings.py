@@ -66,6 +66,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so its view time covers every other middleware too
+    'edu_track.instrumentation.InstrumentationMiddleware',
+    'edu_track.profiling.ProfilingMiddleware',
+    'edu_track.routers.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -99,19 +103,104 @@ WSGI_APPLICATION = 'edu_track.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
+# DATABASE_PROFILE picks one of these. 'sqlite' (default) runs in WAL mode, so
+# readers never wait for the writer, and opens write transactions with BEGIN
+# IMMEDIATE: writers queue on the busy timeout instead of failing with 'database
+# is locked' when a read transaction tries to upgrade. 'postgres' is
+# experimental: CI (.github/workflows/backend.yml) runs the migrations and the
+# test suite on PostgreSQL 16, but it has not served real traffic yet. It uses
+# psycopg (requirements.txt) with a per-process connection pool
+# (DATABASE_POOL_SIZE), and .iterator() querysets stream through server-side
+# cursors. Behind PgBouncer in transaction mode, set DATABASE_PGBOUNCER=1 to
+# drop the pool and the cursors.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',  # fsync at checkpoints only; safe with WAL
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,  # KiB
+    'temp_store': 'MEMORY',
+}
+PGBOUNCER = os.environ.get('DATABASE_PGBOUNCER') == '1'
+DATABASE_PROFILES = {
+    'sqlite': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-        # Increase SQLite timeout to reduce 'database is locked' under concurrent writes
+        'NAME': os.environ.get('DATABASE_NAME', BASE_DIR / 'db.sqlite3'),
+        'CONN_MAX_AGE': 60,
         'OPTIONS': {
             'timeout': 20,
+            'transaction_mode': 'IMMEDIATE',
+            'init_command': ''.join(f'PRAGMA {name}={value};' for name, value in SQLITE_PRAGMAS.items()),
+        },
+    },
+    'postgres': {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.environ.get('DATABASE_NAME', 'edu_track'),
+        'USER': os.environ.get('DATABASE_USER', 'edu_track'),
+        'PASSWORD': os.environ.get('DATABASE_PASSWORD', ''),
+        'HOST': os.environ.get('DATABASE_HOST', '127.0.0.1'),
+        'PORT': os.environ.get('DATABASE_PORT', '5432'),
+        # Pooled connections can't also be persistent ones
+        'CONN_MAX_AGE': 60 if PGBOUNCER else 0,
+        'CONN_HEALTH_CHECKS': True,
+        'DISABLE_SERVER_SIDE_CURSORS': PGBOUNCER,
+        'OPTIONS': {} if PGBOUNCER else {
+            'pool': {'min_size': 2, 'max_size': int(os.environ.get('DATABASE_POOL_SIZE', '10')), 'timeout': 10},
         },
+    },
+}
+DATABASES = {
+    'default': DATABASE_PROFILES[os.environ.get('DATABASE_PROFILE', 'sqlite')],
+}
+
+# Read replicas (edu_track/routers.py), comma separated in DATABASE_REPLICAS: hosts
+# for the 'postgres' profile, database files for 'sqlite'. SQLite replicas are a
+# local stand-in that `manage.py sync_replica` copies from the primary. Safe
+# requests read a replica at most REPLICA_MAX_LAG seconds behind, and a user who
+# wrote reads the primary for REPLICA_STICKY_SECONDS. The stickiness is kept in
+# the default cache, so it needs a shared cache when there are several workers.
+REPLICA_DATABASES = []
+for number, replica in enumerate(filter(None, os.environ.get('DATABASE_REPLICAS', '').split(',')), 1):
+    DATABASES[f'replica{number}'] = {
+        **DATABASES['default'],
+        ('NAME' if DATABASES['default']['ENGINE'].endswith('sqlite3') else 'HOST'): replica.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+    REPLICA_DATABASES.append(f'replica{number}')
+DATABASE_ROUTERS = ['edu_track.routers.ReplicaRouter']
+REPLICA_MAX_LAG = 5
+REPLICA_LAG_CHECK_SECONDS = 1
+REPLICA_STICKY_SECONDS = 10
+
+# Per-process memory cache; with several workers point this at a shared backend
+# (Redis/Memcached) so invalidations reach every process
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'edu-track',
     }
 }
 
-# Keep DB connections open briefly to reuse and reduce reconnect overhead
-CONN_MAX_AGE = 60
+# Cached read responses (edu_track/response_cache.py): 'locmem' per process,
+# 'file' shared by the workers of one host, 'redis' shared by every host.
+# The version counters behind cache keys and ETags (edu_track/versions.py) are
+# kept in the same store, so a write in one worker invalidates the others.
+RESPONSE_CACHE_ALIAS = 'responses'
+RESPONSE_CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'edu-track-responses',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(BASE_DIR, 'var', 'response_cache'),
+    },
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('RESPONSE_CACHE_URL', 'redis://127.0.0.1:6379/1'),
+    },
+}
+CACHES[RESPONSE_CACHE_ALIAS] = RESPONSE_CACHE_BACKENDS[os.environ.get('RESPONSE_CACHE_BACKEND', 'locmem')]
+VERSION_CACHE_ALIAS = RESPONSE_CACHE_ALIAS
 
 
 # Password validation
@@ -163,6 +252,41 @@ STATIC_ROOT = BASE_DIR / 'static'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Media is served by edu_track.media.serve_media. Behind nginx set MEDIA_SENDFILE to
+# 'x-accel-redirect' (and map MEDIA_ACCEL_REDIRECT_PREFIX to MEDIA_ROOT as an internal
+# location), or to 'x-sendfile' for Apache/lighttpd, so workers only send headers.
+MEDIA_SENDFILE = os.environ.get('MEDIA_SENDFILE') or None
+MEDIA_ACCEL_REDIRECT_PREFIX = '/protected-media/'
+MEDIA_CACHE_MAX_AGE = 3600
+
+# Survey analytics cube (survey/cube.py): where it is stored and how old it may get
+# before a request folds in new answers. Keep it out of MEDIA_ROOT, media is public.
+SURVEY_CUBE_PATH = os.path.join(BASE_DIR, 'var', 'survey_cube.npz')
+SURVEY_CUBE_MAX_AGE = 300
+
+
+# Request instrumentation (edu_track/instrumentation.py): statements slower than
+# SLOW_QUERY_MS are logged with their call site; /metrics/ is scraped from
+# METRICS_ALLOWED_IPS or with "Authorization: Bearer $METRICS_TOKEN".
+SLOW_QUERY_MS = 100
+SLOW_QUERY_LOG_LIMIT = 5
+METRICS_ALLOWED_IPS = ('127.0.0.1', '::1')
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN') or None
+
+# Opt-in request profiling (edu_track/profiling.py): PROFILING_SAMPLE_RATE of requests
+# run under cProfile, the rest are stack-sampled every PROFILING_INTERVAL seconds and
+# kept when slower than PROFILING_SLOW_MS. The last PROFILING_KEEP profiles are stored
+# in PROFILING_DIR and listed for staff at /profiles/.
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED') == '1'
+PROFILING_SAMPLE_RATE = float(os.environ.get('PROFILING_SAMPLE_RATE', '0.01'))
+PROFILING_SLOW_MS = 1000
+PROFILING_INTERVAL = 0.01
+PROFILING_KEEP = 200
+PROFILING_DIR = os.path.join(BASE_DIR, 'var', 'profiles')
+
+# manage.py benchmark compares each run with this report (--save-baseline replaces it)
+BENCHMARK_BASELINE = os.path.join(BASE_DIR, 'var', 'benchmarks', 'baseline.json')
+
 
 AUTH_USER_MODEL = 'user.User'
 
@@ -177,8 +301,15 @@ REST_FRAMEWORK = {
         'rest_framework.parsers.FormParser',
         'rest_framework.parsers.MultiPartParser',
     ),
+    # Keyset pagination on id for every list view, see edu_track/pagination.py
+    'DEFAULT_PAGINATION_CLASS': 'edu_track.pagination.DefaultPagination',
 }
 
+# Clients that don't ask for pages (no ?cursor= / ?page_size=) still get a bare
+# array, capped at this many rows with the rest linked from the Link header
+PAGINATION_COMPAT_BARE_ARRAY = True
+PAGINATION_COMPAT_PAGE_SIZE = 1000
+
 SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
     "ACCESS_TOKEN_LIFETIME": timedelta(days=1),
@@ -0,0 +1,73 @@
+import hashlib
+import os
+from django.apps import apps
+from django.core.files.storage import FileSystemStorage
+from django.db import models
+
+BLOBS_DIR = "blobs"
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Media storage that names every file after the SHA-256 of its bytes.
+
+    `blobs/ab/abcdef...<ext>`: uploading the same logo twice stores it once and
+    both rows point at the same blob. Blobs are never rewritten in place, so
+    they are safe to cache forever. Unreferenced blobs are removed by the
+    gc_media command, see `blob_references()`.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("allow_overwrite", True)
+        super().__init__(**kwargs)
+
+    def blob_name(self, name, content):
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        ext = os.path.splitext(name)[1].lower()
+        hexdigest = digest.hexdigest()
+        return f"{BLOBS_DIR}/{hexdigest[:2]}/{hexdigest}{ext}"
+
+    def get_available_name(self, name, max_length=None):
+        # Names are derived from content, an existing name already holds these bytes
+        return name
+
+    def _save(self, name, content):
+        name = self.blob_name(name, content)
+        if self.exists(name):
+            # A fresh mtime keeps gc_media's grace period from removing a blob that an
+            # upload has just re-referenced but not committed yet
+            try:
+                os.utime(self.path(name))
+                return name
+            except FileNotFoundError:
+                pass
+        return super()._save(name, content)
+
+
+_media_storage = ContentAddressedStorage()
+
+
+def media_storage():
+    # Callable so migrations reference it instead of serializing an instance
+    return _media_storage
+
+
+def content_addressed_fields():
+    """Every (model, FileField) pair stored in the content-addressed store."""
+    for model in apps.get_models():
+        for field in model._meta.get_fields():
+            if isinstance(field, models.FileField) and isinstance(field.storage, ContentAddressedStorage):
+                yield model, field
+
+
+def blob_references():
+    """Reference count per stored name across all content-addressed fields."""
+    counts = {}
+    for model, field in content_addressed_fields():
+        rows = model.objects.exclude(**{field.name: ""}).exclude(**{f"{field.name}__isnull": True})
+        for name in rows.values_list(field.name, flat=True).iterator(chunk_size=2000):
+            counts[name] = counts.get(name, 0) + 1
+    return counts
@@ -0,0 +1,348 @@
+import datetime
+import time
+from collections import Counter
+from dataclasses import dataclass
+from itertools import islice
+import numpy as np
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group, Permission
+from django.db import connection, transaction
+from django.utils import timezone
+from attendance.models import Attendance, StudentAttendance, StudentMark, weekday
+from course.models import Course
+from faculty.models import Faculty
+from lecture.models import Lecture
+from location.models import Location
+from program.models import Program
+from survey import rollups
+from survey.models import SurveyAnswer, SurveyQuestion
+from university.models import University
+from user.models import User
+from user.search import rebuild_index
+
+# Rows per executemany() for the big link tables
+INSERT_CHUNK = 20_000
+LEVELS = [choice for choice, _ in User._meta.get_field("level").choices][:4]
+RATINGS = [choice for choice, _ in SurveyAnswer._meta.get_field("rating").choices]
+# Lectures run Saturday to Thursday in five two-hour periods
+TEACHING_DAYS = [day for day, _ in Lecture._meta.get_field("day").choices if day != weekday[4]]
+PERIODS = [datetime.time(8), datetime.time(10), datetime.time(12), datetime.time(14), datetime.time(16)]
+ROOM_CAPACITIES = [40, 60, 80, 120, 200, 300]
+# Every third lecture is co-taught
+MAX_INSTRUCTORS = 2
+DEFAULT_QUESTIONS = [
+    "The instructor explained the material clearly.",
+    "The lectures started and ended on time.",
+    "The course content matched the syllabus.",
+    "Questions were answered helpfully.",
+    "The room and equipment were adequate.",
+]
+# What each generated group may do through the API (GroupPermission checks groups only)
+STUDENT_PERMISSIONS = [
+    "university.view_university", "lecture.view_lecture", "course.view_course", "survey.view_surveyquestion",
+    "survey.add_surveyanswer", "attendance.view_studentattendance", "attendance.change_studentattendance", "attendance.view_studentmark",
+    "exam.view_examtable",
+]
+STAFF_PERMISSIONS = STUDENT_PERMISSIONS + [
+    "attendance.view_attendance", "attendance.add_attendance", "attendance.add_studentmark",
+    "attendance.change_studentmark", "survey.view_surveyanswer", "user.view_user",
+]
+
+
+class GenerationError(Exception):
+    pass
+
+
+@dataclass
+class Scale:
+    universities: int = 1
+    faculties: int = 8
+    programs: int = 4
+    courses: int = 12
+    sections: int = 2
+    rooms: int = 10
+    students: int = 10_000
+    courses_per_student: int = 6
+    lectures_per_instructor: int = 8
+    weeks: int = 14
+    survey_rate: float = 0.6
+    term_start: datetime.date = datetime.date(2025, 9, 20)
+
+
+def insert_rows(model, columns, rows):
+    """Plain INSERTs in INSERT_CHUNK batches, for link tables with millions of rows."""
+    quote = connection.ops.quote_name
+    sql = "INSERT INTO %s (%s) VALUES (%s)" % (
+        quote(model._meta.db_table), ", ".join(map(quote, columns)), ", ".join(["%s"] * len(columns)),
+    )
+    rows, total = iter(rows), 0
+    with connection.cursor() as cursor:
+        while chunk := list(islice(rows, INSERT_CHUNK)):
+            cursor.executemany(sql, chunk)
+            total += len(chunk)
+    return total
+
+
+class SyntheticUniversity:
+    """
+    A whole term of a university at a given Scale, built from one seed so the
+    same options always produce the same rows. Names, usernames and the
+    generated users' groups start with `prefix`; small tables use bulk_create, the link tables (enrolments,
+    attendance, answers) plain INSERTs, all in one transaction.
+    """
+
+    def __init__(self, scale, seed=42, prefix="syn", log=print):
+        self.scale = scale
+        self.rng = np.random.default_rng(seed)
+        self.prefix = prefix
+        self.log = log
+        self.stats = {}
+
+    def stage(self, name, count):
+        self.stats[name] = count
+        self.log(f"{name}: {count} ({time.perf_counter() - self.started:.1f}s)")
+
+    def run(self):
+        if University.objects.filter(slug__startswith=f"{self.prefix}-").exists():
+            raise GenerationError(f"Data with prefix '{self.prefix}' already exists; use another prefix or a fresh database.")
+        self.started = time.perf_counter()
+        with transaction.atomic():
+            self.catalog()
+            self.people()
+            self.choose()
+            self.timetable()
+            self.enrol()
+            self.term()
+        # Signal-maintained tables are rebuilt once instead of per row
+        rollups.rebuild()
+        rebuild_index()
+        self.stage("seconds", round(time.perf_counter() - self.started, 1))
+        return self.stats
+
+    def catalog(self):
+        s, p = self.scale, self.prefix
+        universities = University.objects.bulk_create([
+            University(name=f"{p.title()} U{u}"[:15], slug=f"{p}-u{u}", logo="") for u in range(s.universities)
+        ])
+        self.faculties = Faculty.objects.bulk_create([
+            Faculty(name=f"Faculty {u}.{f}", slug=f"{p}-u{u}-f{f}", logo="", university=university)
+            for u, university in enumerate(universities) for f in range(s.faculties)
+        ])
+        self.programs = Program.objects.bulk_create([
+            Program(name=f"{faculty.name} Program {n}", slug=f"{faculty.slug}-p{n}", faculty=faculty)
+            for faculty in self.faculties for n in range(s.programs)
+        ])
+        self.rooms = Location.objects.bulk_create([
+            Location(name=f"{faculty.name} Hall {r}", slug=f"{faculty.slug}-r{r}", capacity=int(self.rng.choice(ROOM_CAPACITIES)))
+            for faculty in self.faculties for r in range(s.rooms)
+        ])
+        Location.faculties.through.objects.bulk_create([
+            Location.faculties.through(location_id=room.id, faculty_id=self.faculties[i // s.rooms].id)
+            for i, room in enumerate(self.rooms)
+        ])
+        self.courses = Course.objects.bulk_create([
+            Course(title=f"{program.name} Course {c}", slug=f"{program.slug}-c{c}")
+            for program in self.programs for c in range(s.courses)
+        ])
+        # Course 0 of each faculty's first program is shared by all its programs
+        links = []
+        for i, program in enumerate(self.programs):
+            links += [(course.id, program.id) for course in self.courses[i * s.courses:(i + 1) * s.courses]]
+            if i % s.programs:
+                links.append((self.courses[(i - i % s.programs) * s.courses].id, program.id))
+        Course.programs.through.objects.bulk_create([
+            Course.programs.through(course_id=course_id, program_id=program_id) for course_id, program_id in links
+        ])
+        self.program_courses = {}
+        for course_id, program_id in links:
+            self.program_courses.setdefault(program_id, []).append(course_id)
+        self.stage("courses", len(self.courses))
+
+    def people(self):
+        s, p = self.scale, self.prefix
+        password = make_password(f"{p}-password")
+        program_of = self.rng.integers(len(self.programs), size=s.students)
+        level_of = self.rng.integers(len(LEVELS), size=s.students)
+        students = [
+            User(
+                username=f"{p}{i:06d}", email=f"{p}{i:06d}@{p}.edutrack.test", password=password,
+                first_name=f"Student{i}", last_name=p.title(), nationalid=f"{30000000000000 + i}",
+                university_id=self.programs[prog].faculty.university_id, faculty_id=self.programs[prog].faculty_id,
+                program_id=self.programs[prog].id, level=LEVELS[level],
+            )
+            for i, (prog, level) in enumerate(zip(program_of.tolist(), level_of.tolist()))
+        ]
+        self.students = User.objects.bulk_create(students, batch_size=5000)
+        self.student_program = program_of
+
+        # Enough for the load, and for every room being busy with co-taught lectures in the same slot
+        lectures_per_faculty = s.programs * s.courses * s.sections
+        per_faculty = max(s.rooms * MAX_INSTRUCTORS, -(-lectures_per_faculty * 2 // s.lectures_per_instructor))
+        self.instructors = User.objects.bulk_create([
+            User(
+                username=f"{p}-staff{f:03d}-{n:03d}", email=f"{p}-staff{f:03d}-{n:03d}@{p}.edutrack.test", password=password,
+                first_name=f"Instructor{n}", last_name=faculty.name, university_id=faculty.university_id, faculty_id=faculty.id,
+            )
+            for f, faculty in enumerate(self.faculties) for n in range(per_faculty)
+        ], batch_size=5000)
+        self.instructors_per_faculty = per_faculty
+
+        # Groups of their own: the real student and staff groups keep their permissions
+        student_group = Group.objects.create(name=f"{p}-students")
+        staff_group = Group.objects.create(name=f"{p}-staff")
+        for group, names in ((student_group, STUDENT_PERMISSIONS), (staff_group, STAFF_PERMISSIONS)):
+            group.permissions.add(*(
+                Permission.objects.get(content_type__app_label=name.split(".")[0], codename=name.split(".")[1]) for name in names
+            ))
+        insert_rows(User.groups.through, ("user_id", "group_id"), (
+            [(user.id, student_group.id) for user in self.students] + [(user.id, staff_group.id) for user in self.instructors]
+        ))
+        self.stage("students", len(self.students))
+        self.stage("instructors", len(self.instructors))
+
+    def choose(self):
+        """Each student picks courses_per_student of their program's courses."""
+        s = self.scale
+        self.choices = []
+        for index, program in enumerate(self.programs):
+            members = np.flatnonzero(self.student_program == index)
+            courses = np.array(self.program_courses[program.id])
+            take = min(s.courses_per_student, len(courses))
+            # A random permutation per student, vectorized: argsort of uniform noise
+            picks = np.argsort(self.rng.random((len(members), len(courses))), axis=1)[:, :take]
+            for row, student in enumerate(members.tolist()):
+                self.choices += [(course, student) for course in courses[picks[row]].tolist()]
+        self.demand = Counter(course for course, _ in self.choices)
+
+    def timetable(self):
+        """
+        Sections of every course in the faculty's rooms, no room or instructor
+        double-booked. A course gets more than `sections` sections when its
+        students don't fit in the biggest room otherwise, and each section goes
+        to the smallest room that seats it.
+        """
+        s = self.scale
+        weekly = len(TEACHING_DAYS) * len(PERIODS)
+        lectures, instructor_links = [], []
+        for f, faculty in enumerate(self.faculties):
+            staff = self.instructors[f * self.instructors_per_faculty:(f + 1) * self.instructors_per_faculty]
+            busy = [set() for _ in staff]
+            rooms = sorted(self.rooms[f * s.rooms:(f + 1) * s.rooms], key=lambda room: room.capacity)
+            free = {room.id: list(range(weekly)) for room in rooms}
+            sections = []
+            for course in self.courses[f * s.programs * s.courses:(f + 1) * s.programs * s.courses]:
+                demand = self.demand[course.id]
+                count = max(s.sections, -(-demand // rooms[-1].capacity))
+                sections += [(-(-demand // count), course) for _ in range(count)]
+            if len(sections) > s.rooms * weekly:
+                raise GenerationError(f"{s.rooms} rooms per faculty can't hold {len(sections)} weekly lectures.")
+            # Biggest sections first, while the big rooms still have free slots
+            for position, (size, course) in enumerate(sorted(sections, key=lambda section: -section[0])):
+                room = next((room for room in rooms if room.capacity >= size and free[room.id]), None)
+                if room is None:
+                    raise GenerationError(f"No free room in {faculty.name} seats a {size}-student section; add --rooms or --sections.")
+                slot = free[room.id].pop(0)
+                day, period = TEACHING_DAYS[slot % len(TEACHING_DAYS)], PERIODS[slot // len(TEACHING_DAYS)]
+                lectures.append(Lecture(
+                    course=course, location=room, day=day, starttime=period,
+                    endtime=(datetime.datetime.combine(datetime.date.min, period) + datetime.timedelta(hours=2)).time(),
+                    weight=10,
+                ))
+                # One or two instructors who are free in this slot
+                wanted = 1 + (position % 3 == 0)
+                for i in self.rng.permutation(len(staff)).tolist():
+                    if not wanted:
+                        break
+                    if slot not in busy[i]:
+                        busy[i].add(slot)
+                        instructor_links.append((len(lectures) - 1, staff[i].id))
+                        wanted -= 1
+                if wanted:
+                    raise GenerationError(f"Not enough free instructors in {faculty.name} for a lecture on {day} at {period}.")
+        self.lectures = Lecture.objects.bulk_create(lectures, batch_size=2000)
+        insert_rows(Lecture.instructor.through, ("lecture_id", "user_id"), (
+            (self.lectures[index].id, user_id) for index, user_id in instructor_links
+        ))
+        self.sections = {}
+        for lecture in self.lectures:
+            self.sections.setdefault(lecture.course_id, []).append(lecture.id)
+        self.stage("lectures", len(self.lectures))
+
+    def enrol(self):
+        """Each course's students are dealt round-robin over its sections, so no section outgrows its room."""
+        by_course = {}
+        for course, student in self.choices:
+            by_course.setdefault(course, []).append(student)
+        pairs = []
+        for course, members in by_course.items():
+            sections = self.sections[course]
+            for n, student in enumerate(self.rng.permutation(members).tolist()):
+                pairs.append((sections[n % len(sections)], self.students[student].id))
+        pairs.sort()
+        self.enrolments = np.array(pairs, dtype=np.int64).reshape(-1, 2)
+        insert_rows(Lecture.students.through, ("lecture_id", "user_id"), pairs)
+        self.stage("enrolments", len(pairs))
+
+    def term(self):
+        """Weekly attendance sessions with per-student present rates, then marks and survey answers."""
+        s = self.scale
+        day_number = {name: number for number, name in weekday.items()}
+        sessions = []
+        for lecture in self.lectures:
+            offset = (day_number[lecture.day] - s.term_start.weekday()) % 7
+            first = datetime.datetime.combine(s.term_start + datetime.timedelta(days=offset), lecture.starttime)
+            for week in range(s.weeks):
+                sessions.append((lecture.id, timezone.make_aware(first + datetime.timedelta(weeks=week, minutes=10))))
+        objs = Attendance.objects.bulk_create([Attendance(lecture_id=lecture_id) for lecture_id, _ in sessions], batch_size=5000)
+        # time is auto_now_add, so the real session times go in with bulk_update
+        for obj, (_, when) in zip(objs, sessions):
+            obj.time = when
+        Attendance.objects.bulk_update(objs, ["time"], batch_size=1000)
+        session_ids = {}
+        for obj in objs:
+            session_ids.setdefault(obj.lecture_id, []).append(obj.id)
+        self.stage("sessions", len(objs))
+
+        student_ids = np.array([user.id for user in self.students])
+        # Most students attend 70-95% of the time, a tail attends rarely; attendance fades over the term
+        propensity = dict(zip(student_ids.tolist(), self.rng.beta(6, 1.5, size=len(student_ids)).tolist()))
+        fade = np.linspace(1.0, 0.85, s.weeks)
+        questions = list(SurveyQuestion.objects.values_list("id", flat=True)) or [
+            question.id for question in SurveyQuestion.objects.bulk_create([SurveyQuestion(text=t) for t in DEFAULT_QUESTIONS])
+        ]
+
+        attendance_rows, marks, answers = [], [], []
+        lecture_ids, starts = np.unique(self.enrolments[:, 0], return_index=True)
+        bounds = list(starts[1:]) + [len(self.enrolments)]
+        attendance_total = answer_total = 0
+        for lecture_id, start, stop in zip(lecture_ids.tolist(), starts.tolist(), bounds):
+            members = self.enrolments[start:stop, 1]
+            p = np.array([propensity[m] for m in members.tolist()])
+            present = self.rng.random((s.weeks, len(members))) < fade[:, None] * p[None, :]
+            for week, attendance_id in enumerate(session_ids[lecture_id]):
+                attendance_rows.extend(zip([attendance_id] * len(members), members.tolist(), present[week].tolist()))
+            attendance_mark = np.round(present.mean(axis=0) * 10, 2)
+            instructor_mark = np.round(np.clip(self.rng.normal(60, 15, len(members)), 0, 90), 1)
+            marks.extend(zip(
+                members.tolist(), [lecture_id] * len(members), attendance_mark.tolist(),
+                instructor_mark.tolist(), (attendance_mark + instructor_mark).tolist(),
+            ))
+            # A lecture's quality shifts its whole rating distribution
+            quality = self.rng.normal(0, 0.8)
+            weights = np.exp(-0.5 * (np.arange(len(RATINGS)) - 1.2 - quality) ** 2)
+            weights /= weights.sum()
+            for student in members[self.rng.random(len(members)) < s.survey_rate].tolist():
+                for question, rating in zip(questions, self.rng.choice(len(RATINGS), size=len(questions), p=weights).tolist()):
+                    answers.append((lecture_id, question, student, RATINGS[rating]))
+            if len(attendance_rows) >= INSERT_CHUNK * 5:
+                attendance_total += insert_rows(StudentAttendance, ("attendance_id", "student_id", "present"), attendance_rows)
+                attendance_rows = []
+            if len(answers) >= INSERT_CHUNK * 5:
+                answer_total += insert_rows(SurveyAnswer, ("lecture_id", "question_id", "student_id", "rating"), answers)
+                answers = []
+        attendance_total += insert_rows(StudentAttendance, ("attendance_id", "student_id", "present"), attendance_rows)
+        answer_total += insert_rows(SurveyAnswer, ("lecture_id", "question_id", "student_id", "rating"), answers)
+        insert_rows(StudentMark, ("student_id", "lecture_id", "attendance_mark", "instructor_mark", "final_mark"), marks)
+        self.stage("attendance", attendance_total)
+        self.stage("marks", len(marks))
+        self.stage("survey_answers", answer_total)
@@ -0,0 +1,316 @@
+"""
+Shared fixtures for the query-budget tests in <app>/tests.py.
+
+Every test class seeds the same realistic data set, then asserts a maximum
+query count for each route it exercises. A class declares the URL names it
+covers in `routes`; edu_track/tests.py fails when a route in the URLconf is not
+covered by any class. Run with QUERY_BUDGET_REPORT=1 to print the actual
+numbers when a budget has to be adjusted. Each request also has a generous time
+bound, MAX_MS unless the test passes a higher `ms=` for a known heavy write;
+QUERY_BUDGET_MAX_MS=<ms> tightens or loosens it for a slower or faster machine.
+"""
+import datetime
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from io import BytesIO
+from types import SimpleNamespace
+from django.contrib.admin.models import ADDITION, CHANGE, LogEntry
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group, Permission
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import caches
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver, resolve
+from PIL import Image
+from rest_framework.test import APIClient
+from attendance.models import Attendance, StudentAttendance, StudentMark
+from course.models import Course
+from exam.models import ExamTable
+from faculty.models import Faculty
+from lecture.models import Lecture
+from location.models import Location
+from program.models import Program
+from survey import rollups
+from survey.models import SurveyAnswer, SurveyQuestion
+from university.models import University
+from user.models import User
+from user.search import rebuild_index
+from .hot_queries import plan_problems
+
+PASSWORD = "budget-pass-123"
+LEVELS = [choice for choice, _ in User._meta.get_field("level").choices]
+DAYS = [choice for choice, _ in Lecture._meta.get_field("day").choices]
+RATINGS = [choice for choice, _ in SurveyAnswer._meta.get_field("rating").choices]
+
+# Default upper bound per request; generous, the query count is the real gate
+MAX_MS = float(os.environ.get("QUERY_BUDGET_MAX_MS") or 1500)
+# Seeding hashes a password for every user; PBKDF2 would dominate the run time
+FAST_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
+def png_bytes(size=(32, 32), color=(30, 120, 200)):
+    buffer = BytesIO()
+    Image.new("RGB", size, color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def image_upload(name="image.png"):
+    return ContentFile(png_bytes(), name=name)
+
+
+def seed(students=300, courses=24, lectures_per_course=2, students_per_lecture=25, sessions=3):
+    """
+    A university-sized data set: faculties, programs, rooms, courses, lectures
+    with instructors and students, attendance sessions, marks, survey answers,
+    exam tables and admin log entries. Rows go in with bulk_create, so signal
+    driven tables (search index, survey rollups) are rebuilt at the end.
+    """
+    university = University.objects.create(name="EduTrack", slug="edutrack", logo=image_upload("logo.png"))
+    logo = university.logo.name
+    faculties = Faculty.objects.bulk_create([
+        Faculty(name=f"Faculty {i}", slug=f"faculty-{i}", logo=logo, university=university) for i in range(3)
+    ])
+    programs = Program.objects.bulk_create([
+        Program(name=f"Program {i}", slug=f"program-{i}", faculty=faculties[i % len(faculties)]) for i in range(6)
+    ])
+    locations = Location.objects.bulk_create([
+        Location(name=f"Hall {i}", slug=f"hall-{i}", capacity=60 + 20 * i) for i in range(8)
+    ])
+    Location.faculties.through.objects.bulk_create([
+        Location.faculties.through(location_id=location.id, faculty_id=faculties[i % len(faculties)].id)
+        for i, location in enumerate(locations)
+    ])
+    course_rows = Course.objects.bulk_create([Course(title=f"Course {i}", slug=f"course-{i}") for i in range(courses)])
+    Course.programs.through.objects.bulk_create([
+        Course.programs.through(course_id=course.id, program_id=programs[(i + offset) % len(programs)].id)
+        for i, course in enumerate(course_rows) for offset in range(1 + i % 2)
+    ])
+
+    password = make_password(PASSWORD)
+    student_rows = User.objects.bulk_create([
+        User(
+            username=f"student{i}", email=f"student{i}@edutrack.test", password=password,
+            first_name=f"Student{i}", last_name="Budget", nationalid=f"{29900000000000 + i}",
+            university=university, faculty=programs[i % len(programs)].faculty, program=programs[i % len(programs)],
+            level=LEVELS[i % 4],
+        )
+        for i in range(students)
+    ])
+    instructors = User.objects.bulk_create([
+        User(username=f"instructor{i}", email=f"instructor{i}@edutrack.test", password=password,
+             first_name=f"Instructor{i}", last_name="Budget", university=university)
+        for i in range(12)
+    ])
+    instructor_group = Group.objects.create(name="Instructor")
+    instructor_group.user_set.add(*instructors)
+    student_group = Group.objects.create(name="Students")
+    student_group.user_set.add(*student_rows)
+
+    # Each room gets one lecture per day, so the seed passes LectureSerializer's clash checks
+    lecture_rows = Lecture.objects.bulk_create([
+        Lecture(
+            course=course_rows[i // lectures_per_course], location=locations[i % len(locations)],
+            day=DAYS[i // len(locations) % len(DAYS)], starttime=datetime.time(8 + 2 * (i % 5)),
+            endtime=datetime.time(9 + 2 * (i % 5)), weight=10,
+        )
+        for i in range(courses * lectures_per_course)
+    ])
+    Lecture.instructor.through.objects.bulk_create([
+        Lecture.instructor.through(lecture_id=lecture.id, user_id=instructors[(i + k) % len(instructors)].id)
+        for i, lecture in enumerate(lecture_rows) for k in range(2)
+    ])
+    enrolled = {
+        lecture.id: [student_rows[(i * 7 + k) % students] for k in range(students_per_lecture)]
+        for i, lecture in enumerate(lecture_rows)
+    }
+    Lecture.students.through.objects.bulk_create([
+        Lecture.students.through(lecture_id=lecture_id, user_id=student.id)
+        for lecture_id, members in enrolled.items() for student in members
+    ])
+
+    attendances = Attendance.objects.bulk_create([
+        Attendance(lecture=lecture) for lecture in lecture_rows for _ in range(sessions)
+    ])
+    StudentAttendance.objects.bulk_create([
+        StudentAttendance(attendance=attendance, student=student, present=(attendance.id + student.id) % 3 != 0)
+        for attendance in attendances for student in enrolled[attendance.lecture_id]
+    ], batch_size=2000)
+    StudentMark.objects.bulk_create([
+        StudentMark(student=student, lecture_id=lecture_id, attendance_mark=5, instructor_mark=10, final_mark=15)
+        for lecture_id, members in enrolled.items() for student in members
+    ], batch_size=2000)
+
+    questions = SurveyQuestion.objects.bulk_create([SurveyQuestion(text=f"Question {i}?") for i in range(5)])
+    surveyed = lecture_rows[: len(lecture_rows) // 2]
+    SurveyAnswer.objects.bulk_create([
+        SurveyAnswer(lecture=lecture, question=question, student=student, rating=RATINGS[(student.id + question.id) % len(RATINGS)])
+        # The first student of each lecture is left unanswered for submission tests
+        for lecture in surveyed for student in enrolled[lecture.id][1:] for question in questions
+    ], batch_size=2000)
+    rollups.rebuild()
+
+    exam_image = ExamTable._meta.get_field("image").storage.save("exams/table.png", image_upload())
+    ExamTable.objects.bulk_create([
+        ExamTable(university=university, faculty=program.faculty, program=program, image=exam_image, level=level)
+        for program in programs for level in LEVELS[:4]
+    ])
+
+    content_type = ContentType.objects.get_for_model(Course)
+    LogEntry.objects.bulk_create([
+        LogEntry(
+            user=instructors[i % len(instructors)], content_type=content_type, object_id=str(course_rows[i % courses].id),
+            object_repr=course_rows[i % courses].title, action_flag=ADDITION if i % 2 else CHANGE, change_message="[]",
+        )
+        for i in range(200)
+    ])
+    rebuild_index()
+
+    return SimpleNamespace(
+        university=university, faculties=faculties, programs=programs, locations=locations,
+        courses=course_rows, students=student_rows, instructors=instructors, lectures=lecture_rows,
+        enrolled=enrolled, attendances=attendances, questions=questions, surveyed=surveyed,
+    )
+
+
+def route_names(resolver=None, namespace=None):
+    """Every named route of the URLconf (admin excluded), namespaced like reverse() expects."""
+    resolver = resolver or get_resolver()
+    names = set()
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.app_name == "admin":
+                continue
+            inner = pattern.namespace
+            names |= route_names(pattern, f"{namespace}:{inner}" if namespace and inner else inner or namespace)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            names.add(f"{namespace}:{pattern.name}" if namespace else pattern.name)
+    return names
+
+
+class MediaTestCase(TestCase):
+    """Runs each test class against an empty temporary MEDIA_ROOT."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls._media_dir = tempfile.mkdtemp()
+        cls._media_settings = override_settings(MEDIA_ROOT=cls._media_dir)
+        cls._media_settings.enable()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls._media_settings.disable()
+        shutil.rmtree(cls._media_dir, ignore_errors=True)
+
+
+class SeededTestCase(TestCase):
+    """
+    Seeds `seed(**seed_options)` once per class and authenticates as `self.user`,
+    an enrolled student who also holds every permission (and is staff), so each
+    route can be exercised without 403s. Media, the survey cube and profiles go
+    to a temporary directory, and passwords are hashed with FAST_HASHERS.
+    """
+    seed_options = {}
+
+    @classmethod
+    def setUpClass(cls):
+        cls._tmpdir = tempfile.mkdtemp()
+        cls._settings = override_settings(
+            MEDIA_ROOT=os.path.join(cls._tmpdir, "media"),
+            SURVEY_CUBE_PATH=os.path.join(cls._tmpdir, "survey_cube.npz"),
+            PROFILING_DIR=os.path.join(cls._tmpdir, "profiles"),
+            PASSWORD_HASHERS=FAST_HASHERS,
+        )
+        cls._settings.enable()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls._settings.disable()
+        shutil.rmtree(cls._tmpdir, ignore_errors=True)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = seed(**cls.seed_options)
+        cls.user = cls.data.students[0]
+        cls.user.is_staff = True
+        cls.user.save(update_fields=["is_staff"])
+        everything = Group.objects.create(name="Budget")
+        everything.permissions.set(Permission.objects.all())
+        cls.user.groups.add(everything)
+
+    def setUp(self):
+        # Cached responses, ETags and counters would hide the real query counts
+        for alias in ("default", "responses"):
+            caches[alias].clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+
+class QueryBudgetTestCase(SeededTestCase):
+    """
+    Asserts a maximum query count and time per request on the seeded data. `routes` lists the URL names the class covers; when the whole
+    class runs, each must be hit by assertBudget at least once.
+    """
+    routes = ()
+    max_ms = MAX_MS
+
+    @classmethod
+    def setUpClass(cls):
+        cls._hit = set()
+        cls._ran = 0
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        # A single test (or a -k selection) can't be expected to cover every route
+        if cls._ran < len(unittest.TestLoader().getTestCaseNames(cls)):
+            return
+        missing = set(cls.routes) - cls._hit
+        if missing:
+            raise AssertionError(f"{cls.__name__} declares routes without a budget test: {', '.join(sorted(missing))}")
+
+    def setUp(self):
+        super().setUp()
+        type(self)._ran += 1
+
+    def assertBudget(self, method, url, queries, status=200, ms=None, data=None, client=None, **extra):
+        """
+        Request `url` and fail when it returns another status, runs more than
+        `queries` queries or takes longer than `ms` (a floor for heavy writes,
+        default max_ms).
+        """
+        client = client or self.client
+        kwargs = {"format": extra.pop("format", "json")} if method != "get" else {}
+        with CaptureQueriesContext(connection) as context:
+            start = time.perf_counter()
+            response = getattr(client, method)(url, data, **kwargs, **extra)
+            elapsed = (time.perf_counter() - start) * 1000
+        match = resolve(url.split("?")[0])
+        self.assertIn(match.view_name, self.routes, f"{match.view_name} is not listed in {type(self).__name__}.routes")
+        type(self)._hit.add(match.view_name)
+        if os.environ.get("QUERY_BUDGET_REPORT"):
+            print(f"{method.upper()} {url}: {len(context)} queries (budget {queries}), {elapsed:.0f} ms", file=sys.stderr)
+        self.assertEqual(response.status_code, status, getattr(response, "content", b"")[:500])
+        sql = "\n".join(query["sql"] for query in context.captured_queries)
+        self.assertLessEqual(len(context), queries, f"{method.upper()} {url} ran {len(context)} queries:\n{sql}")
+        limit = max(ms or 0, self.max_ms)
+        self.assertLessEqual(elapsed, limit, f"{method.upper()} {url} took {elapsed:.0f} ms")
+        return response
+
+    def assertUsesIndex(self, queryset, index=None):
+        """EXPLAIN QUERY PLAN must search the queryset's table through an index (SQLite only)."""
+        if connection.vendor != "sqlite":
+            self.skipTest("EXPLAIN QUERY PLAN checks run on SQLite")
+        plan, problems = plan_problems(queryset, index)
+        self.assertFalse(problems, f"{', '.join(problems)}:\n{plan}")
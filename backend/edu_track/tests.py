@@ -0,0 +1,474 @@
+import datetime
+import hashlib
+import importlib
+import os
+import threading
+import time
+from io import BytesIO, StringIO
+from types import SimpleNamespace
+from unittest import mock
+from django.apps import apps
+from django.contrib import admin
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache, caches
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Count, F
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from PIL import Image
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+from rest_framework.views import APIView
+from attendance.models import StudentAttendance
+from exam.models import ExamSchedule, ScheduledExam
+from lecture.models import Lecture
+from university.models import University
+from user.models import User
+from . import routers
+from .admin import EstimatedCountPaginator
+from .benchmark import BenchmarkError, check_local, compare, summarize
+from .conditional import ConditionalGetMixin
+from .hot_queries import hot_queries
+from .images import LOGO_RENDITIONS, rendition_names
+from .pagination import DefaultPagination
+from .profiling import ProfilingMiddleware, StackSampler, sampled_frames, store
+from .response_cache import CachedResponseMixin
+from .storage import media_storage
+from .synthetic import GenerationError, Scale, SyntheticUniversity
+from .testing import MediaTestCase, QueryBudgetTestCase, png_bytes, route_names
+
+
+class EduTrackQueryBudgetTests(QueryBudgetTestCase):
+    routes = {"catalog-tree", "metrics", "media", "profile-list", "profile-detail"}
+
+    def test_catalog(self):
+        self.assertBudget("get", "/catalog/", 6)
+
+    def test_metrics(self):
+        self.client.get("/course/")
+        self.assertBudget("get", "/metrics/", 0)
+
+    def test_media(self):
+        self.assertBudget("get", f"/media/{self.data.university.logo.name}", 0)
+
+    def test_hot_query_plans(self):
+        queries = hot_queries()
+        self.assertTrue(queries)
+        for query in queries:
+            with self.subTest(query.name):
+                self.assertUsesIndex(query.queryset, query.index)
+
+    def test_profiles(self):
+        record = {"method": "GET", "path": "/course/", "duration_ms": 1200.0, "reason": "slow", "kind": "sampling", "frames": []}
+        store().save(record)
+        self.assertBudget("get", "/profiles/", 0)
+        self.assertBudget("get", f"/profiles/{record['id']}/", 0)
+
+
+class RouteCoverageTests(SimpleTestCase):
+    def test_every_route_has_a_budget(self):
+        # Each app's tests.py declares the routes its budget tests cover
+        for app in apps.get_app_configs():
+            try:
+                importlib.import_module(f"{app.name}.tests")
+            except ModuleNotFoundError:
+                pass
+        covered = set().union(*(case.routes for case in QueryBudgetTestCase.__subclasses__()))
+        missing = route_names() - covered
+        self.assertFalse(missing, f"Routes without a query budget: {', '.join(sorted(missing))}")
+
+
+class BenchmarkReportTests(SimpleTestCase):
+    def test_summary_and_comparison(self):
+        fast = summarize({"GET /course/": [(0.01, True)] * 95 + [(0.5, True)] * 5}, 1.0)
+        slow = summarize({"GET /course/": [(0.02, True)] * 90 + [(0.5, False)] * 10}, 2.0)
+        endpoint = slow["endpoints"]["GET /course/"]
+        self.assertEqual((endpoint["requests"], endpoint["errors"], endpoint["throughput_rps"]), (100, 10, 50.0))
+        self.assertEqual(endpoint["p50_ms"], 20.0)
+        [row] = compare({"scenarios": {"dashboard": slow}}, {"scenarios": {"dashboard": fast}})
+        self.assertTrue(row["regressed"])
+        self.assertEqual(row["change"]["throughput_rps"], -0.5)
+        [row] = compare({"scenarios": {"dashboard": fast}}, {"scenarios": {"dashboard": fast}})
+        self.assertFalse(row["regressed"])
+
+    def test_local_servers_only(self):
+        check_local("http://127.0.0.1:8000")
+        with self.assertRaises(BenchmarkError):
+            check_local("https://edutrack.example.com")
+
+
+class SyntheticUniversityTests(TestCase):
+    def generate(self, **options):
+        scale = Scale(**{"students": 500, "faculties": 2, "programs": 2, "courses": 4, "weeks": 1, **options})
+        return SyntheticUniversity(scale, log=lambda message: None).run()
+
+    def test_every_lecture_staffed_and_seated(self):
+        stats = self.generate(rooms=10)
+        lectures = Lecture.objects.annotate(instructors=Count("instructor", distinct=True), size=Count("students", distinct=True))
+        self.assertEqual(lectures.count(), stats["lectures"])
+        self.assertFalse(lectures.filter(instructors=0).exists())
+        self.assertFalse(lectures.filter(size__gt=F("location__capacity")).exists())
+        self.assertEqual(sum(lecture.size for lecture in lectures), stats["enrolments"])
+        # The generated users can use the API
+        student = User.objects.filter(groups__name="syn-students").first()
+        client = APIClient()
+        client.force_authenticate(student)
+        self.assertEqual(client.get("/lecture/").status_code, 200)
+
+    def test_real_groups_untouched(self):
+        staff = Group.objects.create(name="دكاترة - معيدين")
+        self.generate()
+        self.assertFalse(staff.permissions.exists())
+        self.assertFalse(staff.user_set.exists())
+        # Generated instructors still mark attendance in their own lectures
+        row = StudentAttendance.objects.select_related("attendance__lecture").first()
+        instructor = row.attendance.lecture.instructor.first()
+        self.assertTrue(instructor.groups.filter(name="syn-staff").exists())
+        client = APIClient()
+        client.force_authenticate(instructor)
+        self.assertEqual(client.patch(f"/attendance/students/{row.id}/update/", {"present": True}, format="json").status_code, 200)
+        outsider = User.objects.filter(groups__name="syn-staff").exclude(lectures_taught=row.attendance.lecture).first()
+        client.force_authenticate(outsider)
+        self.assertEqual(client.patch(f"/attendance/students/{row.id}/update/", {"present": True}, format="json").status_code, 403)
+
+    def test_impossible_scale(self):
+        with self.assertRaises(GenerationError):
+            self.generate(rooms=1, sections=20)
+
+
+@override_settings(REPLICA_DATABASES=["replica1"], REPLICA_MAX_LAG=5)
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        routers._lag.clear()
+        cache.clear()
+        self.router = routers.ReplicaRouter()
+        self.user = SimpleNamespace(pk=7, is_authenticated=True)
+
+    def route(self, method="get", lag=0.0, write=False):
+        request = getattr(RequestFactory(), method)("/course/")
+        request.user = self.user
+        seen = []
+
+        def view(request):
+            # Where a read goes before and after the (optional) write
+            seen.append(self.router.db_for_read(None))
+            if write:
+                self.router.db_for_write(None)
+            seen.append(self.router.db_for_read(None))
+
+        with mock.patch.object(routers, "replica_lag", return_value=lag):
+            routers.ReplicaRoutingMiddleware(view)(request)
+        return seen
+
+    def test_safe_reads_use_the_replica(self):
+        self.assertEqual(self.route(), ["replica1", "replica1"])
+        self.assertEqual(self.router.db_for_read(None), "default")  # outside a request
+
+    def test_writes_pin_the_request_and_the_user(self):
+        self.assertEqual(self.route(method="post"), ["default", "default"])
+        self.assertEqual(self.route(write=True), ["replica1", "default"])
+        self.assertEqual(self.route(), ["default", "default"])
+        cache.delete(routers.pin_key(self.user.pk))
+        self.assertEqual(self.route(), ["replica1", "replica1"])
+
+    def test_lagging_or_unreachable_replica_falls_back(self):
+        self.assertEqual(self.route(lag=30.0), ["default", "default"])
+        routers._lag.clear()
+        self.assertEqual(self.route(lag=None), ["default", "default"])
+
+    def serve(self, mixin, lag=0.0):
+        router = self.router
+
+        class Reader(APIView):
+            authentication_classes = permission_classes = ()
+            etag_models = (University,)
+
+            def get(self, request):
+                return Response({"db": router.db_for_read(None)})
+
+        view = type("View", (mixin, Reader), {}).as_view()
+        with mock.patch.object(routers, "replica_lag", return_value=lag):
+            return routers.ReplicaRoutingMiddleware(view)(RequestFactory().get("/course/"))
+
+    def test_cache_fills_read_the_primary(self):
+        caches["responses"].clear()
+        response = self.serve(CachedResponseMixin)
+        self.assertEqual((response["X-Cache"], response.data), ("MISS", {"db": "default"}))
+
+    def test_replica_bodies_get_no_etag(self):
+        response = self.serve(ConditionalGetMixin)
+        self.assertEqual(response.data, {"db": "replica1"})
+        self.assertFalse(response.has_header("ETag"))
+        routers._lag.clear()
+        response = self.serve(ConditionalGetMixin, lag=30.0)
+        self.assertEqual(response.data, {"db": "default"})
+        self.assertTrue(response.has_header("ETag"))
+
+
+class RenditionTests(MediaTestCase):
+    def test_renditions_are_built_once(self):
+        university = University.objects.create(name="EduTrack", slug="edutrack", logo=ContentFile(png_bytes((400, 300)), name="logo.png"))
+        names = rendition_names(university.logo, LOGO_RENDITIONS)
+        self.assertEqual(set(names), set(LOGO_RENDITIONS))
+        for spec, box in LOGO_RENDITIONS.items():
+            self.assertEqual(set(names[spec]), {"webp", "jpeg"})
+            with default_storage.open(names[spec]["webp"]) as rendition:
+                width, height = Image.open(rendition).size
+            self.assertLessEqual(width, box[0])
+            self.assertLessEqual(height, box[1])
+            self.assertEqual(width * 3, height * 4)
+
+        # Later saves find the renditions in storage without decoding the original
+        with mock.patch("edu_track.images.Image.open") as image_open:
+            university.name = "Renamed"
+            university.save()
+        image_open.assert_not_called()
+
+    def test_transparent_sources_fall_back_to_png(self):
+        buffer = BytesIO()
+        Image.new("RGBA", (100, 100), (0, 0, 0, 0)).save(buffer, "PNG")
+        logo = ContentFile(buffer.getvalue(), name="clear.png")
+        university = University.objects.create(name="Clear", slug="clear", logo=logo)
+        self.assertEqual(set(rendition_names(university.logo, LOGO_RENDITIONS)["thumb"]), {"webp", "png"})
+
+
+class ContentAddressedStorageTests(MediaTestCase):
+    def test_duplicate_uploads_share_a_blob(self):
+        first = University.objects.create(name="One", slug="one", logo=ContentFile(png_bytes(), name="a.png"))
+        second = University.objects.create(name="Two", slug="two", logo=ContentFile(png_bytes(), name="b.PNG"))
+        digest = hashlib.sha256(png_bytes()).hexdigest()
+        self.assertEqual(first.logo.name, f"blobs/{digest[:2]}/{digest}.png")
+        self.assertEqual(second.logo.name, first.logo.name)
+        self.assertEqual(media_storage().listdir(f"blobs/{digest[:2]}")[1], [f"{digest}.png"])
+
+    def test_gc_and_adopt(self):
+        storage = media_storage()
+        kept = University.objects.create(name="Kept", slug="kept", logo=ContentFile(png_bytes(), name="kept.png"))
+        orphan = storage.save("orphan.png", ContentFile(png_bytes(color=(1, 2, 3))))
+        # Legacy uploads predate the blob store and keep their upload_to names
+        legacy = FileSystemStorage(location=storage.location).save("universities/old.png", ContentFile(png_bytes(color=(9, 9, 9))))
+        University.objects.create(name="Legacy", slug="legacy", logo=legacy)
+
+        call_command("gc_media", grace_hours=0, adopt=True, stdout=StringIO())
+        self.assertFalse(storage.exists(orphan))
+        self.assertFalse(storage.exists(legacy))
+        self.assertTrue(storage.exists(kept.logo.name))
+        adopted = University.objects.get(slug="legacy").logo.name
+        self.assertTrue(adopted.startswith("blobs/") and storage.exists(adopted))
+
+    def test_gc_spares_a_blob_reused_by_an_upload_in_flight(self):
+        storage = media_storage()
+        name = storage.save("old.png", ContentFile(png_bytes()))
+        day_ago = time.time() - 48 * 3600
+        os.utime(storage.path(name), (day_ago, day_ago))
+        # The same bytes again, from an upload whose row isn't committed yet
+        self.assertEqual(storage.save("new.png", ContentFile(png_bytes())), name)
+        call_command("gc_media", grace_hours=24, stdout=StringIO())
+        self.assertTrue(storage.exists(name))
+
+
+class MediaDeliveryTests(MediaTestCase):
+    def setUp(self):
+        self.body = bytes(range(256)) * 4
+        self.name = media_storage().save("file.bin", ContentFile(self.body))
+        self.url = f"/media/{self.name}"
+
+    def test_validators_and_304(self):
+        response = self.client.get(self.url)
+        self.assertEqual(b"".join(response.streaming_content), self.body)
+        self.assertIn("immutable", response["Cache-Control"])
+        etag = response["ETag"]
+        self.assertEqual(etag, f'"{hashlib.sha256(self.body).hexdigest()[:32]}"')
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=f"W/{etag}").status_code, 304)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH='"other"').status_code, 200)
+        since = response["Last-Modified"]
+        self.assertEqual(self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=since).status_code, 304)
+
+    def test_ranges(self):
+        response = self.client.get(self.url, HTTP_RANGE="bytes=10-19")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], f"bytes 10-19/{len(self.body)}")
+        self.assertEqual(b"".join(response.streaming_content), self.body[10:20])
+        response = self.client.get(self.url, HTTP_RANGE="bytes=-4")
+        self.assertEqual(b"".join(response.streaming_content), self.body[-4:])
+
+        response = self.client.get(self.url, HTTP_RANGE=f"bytes={len(self.body)}-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], f"bytes */{len(self.body)}")
+        # A stale If-Range sends the whole file instead of a part
+        self.assertEqual(self.client.get(self.url, HTTP_RANGE="bytes=0-1", HTTP_IF_RANGE='"stale"').status_code, 200)
+
+    @override_settings(MEDIA_SENDFILE="x-accel-redirect")
+    def test_sendfile_offload(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Accel-Redirect"], f"/protected-media/{self.name}")
+        self.assertEqual(response.content, b"")
+        self.assertEqual(self.client.get("/media/../settings.py").status_code, 404)
+
+
+class LargeTableAdminTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [User.objects.create(username=f"user{i}", email=f"user{i}@edutrack.test", nationalid=f"2990{i}") for i in range(5)]
+
+    def test_estimated_count_for_unfiltered_lists(self):
+        self.users[1].delete()
+        with mock.patch("edu_track.admin.ESTIMATE_THRESHOLD", 2):
+            if connection.vendor == "sqlite":
+                # MAX(rowid) is the SQLite estimate, an upper bound once rows are deleted
+                estimate = self.users[-1].id
+            else:
+                # reltuples is only known once the table has been analyzed
+                with connection.cursor() as cursor:
+                    cursor.execute(f"ANALYZE {User._meta.db_table}")
+                estimate = 4
+            self.assertEqual(EstimatedCountPaginator(User.objects.order_by("id"), 50).count, estimate)
+            self.assertEqual(EstimatedCountPaginator(User.objects.filter(id__gt=self.users[0].id).order_by("id"), 50).count, 3)
+        self.assertEqual(EstimatedCountPaginator(User.objects.order_by("id"), 50).count, 4)
+
+    def test_search_keeps_columns_indexable(self):
+        request = RequestFactory().get("/admin/user/user/")
+        queryset, _ = admin.site._registry[User].get_search_results(request, User.objects.all(), "2990")
+        # National ids match exactly, usernames and emails by prefix
+        self.assertNotIn("UPPER", str(queryset.query))
+        self.assertEqual(list(queryset), [])
+        for term in ("29903", "user3", "user3@"):
+            queryset, _ = admin.site._registry[User].get_search_results(request, User.objects.all(), term)
+            self.assertEqual(list(queryset), [self.users[3]])
+
+
+class PaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username="admin", email="admin@edutrack.test", is_staff=True)
+        everything = Group.objects.create(name="Everything")
+        everything.permissions.set(Permission.objects.all())
+        cls.user.groups.add(everything)
+        User.objects.bulk_create([
+            User(username=f"user{i}", email=f"user{i}@edutrack.test", first_name=f"First{i}", last_name="Last") for i in range(4)
+        ])
+        schedules = ExamSchedule.objects.bulk_create([ExamSchedule(name=f"Term {i}", start_date=datetime.date(2026, 1, 3)) for i in range(3)])
+        # Newest first is the view's ordering, the reverse of id order
+        for i, schedule in enumerate(schedules):
+            ExamSchedule.objects.filter(pk=schedule.pk).update(created_at=timezone.now() - datetime.timedelta(days=i))
+
+    def setUp(self):
+        caches["responses"].clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def pages(self, url):
+        rows = []
+        while url:
+            body = self.client.get(url).json()
+            rows.extend(body["results"])
+            url = body["next"]
+        return rows
+
+    def test_values_rows_without_the_ordering_column(self):
+        rows = self.pages("/auth/users/?fields=first_name,last_name&page_size=1")
+        self.assertEqual(rows, list(User.objects.order_by("id").values("first_name", "last_name")))
+        response = self.client.get("/auth/users/?fields=first_name")
+        self.assertEqual(response.json(), list(User.objects.order_by("id").values("first_name")))
+        self.assertFalse(response.has_header("X-Truncated"))
+
+    @override_settings(PAGINATION_COMPAT_PAGE_SIZE=2)
+    def test_bare_arrays_are_capped(self):
+        response = self.client.get("/auth/users/?fields=username")
+        expected = [row["username"] for row in User.objects.order_by("id").values("username")]
+        self.assertEqual([row["username"] for row in response.json()], expected[:2])
+        self.assertEqual(response["X-Truncated"], "true")
+        self.assertIn("cursor=" + response["X-Next-Cursor"], response["Link"])
+        # The Link leads on to enveloped pages with the rest
+        rows = response.json() + self.pages(response["Link"][1:response["Link"].index(">")])
+        self.assertEqual([row["username"] for row in rows], expected)
+
+    def test_view_ordering_is_kept(self):
+        expected = [f"Term {i}" for i in range(3)]
+        self.assertEqual([row["name"] for row in self.pages("/exam/schedules/?page_size=2")], expected)
+        self.assertEqual([row["name"] for row in self.client.get("/exam/schedules/").json()], expected)
+
+    def test_ordering_made_unique(self):
+        pagination = DefaultPagination()
+        self.assertEqual(pagination.get_ordering(None, ExamSchedule.objects.order_by("-created_at")), ("-created_at", "-id"))
+        self.assertEqual(pagination.get_ordering(None, ExamSchedule.objects.all()), ("id",))
+        self.assertEqual(pagination.get_ordering(None, ScheduledExam.objects.all()), ("slot", "course_id", "location_id", "id"))
+        self.assertEqual(pagination.get_ordering(None, User.objects.order_by("faculty__name")), ("id",))
+
+
+class InstrumentationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username="reader", email="reader@edutrack.test")
+        group = Group.objects.create(name="Readers")
+        group.permissions.set(Permission.objects.filter(content_type__app_label="course"))
+        cls.user.groups.add(group)
+
+    def setUp(self):
+        caches["responses"].clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_server_timing_counts_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get("/course/")
+        self.assertRegex(response["Server-Timing"], rf'^db;dur=[\d.]+;desc="{len(context)} queries", serializer;dur=[\d.]+, view;dur=[\d.]+$')
+
+        body = self.client.get("/metrics/").content.decode()
+        self.assertIn('edu_track_request_queries_count{method="GET",route="course/",status="2xx"}', body)
+        self.assertRegex(body, r'edu_track_response_cache_total\{view="ListCourse",outcome="miss"\} \d+')
+
+    @override_settings(SLOW_QUERY_MS=0, SLOW_QUERY_LOG_LIMIT=1)
+    def test_slow_queries_are_logged_with_their_call_site(self):
+        with self.assertLogs("edu_track.instrumentation", "WARNING") as logs:
+            self.client.get("/course/")
+        [line] = logs.output
+        self.assertIn("GET /course/ at ", line)
+        self.assertNotIn(" at ?:", line)
+
+    @override_settings(METRICS_ALLOWED_IPS=(), METRICS_TOKEN="s3cret")
+    def test_metrics_access(self):
+        self.assertEqual(self.client.get("/metrics/").status_code, 403)
+        self.assertEqual(self.client.get("/metrics/", HTTP_AUTHORIZATION="Bearer wrong").status_code, 403)
+        self.assertEqual(self.client.get("/metrics/", HTTP_AUTHORIZATION="Bearer s3cret").status_code, 200)
+
+
+class ProfilingTests(SimpleTestCase):
+    def test_unregister_hands_back_a_frozen_copy(self):
+        sampler = StackSampler(0.001)
+        sampler.start()
+        thread_id = threading.get_ident()
+        sampler.register(thread_id)
+        deadline = time.monotonic() + 2
+        while not sampler.active[thread_id] and time.monotonic() < deadline:
+            time.sleep(0.005)
+        samples = sampler.unregister(thread_id)
+        self.assertTrue(samples)
+        counted = sum(samples.values())
+        time.sleep(0.02)
+        self.assertEqual(sum(samples.values()), counted)
+        frames, stacks = sampled_frames(samples)
+        self.assertEqual(sum(frame["samples"] for frame in frames), counted)
+        self.assertIn("test_unregister_hands_back_a_frozen_copy", stacks[0]["stack"])
+
+    @override_settings(PROFILING_ENABLED=True, PROFILING_SAMPLE_RATE=0, PROFILING_SLOW_MS=0)
+    def test_slow_requests_are_stored_and_storage_errors_are_contained(self):
+        def view(request):
+            time.sleep(0.02)
+            return HttpResponse("ok")
+
+        request = RequestFactory().get("/slow/")
+        with mock.patch("edu_track.profiling.store") as profile_store:
+            ProfilingMiddleware(view)(request)
+        [record], _ = profile_store.return_value.save.call_args
+        self.assertEqual((record["kind"], record["reason"], record["path"]), ("sampling", "slow", "/slow/"))
+
+        with mock.patch("edu_track.profiling.store") as profile_store, self.assertLogs("edu_track.profiling", "ERROR"):
+            profile_store.return_value.save.side_effect = OSError("disk full")
+            response = ProfilingMiddleware(view)(request)
+        self.assertEqual(response.status_code, 200)
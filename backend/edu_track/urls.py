@@ -15,15 +15,18 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from django.conf import settings
-from django.conf.urls.static import static
+from .catalog import CatalogTree
+from .instrumentation import metrics
+from .profiling import ListProfiles, RetrieveProfile
+from .media import serve_media
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('', include('user.urls')),
     path('auth/', include('djoser.urls')),
     path('auth/', include('djoser.urls.jwt')),
-    path('', include('user.urls')),
     path('university/', include('university.urls')),
     path('faculty/', include('faculty.urls')),
     path('program/', include('program.urls')),
@@ -33,5 +36,10 @@ urlpatterns = [
     path('attendance/', include('attendance.urls')),
     path('survey/', include('survey.urls')),
     path('exam/', include('exam.urls')),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    path('catalog/', CatalogTree.as_view(), name='catalog-tree'),
+    path('metrics/', metrics, name='metrics'),
+    path('profiles/', ListProfiles.as_view(), name='profile-list'),
+    path('profiles/<str:profile_id>/', RetrieveProfile.as_view(), name='profile-detail'),
+    re_path(r'^%s(?P<path>.+)$' % settings.MEDIA_URL.lstrip('/'), serve_media, name='media'),
+]
 
@@ -0,0 +1,39 @@
+import time
+from django.conf import settings
+from django.core.cache import caches
+
+# Version counters for cache keys: build a key from the current versions and bump
+# a version to invalidate every key that used it, without knowing those keys.
+# Missing counters start from the clock, so an evicted counter never comes back
+# with a value an old key already used.
+# They live in VERSION_CACHE_ALIAS, the response cache's store, so every worker
+# that shares cached responses also shares the counters that invalidate them.
+PREFIX = "version:"
+
+
+def version_cache():
+    return caches[getattr(settings, "VERSION_CACHE_ALIAS", "default")]
+
+
+def get_versions(*names):
+    cache = version_cache()
+    keys = [PREFIX + name for name in names]
+    found = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in found}
+    if missing:
+        cache.set_many(missing, None)
+        found.update(missing)
+    return [found[key] for key in keys]
+
+
+def get_version(name):
+    return get_versions(name)[0]
+
+
+def bump(*names):
+    cache = version_cache()
+    for name in names:
+        try:
+            cache.incr(PREFIX + name)
+        except ValueError:
+            cache.set(PREFIX + name, time.time_ns(), None)
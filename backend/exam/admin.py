@@ -1,5 +1,27 @@
 from django.contrib import admin
-from .models import ExamTable
+from edu_track.admin import LargeTableAdmin
+from .models import ExamTable, ExamSchedule, ScheduledExam
 
 # Register your models here.
-admin.site.register(ExamTable)
\ No newline at end of file
+@admin.register(ExamTable)
+class ExamTableAdmin(admin.ModelAdmin):
+    list_display = ('faculty', 'program', 'level')
+    # __str__ shows faculty and program names
+    list_select_related = ('faculty__university', 'program__faculty__university')
+    list_filter = ('level', 'faculty')
+    autocomplete_fields = ('university', 'faculty', 'program')
+
+
+@admin.register(ExamSchedule)
+class ExamScheduleAdmin(admin.ModelAdmin):
+    list_display = ('name', 'faculty', 'start_date', 'slots_per_day', 'created_at')
+    list_select_related = ('faculty',)
+    readonly_fields = ('stats',)
+
+
+@admin.register(ScheduledExam)
+class ScheduledExamAdmin(LargeTableAdmin):
+    list_display = ('course', 'date', 'period', 'location', 'seats', 'schedule')
+    list_select_related = ('course', 'location', 'schedule')
+    list_filter = ('schedule',)
+    raw_id_fields = ('schedule', 'course', 'location')
@@ -0,0 +1,43 @@
+from django.db.models import Q
+from edu_track.versions import bump, get_versions
+from .models import ExamTable
+
+MINE_CACHE_TIMEOUT = 60 * 60
+# Faculty/program/university data is nested in every cached response
+NESTED_VERSION = "exam:nested"
+# Levels are Arabic labels; keys use their position so they stay memcached-safe
+LEVELS = [value for value, _ in ExamTable._meta.get_field("level").choices]
+
+
+def with_related(queryset):
+    # Everything ExamTableSerializer nests, so a page of tables is one query
+    return queryset.select_related("university", "faculty", "program", "program__faculty")
+
+
+def tables_for(faculty_id, program_id, level):
+    """Exam tables for one (faculty, program, level); tables without a level cover the whole program."""
+    return with_related(
+        ExamTable.objects.filter(faculty_id=faculty_id, program_id=program_id)
+        .filter(Q(level=level) | Q(level__isnull=True))
+        .order_by("id")
+    )
+
+
+def program_version(faculty_id, program_id):
+    return f"exam:{faculty_id}:{program_id}"
+
+
+def mine_cache_key(faculty_id, program_id, level, host):
+    nested, tables = get_versions(NESTED_VERSION, program_version(faculty_id, program_id))
+    # Serialized data carries absolute image URLs, so the host is part of the key
+    level_key = LEVELS.index(level) + 1 if level in LEVELS else 0
+    return f"exam:mine:{nested}:{tables}:{host}:{faculty_id}:{program_id}:{level_key}"
+
+
+def invalidate_tables(faculty_id, program_id):
+    # Every level of the program, since any level may include a level-less table
+    bump(program_version(faculty_id, program_id))
+
+
+def invalidate_nested():
+    bump(NESTED_VERSION)
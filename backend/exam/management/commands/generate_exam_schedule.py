@@ -0,0 +1,37 @@
+import datetime
+import time
+from django.core.management.base import BaseCommand, CommandError
+from exam.scheduling import ScheduleError, generate_schedule
+
+
+class Command(BaseCommand):
+    help = "Generate an exam timetable from Lecture.students enrolments by coloring the course conflict graph."
+
+    def add_arguments(self, parser):
+        parser.add_argument("name")
+        parser.add_argument("--start", required=True, help="First exam day, YYYY-MM-DD")
+        parser.add_argument("--slots-per-day", type=int, default=2)
+        parser.add_argument("--faculty", type=int, help="Only this faculty's courses and rooms")
+        parser.add_argument("--location", type=int, action="append", dest="locations", help="Exam room id (repeatable)")
+
+    def handle(self, *args, **options):
+        try:
+            start = datetime.date.fromisoformat(options["start"])
+        except ValueError:
+            raise CommandError("--start must be YYYY-MM-DD")
+        if options["slots_per_day"] < 1:
+            raise CommandError("--slots-per-day must be at least 1")
+        started = time.perf_counter()
+        try:
+            schedule = generate_schedule(
+                name=options["name"],
+                start_date=start,
+                slots_per_day=options["slots_per_day"],
+                faculty_id=options["faculty"],
+                location_ids=options["locations"],
+            )
+        except ScheduleError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(
+            f"Schedule {schedule.id}: {schedule.stats} in {time.perf_counter() - started:.1f}s"
+        ))
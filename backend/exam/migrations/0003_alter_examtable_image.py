@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-18 23:20
+
+import edu_track.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exam', '0002_examtable_level'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='examtable',
+            name='image',
+            field=models.ImageField(storage=edu_track.storage.media_storage, upload_to='exams'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.4 on 2026-10-18 23:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exam', '0003_alter_examtable_image'),
+        ('faculty', '0002_alter_faculty_logo'),
+        ('program', '0001_initial'),
+        ('university', '0002_alter_university_logo'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='examtable',
+            index=models.Index(fields=['faculty', 'program', 'level'], name='exam_table_student_lookup'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.4 on 2026-10-18 23:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0001_initial'),
+        ('exam', '0004_student_lookup_index'),
+        ('faculty', '0002_alter_faculty_logo'),
+        ('location', '0003_remove_location_faculty_location_faculties'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExamSchedule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('start_date', models.DateField()),
+                ('slots_per_day', models.PositiveSmallIntegerField(default=2)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('stats', models.JSONField(blank=True, default=dict)),
+                ('faculty', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='examschedules', to='faculty.faculty')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ScheduledExam',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slot', models.PositiveIntegerField()),
+                ('date', models.DateField()),
+                ('period', models.PositiveSmallIntegerField()),
+                ('seats', models.PositiveIntegerField()),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scheduled_exams', to='course.course')),
+                ('location', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scheduled_exams', to='location.location')),
+                ('schedule', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='exams', to='exam.examschedule')),
+            ],
+            options={
+                'ordering': ['slot', 'course_id', 'location_id'],
+                'indexes': [models.Index(fields=['schedule', 'slot'], name='exam_scheduled_slot')],
+            },
+        ),
+    ]
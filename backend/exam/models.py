@@ -2,13 +2,16 @@ from django.db import models
 from university.models import University
 from faculty.models import Faculty
 from program.models import Program
+from course.models import Course
+from location.models import Location
+from edu_track.storage import media_storage
 
 # Create your models here.
 class ExamTable(models.Model):
     university = models.ForeignKey(University, on_delete=models.CASCADE, related_name='examtables')
     faculty = models.ForeignKey(Faculty, on_delete=models.CASCADE, related_name='examtables')
     program = models.ForeignKey(Program, on_delete=models.CASCADE, related_name='examtables')
-    image = models.ImageField(upload_to='exams')
+    image = models.ImageField(upload_to='exams', storage=media_storage)
     level = models.CharField(
         max_length=20,
         choices=[
@@ -23,5 +26,43 @@ class ExamTable(models.Model):
         blank=True,
         null=True,
     )
+
+    class Meta:
+        indexes = [
+            # exam/mine/ looks tables up by the student's (faculty, program, level)
+            models.Index(fields=['faculty', 'program', 'level'], name='exam_table_student_lookup'),
+        ]
+
+    def __str__(self):
+        return f'exam - {self.faculty.name} - {self.program.name} - {self.level}'
+
+
+class ExamSchedule(models.Model):
+    # A generated exam timetable, see exam/scheduling.py
+    name = models.CharField(max_length=100)
+    faculty = models.ForeignKey(Faculty, on_delete=models.CASCADE, related_name='examschedules', null=True, blank=True)
+    start_date = models.DateField()
+    slots_per_day = models.PositiveSmallIntegerField(default=2)
+    created_at = models.DateTimeField(auto_now_add=True)
+    stats = models.JSONField(default=dict, blank=True)
+
+    def __str__(self):
+        return f'{self.name} ({self.start_date})'
+
+
+class ScheduledExam(models.Model):
+    # One course in one room; a course larger than any room gets several rows in the same slot
+    schedule = models.ForeignKey(ExamSchedule, on_delete=models.CASCADE, related_name='exams')
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='scheduled_exams')
+    location = models.ForeignKey(Location, on_delete=models.CASCADE, related_name='scheduled_exams')
+    slot = models.PositiveIntegerField()
+    date = models.DateField()
+    period = models.PositiveSmallIntegerField()
+    seats = models.PositiveIntegerField()
+
+    class Meta:
+        ordering = ['slot', 'course_id', 'location_id']
+        indexes = [models.Index(fields=['schedule', 'slot'], name='exam_scheduled_slot')]
+
     def __str__(self):
-        return f'exam - {self.faculty.name} - {self.program.name} - {self.level}'
\ No newline at end of file
+        return f'{self.course} - {self.date} ({self.period}) - {self.location.name}'
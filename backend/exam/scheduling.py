@@ -0,0 +1,195 @@
+import bisect
+import datetime
+from itertools import chain
+import numpy as np
+from django.db import transaction
+from lecture.models import Lecture
+from location.models import Location
+from .models import ExamSchedule, ScheduledExam
+
+# Students per block when multiplying the enrolment matrix; bounds memory to
+# STUDENT_CHUNK x courses float32 regardless of how many students there are
+STUDENT_CHUNK = 4096
+FRIDAY = 4
+
+
+class ScheduleError(Exception):
+    pass
+
+
+def enrolments(faculty_id=None):
+    """(student_id, course_id) pairs from Lecture.students, as an (n, 2) int64 array."""
+    pairs = Lecture.students.through.objects.values_list("user_id", "lecture__course_id").distinct().order_by()
+    if faculty_id:
+        pairs = pairs.filter(lecture__course__programs__faculty_id=faculty_id)
+    flat = np.fromiter(chain.from_iterable(pairs.iterator(chunk_size=10000)), dtype=np.int64)
+    return flat.reshape(-1, 2)
+
+
+def conflict_graph(pairs):
+    """
+    Course conflict graph from enrolment pairs.
+
+    Returns (course_ids, sizes, rows, cols, weights): sizes[i] is the number of
+    students of course i and (rows, cols, weights) is the upper triangle of the
+    co-enrolment matrix A.T @ A in COO form, A being the student x course incidence.
+    """
+    students, student_idx = np.unique(pairs[:, 0], return_inverse=True)
+    courses, course_idx = np.unique(pairs[:, 1], return_inverse=True)
+    n = len(courses)
+    sizes = np.bincount(course_idx, minlength=n)
+
+    order = np.argsort(student_idx, kind="stable")
+    student_idx, course_idx = student_idx[order], course_idx[order]
+    co = np.zeros((n, n), dtype=np.int64)
+    for start in range(0, len(students), STUDENT_CHUNK):
+        stop = min(start + STUDENT_CHUNK, len(students))
+        lo, hi = np.searchsorted(student_idx, [start, stop])
+        block = np.zeros((stop - start, n), dtype=np.float32)
+        block[student_idx[lo:hi] - start, course_idx[lo:hi]] = 1
+        co += (block.T @ block).astype(np.int64)
+
+    rows, cols = np.nonzero(np.triu(co, k=1))
+    return courses, sizes, rows, cols, co[rows, cols]
+
+
+class Slot:
+    """Rooms still free in one exam slot, kept sorted by capacity."""
+
+    def __init__(self, rooms):
+        self.free = sorted((capacity, location_id) for location_id, capacity in rooms)
+
+    def allocate(self, size, commit=False):
+        """Rooms for `size` students or None: the smallest single room that fits, else the largest rooms until covered."""
+        i = bisect.bisect_left(self.free, (size, -1))
+        if i < len(self.free):
+            chosen = [self.free[i]]
+        else:
+            chosen, seats = [], 0
+            for room in reversed(self.free):
+                chosen.append(room)
+                seats += room[0]
+                if seats >= size:
+                    break
+            else:
+                return None
+        if commit:
+            for room in chosen:
+                self.free.remove(room)
+        allocation, remaining = [], size
+        for capacity, location_id in chosen:
+            allocation.append((location_id, min(capacity, remaining)))
+            remaining -= capacity
+        return allocation
+
+
+def color(n, rows, cols, sizes, rooms):
+    """
+    DSATUR coloring of the conflict graph into exam slots under room capacities.
+
+    Repeatedly takes the course whose neighbours already use the most distinct
+    slots (ties: more conflicts, then more students) and puts it in the first
+    slot with no conflicting course and enough free rooms, opening a new slot
+    when none fits. Returns (slot per course, [(course, slot, location, seats)]).
+    """
+    total_capacity = sum(capacity for _, capacity in rooms)
+    if n and sizes.max() > total_capacity:
+        raise ScheduleError(f"A course has {int(sizes.max())} students but the rooms only seat {total_capacity}.")
+
+    neighbours = [[] for _ in range(n)]
+    for a, b in zip(rows.tolist(), cols.tolist()):
+        neighbours[a].append(b)
+        neighbours[b].append(a)
+    degree = np.array([len(adjacent) for adjacent in neighbours])
+    blocked = [set() for _ in range(n)]
+    slot_of = np.full(n, -1, dtype=np.int64)
+    slots, placements = [], []
+
+    # Priority as one sortable number per course; saturation is added as it grows
+    tiebreak = degree.astype(np.float64) * (sizes.max() + 1 if n else 1) + sizes
+    saturation = np.zeros(n, dtype=np.float64)
+    scale = tiebreak.max() + 1 if n else 1
+    for _ in range(n):
+        priority = np.where(slot_of < 0, saturation * scale + tiebreak, -1)
+        course = int(priority.argmax())
+        for slot, free in enumerate(slots):
+            if slot not in blocked[course] and free.allocate(int(sizes[course])):
+                break
+        else:
+            slot = len(slots)
+            slots.append(Slot(rooms))
+        for location_id, seats in slots[slot].allocate(int(sizes[course]), commit=True):
+            placements.append((course, slot, location_id, seats))
+        slot_of[course] = slot
+        for other in neighbours[course]:
+            if slot not in blocked[other]:
+                blocked[other].add(slot)
+                saturation[other] += 1
+    return slot_of, placements
+
+
+def slot_dates(count, start_date, slots_per_day, skip_weekdays=(FRIDAY,)):
+    """(date, period) for slots 0..count-1, filling each day before moving on and skipping Fridays."""
+    if slots_per_day < 1:
+        raise ScheduleError("slots_per_day must be at least 1.")
+    if set(range(7)) <= set(skip_weekdays):
+        raise ScheduleError("Every weekday is skipped, no exam days left.")
+    result, day = [], start_date
+    while len(result) < count:
+        if day.weekday() not in skip_weekdays:
+            result.extend((day, period) for period in range(1, slots_per_day + 1))
+        day += datetime.timedelta(days=1)
+    return result[:count]
+
+
+def rooms_for(faculty_id=None, location_ids=None):
+    locations = Location.objects.all()
+    if location_ids:
+        locations = locations.filter(id__in=location_ids)
+    elif faculty_id:
+        locations = locations.filter(faculties=faculty_id)
+    return list(locations.values_list("id", "capacity").distinct().order_by("id"))
+
+
+def generate_schedule(name, start_date, slots_per_day=2, faculty_id=None, location_ids=None):
+    """Build, color and store an ExamSchedule for every course with enrolled students."""
+    rooms = rooms_for(faculty_id, location_ids)
+    if not rooms:
+        raise ScheduleError("No exam rooms (locations) available.")
+    pairs = enrolments(faculty_id)
+    if not len(pairs):
+        raise ScheduleError("No enrolments found.")
+
+    courses, sizes, rows, cols, weights = conflict_graph(pairs)
+    slot_of, placements = color(len(courses), rows, cols, sizes, rooms)
+    slot_count = int(slot_of.max()) + 1
+    dates = slot_dates(slot_count, start_date, slots_per_day)
+
+    with transaction.atomic():
+        schedule = ExamSchedule.objects.create(
+            name=name,
+            faculty_id=faculty_id,
+            start_date=start_date,
+            slots_per_day=slots_per_day,
+            stats={
+                "courses": len(courses),
+                "students": int(len(np.unique(pairs[:, 0]))),
+                "conflicting_pairs": int(len(rows)),
+                "slots": slot_count,
+                "days": len({date for date, _ in dates}),
+                "rooms": len(rooms),
+            },
+        )
+        ScheduledExam.objects.bulk_create([
+            ScheduledExam(
+                schedule=schedule,
+                course_id=int(courses[course]),
+                location_id=location_id,
+                slot=slot,
+                date=dates[slot][0],
+                period=dates[slot][1],
+                seats=seats,
+            )
+            for course, slot, location_id, seats in placements
+        ], batch_size=1000)
+    return schedule
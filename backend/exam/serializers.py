@@ -1,17 +1,22 @@
+from rest_framework import serializers
 from rest_framework.serializers import ModelSerializer
-from .models import ExamTable
+from .models import ExamTable, ExamSchedule, ScheduledExam
+from faculty.models import Faculty
+from location.models import Location
 from university.serializers import UniversitySerializer
 from faculty.serializers import FacultySerializer
 from program.serializers import ProgramSerializer
+from edu_track.images import RenditionsField, EXAM_RENDITIONS
 
 class ExamTableSerializer(ModelSerializer):
     university_data = UniversitySerializer(source='university', read_only=True)
     faculty_data = FacultySerializer(source='faculty', read_only=True)
     program_data = ProgramSerializer(source='program', read_only=True)
+    image_renditions = RenditionsField(EXAM_RENDITIONS, source='image')
     
     class Meta:
         model = ExamTable
-        fields = ['id', 'university', 'faculty', 'program', 'image',
+        fields = ['id', 'university', 'faculty', 'program', 'image', 'image_renditions',
                 'university_data', 'faculty_data', 'program_data', 'level']
         extra_kwargs = {
             'university': {'write_only': True},
@@ -19,3 +24,35 @@ class ExamTableSerializer(ModelSerializer):
             'program': {'write_only': True},
             # level should be readable to clients, so don't mark it write_only
         }
+
+
+class ScheduledExamSerializer(ModelSerializer):
+    course_title = serializers.CharField(source='course.title', read_only=True)
+    location_name = serializers.CharField(source='location.name', read_only=True)
+
+    class Meta:
+        model = ScheduledExam
+        fields = ['id', 'course', 'course_title', 'location', 'location_name', 'slot', 'date', 'period', 'seats']
+
+
+class ExamScheduleSerializer(ModelSerializer):
+    class Meta:
+        model = ExamSchedule
+        fields = ['id', 'name', 'faculty', 'start_date', 'slots_per_day', 'created_at', 'stats']
+
+
+class ExamScheduleDetailSerializer(ExamScheduleSerializer):
+    exams = ScheduledExamSerializer(many=True, read_only=True)
+
+    class Meta(ExamScheduleSerializer.Meta):
+        fields = ExamScheduleSerializer.Meta.fields + ['exams']
+
+
+class GenerateScheduleSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=100)
+    start_date = serializers.DateField()
+    slots_per_day = serializers.IntegerField(min_value=1, max_value=6, default=2)
+    # Limit to one faculty's enrolments and rooms; defaults to everything
+    faculty = serializers.PrimaryKeyRelatedField(queryset=Faculty.objects.all(), required=False, allow_null=True)
+    # Explicit exam rooms, overriding the faculty's locations
+    locations = serializers.PrimaryKeyRelatedField(queryset=Location.objects.all(), many=True, required=False)
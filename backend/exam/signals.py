@@ -0,0 +1,34 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from edu_track.images import renditions_on_save, EXAM_RENDITIONS
+from faculty.models import Faculty
+from program.models import Program
+from university.models import University
+from .lookups import invalidate_nested, invalidate_tables
+from .models import ExamTable
+
+post_save.connect(renditions_on_save("image", EXAM_RENDITIONS), sender=ExamTable, weak=False, dispatch_uid="exam_image_renditions")
+
+
+@receiver(pre_save, sender=ExamTable)
+def remember_program(sender, instance, **kwargs):
+    # A table moved to another program must disappear from the old program's cache too
+    instance._cached_program = None
+    if instance.pk:
+        instance._cached_program = ExamTable.objects.filter(pk=instance.pk).values_list("faculty_id", "program_id").first()
+
+
+@receiver(post_save, sender=ExamTable)
+@receiver(post_delete, sender=ExamTable)
+def drop_cached_tables(sender, instance, **kwargs):
+    invalidate_tables(instance.faculty_id, instance.program_id)
+    old = getattr(instance, "_cached_program", None)
+    if old and old != (instance.faculty_id, instance.program_id):
+        invalidate_tables(*old)
+
+
+@receiver(post_save, sender=University)
+@receiver(post_save, sender=Faculty)
+@receiver(post_save, sender=Program)
+def drop_nested_tables(sender, **kwargs):
+    invalidate_nested()
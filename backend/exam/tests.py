@@ -1,3 +1,152 @@
-from django.test import TestCase
+import datetime
+from collections import defaultdict
+import numpy as np
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase
+from edu_track.testing import QueryBudgetTestCase, SeededTestCase, image_upload
+from lecture.models import Lecture
+from .lookups import tables_for
+from .models import ExamSchedule, ExamTable
+from .scheduling import ScheduleError, color, generate_schedule, slot_dates
 
-# Create your tests here.
+
+class ExamQueryBudgetTests(QueryBudgetTestCase):
+    routes = {
+        "exam:exam-list", "exam:exam-mine", "exam:exam-create", "exam:exam-detail", "exam:exam-update", "exam:exam-delete",
+        "exam:schedule-list", "exam:schedule-generate", "exam:schedule-detail", "exam:schedule-delete",
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.schedule = generate_schedule("Midterms", datetime.date(2026, 1, 3))
+
+    def test_list(self):
+        self.assertBudget("get", "/exam/", 2)
+
+    def test_mine(self):
+        self.assertBudget("get", "/exam/mine/", 2)
+
+    def test_retrieve(self):
+        self.assertBudget("get", f"/exam/{ExamTable.objects.first().id}/", 2)
+
+    def test_create(self):
+        program = self.data.programs[0]
+        self.assertBudget("post", "/exam/create/", 6, status=201, format="multipart", data={
+            "university": self.data.university.id, "faculty": program.faculty_id, "program": program.id,
+            "level": "المستوى الخامس", "image": image_upload("table.png"),
+        })
+
+    def test_update(self):
+        self.assertBudget("patch", f"/exam/{ExamTable.objects.first().id}/update/", 8, data={"level": "المستوى السابع"})
+
+    def test_destroy(self):
+        self.assertBudget("delete", f"/exam/{ExamTable.objects.first().id}/delete/", 3, status=204)
+
+    def test_list_schedules(self):
+        self.assertBudget("get", "/exam/schedules/", 2)
+
+    def test_retrieve_schedule(self):
+        self.assertBudget("get", f"/exam/schedules/{self.schedule.id}/", 3)
+
+    def test_generate_schedule(self):
+        # Graph coloring over every enrolment; heavier than a plain write
+        self.assertBudget("post", "/exam/schedules/generate/", 7, status=201, ms=5000, data={
+            "name": "Finals", "start_date": "2026-06-06", "slots_per_day": 3,
+        })
+
+    def test_destroy_schedule(self):
+        schedule = ExamSchedule.objects.create(name="Empty", start_date=datetime.date(2026, 1, 3))
+        self.assertBudget("delete", f"/exam/schedules/{schedule.id}/delete/", 4, status=204)
+
+    def test_student_lookup_uses_index(self):
+        self.assertUsesIndex(tables_for(self.user.faculty_id, self.user.program_id, self.user.level))
+
+
+SMALL_SEED = {"students": 40, "courses": 4, "lectures_per_course": 1, "students_per_lecture": 10, "sessions": 1}
+
+
+class MyExamTablesTests(SeededTestCase):
+    seed_options = SMALL_SEED
+
+    def mine(self):
+        return self.client.get("/exam/mine/").json()
+
+    def test_tables_for_the_students_level(self):
+        program = self.user.program
+        [table] = self.mine()
+        self.assertEqual((table["program_data"]["id"], table["level"]), (program.id, self.user.level))
+
+        # A table without a level covers the whole program, the cached response is invalidated
+        whole = ExamTable.objects.create(university=self.data.university, faculty=program.faculty, program=program,
+                                         image=image_upload("whole.png"), level=None)
+        self.assertEqual(sorted(row["id"] for row in self.mine()), sorted([table["id"], whole.id]))
+
+        other = self.data.programs[1]
+        whole.program, whole.faculty = other, other.faculty
+        whole.save()
+        self.assertEqual([row["id"] for row in self.mine()], [table["id"]])
+
+        program.name = "Renamed"
+        program.save()
+        self.assertEqual(self.mine()[0]["program_data"]["name"], "Renamed")
+
+    def test_cached_between_requests(self):
+        self.mine()
+        # Only the permission check, the tables come from the cache
+        with self.assertNumQueries(1):
+            self.mine()
+
+
+class ColoringTests(SimpleTestCase):
+    def test_conflicting_courses_get_different_slots(self):
+        # A triangle 0-1-2 with a pendant 3 hanging off 2
+        rows, cols = np.array([0, 0, 1, 2]), np.array([1, 2, 2, 3])
+        slot_of, placements = color(4, rows, cols, np.array([10, 10, 10, 10]), [(1, 100), (2, 100), (3, 100)])
+        self.assertEqual(int(slot_of.max()) + 1, 3)
+        for a, b in zip(rows, cols):
+            self.assertNotEqual(slot_of[a], slot_of[b])
+        self.assertEqual(len(placements), 4)
+
+    def test_room_capacity_limits_a_slot(self):
+        slot_of, placements = color(3, np.array([], dtype=int), np.array([], dtype=int), np.array([50, 30, 90]), [(1, 60), (2, 40)])
+        # 90 students need both rooms, the other two courses share the next slot
+        self.assertEqual(sorted((course, location, seats) for course, _, location, seats in placements if course == 2), [(2, 1, 60), (2, 2, 30)])
+        self.assertEqual(len(set(slot_of.tolist())), 2)
+        with self.assertRaises(ScheduleError):
+            color(1, np.array([], dtype=int), np.array([], dtype=int), np.array([101]), [(1, 60), (2, 40)])
+
+    def test_slot_dates(self):
+        thursday = datetime.date(2026, 1, 1)
+        self.assertEqual(slot_dates(3, thursday, 2), [(thursday, 1), (thursday, 2), (datetime.date(2026, 1, 3), 1)])
+        with self.assertRaises(ScheduleError):
+            slot_dates(3, thursday, 0)
+
+
+class GenerateScheduleTests(SeededTestCase):
+    seed_options = SMALL_SEED
+
+    def test_no_student_sits_two_exams_at_once(self):
+        schedule = generate_schedule("Finals", datetime.date(2026, 6, 6), slots_per_day=3)
+        exams = list(schedule.exams.all())
+        slot_of = {exam.course_id: exam.slot for exam in exams}
+        self.assertEqual(schedule.stats["slots"], len(set(slot_of.values())))
+
+        taken = defaultdict(set)
+        for student_id, course_id in Lecture.students.through.objects.values_list("user_id", "lecture__course_id").distinct():
+            self.assertNotIn(slot_of[course_id], taken[student_id], f"student {student_id} has two exams in one slot")
+            taken[student_id].add(slot_of[course_id])
+
+        seats, rooms = defaultdict(int), set()
+        for exam in exams:
+            seats[exam.course_id] += exam.seats
+            self.assertNotIn((exam.slot, exam.location_id), rooms)
+            rooms.add((exam.slot, exam.location_id))
+            self.assertNotEqual(exam.date.weekday(), 4)
+        for course_id, total in seats.items():
+            self.assertEqual(total, Lecture.students.through.objects.filter(lecture__course_id=course_id).values("user_id").distinct().count())
+
+    def test_command_rejects_zero_slots_per_day(self):
+        with self.assertRaisesMessage(CommandError, "--slots-per-day"):
+            call_command("generate_exam_schedule", "Finals", start="2026-06-06", slots_per_day=0)
+        self.assertFalse(ExamSchedule.objects.exists())
@@ -5,8 +5,13 @@ app_name = 'exam'
 
 urlpatterns = [
     path('', views.ListLecture.as_view(), name='exam-list'),
+    path('mine/', views.MyExamTables.as_view(), name='exam-mine'),
     path('create/', views.CreateLecture.as_view(), name='exam-create'),
     path('<int:pk>/', views.RetrieveLecture.as_view(), name='exam-detail'),
     path('<int:pk>/update/', views.UpdateLecture.as_view(), name='exam-update'),
     path('<int:pk>/delete/', views.DestoryLecture.as_view(), name='exam-delete'),
+    path('schedules/', views.ListExamSchedule.as_view(), name='schedule-list'),
+    path('schedules/generate/', views.GenerateExamSchedule.as_view(), name='schedule-generate'),
+    path('schedules/<int:pk>/', views.RetrieveExamSchedule.as_view(), name='schedule-detail'),
+    path('schedules/<int:pk>/delete/', views.DestroyExamSchedule.as_view(), name='schedule-delete'),
 ]
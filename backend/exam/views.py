@@ -1,14 +1,44 @@
+from django.core.cache import cache
+from django.db.models import Prefetch
+from rest_framework import status
 from rest_framework.generics import ListAPIView, CreateAPIView, RetrieveAPIView, DestroyAPIView, UpdateAPIView
-from .models import ExamTable
-from .serializers import ExamTableSerializer
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from .lookups import MINE_CACHE_TIMEOUT, mine_cache_key, tables_for, with_related
+from .models import ExamTable, ExamSchedule, ScheduledExam
+from .scheduling import ScheduleError, generate_schedule
+from .serializers import (
+    ExamTableSerializer, ExamScheduleSerializer, ExamScheduleDetailSerializer, GenerateScheduleSerializer,
+)
 from user.permissions import GroupPermission
 
 # Create your views here.
 class ListLecture(ListAPIView):
-    queryset =  ExamTable.objects.all()
+    queryset =  with_related(ExamTable.objects.all())
+    serializer_class = ExamTableSerializer
+    permission_classes = [type('CustomPerm',(GroupPermission,),{'required_permission': 'exam.view_examtable'})]
+
+
+class MyExamTables(ListAPIView):
+    """Exam tables for the requesting student's faculty, program and level, cached per combination."""
     serializer_class = ExamTableSerializer
     permission_classes = [type('CustomPerm',(GroupPermission,),{'required_permission': 'exam.view_examtable'})]
 
+    def get_queryset(self):
+        user = self.request.user
+        return tables_for(user.faculty_id, user.program_id, user.level)
+
+    def list(self, request, *args, **kwargs):
+        user = request.user
+        if not user.faculty_id or not user.program_id:
+            return Response([])
+        key = mine_cache_key(user.faculty_id, user.program_id, user.level, request.get_host())
+        data = cache.get(key)
+        if data is None:
+            data = self.get_serializer(self.get_queryset(), many=True).data
+            cache.set(key, data, MINE_CACHE_TIMEOUT)
+        return Response(data)
+
 
 class CreateLecture(CreateAPIView):
     queryset =  ExamTable.objects.all()
@@ -16,7 +46,7 @@ class CreateLecture(CreateAPIView):
     permission_classes = [type('CustomPerm',(GroupPermission,),{'required_permission': 'exam.add_examtable'})]
 
 class RetrieveLecture(RetrieveAPIView):
-    queryset =  ExamTable.objects.all()
+    queryset =  with_related(ExamTable.objects.all())
     serializer_class = ExamTableSerializer
     permission_classes = [type('CustomPerm',(GroupPermission,),{'required_permission': 'exam.view_examtable'})]
 
@@ -32,3 +62,43 @@ class DestoryLecture(DestroyAPIView):
     serializer_class = ExamTableSerializer
     permission_classes = [type('CustomPerm',(GroupPermission,),{'required_permission': 'exam.delete_examtable'})]
 
+
+class ListExamSchedule(ListAPIView):
+    queryset = ExamSchedule.objects.order_by('-created_at')
+    serializer_class = ExamScheduleSerializer
+    permission_classes = [type('CustomPerm',(GroupPermission,),{'required_permission': 'exam.view_examschedule'})]
+
+
+class RetrieveExamSchedule(RetrieveAPIView):
+    queryset = ExamSchedule.objects.prefetch_related(
+        Prefetch('exams', queryset=ScheduledExam.objects.select_related('course', 'location'))
+    )
+    serializer_class = ExamScheduleDetailSerializer
+    permission_classes = [type('CustomPerm',(GroupPermission,),{'required_permission': 'exam.view_examschedule'})]
+
+
+class DestroyExamSchedule(DestroyAPIView):
+    queryset = ExamSchedule.objects.all()
+    serializer_class = ExamScheduleSerializer
+    permission_classes = [type('CustomPerm',(GroupPermission,),{'required_permission': 'exam.delete_examschedule'})]
+
+
+class GenerateExamSchedule(APIView):
+    """Generate an exam timetable from the current enrolments (see exam/scheduling.py)."""
+    permission_classes = [type('CustomPerm',(GroupPermission,),{'required_permission': 'exam.add_examschedule'})]
+
+    def post(self, request):
+        serializer = GenerateScheduleSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        try:
+            schedule = generate_schedule(
+                name=data['name'],
+                start_date=data['start_date'],
+                slots_per_day=data['slots_per_day'],
+                faculty_id=data['faculty'].id if data.get('faculty') else None,
+                location_ids=[location.id for location in data.get('locations', [])],
+            )
+        except ScheduleError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(ExamScheduleSerializer(schedule).data, status=status.HTTP_201_CREATED)
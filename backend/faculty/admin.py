@@ -1,4 +1,17 @@
 from django.contrib import admin
 from .models import Faculty
 
-admin.site.register(Faculty)
+@admin.register(Faculty)
+class FacultyAdmin(admin.ModelAdmin):
+    list_display = ('name', 'slug', 'university')
+    # __str__ shows the university name
+    list_select_related = ('university',)
+    list_filter = ('university',)
+    ordering = ('name',)
+    search_fields = ('name', 'slug')
+    autocomplete_fields = ('university',)
+
+    def get_search_results(self, request, queryset, search_term):
+        # Autocomplete results are rendered with __str__ too
+        queryset, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        return queryset.select_related('university'), may_have_duplicates
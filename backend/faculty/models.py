@@ -1,10 +1,11 @@
 from django.db import models
 from university.models import University
+from edu_track.storage import media_storage
 
 class Faculty(models.Model):
     name = models.CharField(max_length=30)
     slug = models.SlugField(max_length=30, unique=True)
-    logo = models.ImageField(upload_to='faculties')
+    logo = models.ImageField(upload_to='faculties', storage=media_storage)
     university = models.ForeignKey(University, on_delete=models.CASCADE, related_name="faculties")
     
     class Meta:
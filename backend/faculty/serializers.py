@@ -1,7 +1,9 @@
 from rest_framework.serializers import ModelSerializer
 from .models import Faculty
+from edu_track.images import RenditionsField, LOGO_RENDITIONS
 
 class FacultySerializer(ModelSerializer):
+    logo_renditions = RenditionsField(LOGO_RENDITIONS, source="logo")
 
     class Meta:
         model = Faculty
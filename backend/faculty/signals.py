@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from edu_track.catalog import bump_catalog_version
+from edu_track.conditional import track_versions
+from edu_track.images import renditions_on_save, LOGO_RENDITIONS
+from .models import Faculty
+
+post_save.connect(renditions_on_save("logo", LOGO_RENDITIONS), sender=Faculty, weak=False, dispatch_uid="faculty_logo_renditions")
+post_save.connect(bump_catalog_version, sender=Faculty, dispatch_uid="faculty_catalog_version_save")
+post_delete.connect(bump_catalog_version, sender=Faculty, dispatch_uid="faculty_catalog_version_delete")
+
+track_versions(Faculty)
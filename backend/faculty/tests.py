@@ -1,3 +1,24 @@
-from django.test import TestCase
+from edu_track.testing import QueryBudgetTestCase, image_upload
+from .models import Faculty
 
-# Create your tests here.
+
+class FacultyQueryBudgetTests(QueryBudgetTestCase):
+    routes = {"Faculty-list", "Faculty-create", "Faculty-retrieve", "Faculty-update", "Faculty-destroy"}
+
+    def test_list(self):
+        self.assertBudget("get", "/faculty/", 3)
+
+    def test_retrieve(self):
+        self.assertBudget("get", "/faculty/faculty-0/", 3)
+
+    def test_create(self):
+        self.assertBudget("post", "/faculty/create/", 4, status=201, format="multipart", data={
+            "name": "Faculty X", "slug": "faculty-x", "university": self.data.university.id, "logo": image_upload(),
+        })
+
+    def test_update(self):
+        self.assertBudget("patch", "/faculty/faculty-0/update/", 3, data={"name": "Renamed"})
+
+    def test_destroy(self):
+        Faculty.objects.create(name="Empty", slug="empty", university=self.data.university, logo=self.data.university.logo.name)
+        self.assertBudget("delete", "/faculty/empty/delete/", 8, status=204)
@@ -1,9 +1,11 @@
 from rest_framework.generics import ListAPIView, CreateAPIView, RetrieveAPIView, DestroyAPIView, UpdateAPIView
+from edu_track.conditional import ConditionalGetMixin
 from .models import Faculty
 from .serializers import FacultySerializer
 from  user.permissions import GroupPermission
 
-class ListFaculty(ListAPIView):
+class ListFaculty(ConditionalGetMixin, ListAPIView):
+    etag_models = (Faculty,)
     queryset =  Faculty.objects.all()
     serializer_class = FacultySerializer
     permission_classes = [type('CustomPerm',(GroupPermission,),{'required_permission': 'faculty.view_faculty'})]
@@ -13,7 +15,8 @@ class CreateFaculty(CreateAPIView):
     serializer_class = FacultySerializer
     permission_classes = [type('CustomPerm',(GroupPermission,),{'required_permission': 'faculty.add_faculty'})]
 
-class RetrieveFaculty(RetrieveAPIView):
+class RetrieveFaculty(ConditionalGetMixin, RetrieveAPIView):
+    etag_models = (Faculty,)
     queryset =  Faculty.objects.all()
     serializer_class = FacultySerializer
     lookup_field = "slug"
@@ -2,4 +2,17 @@ from django.contrib import admin
 from .models import Lecture
 
 # Register your models here.
-admin.site.register(Lecture)
\ No newline at end of file
+@admin.register(Lecture)
+class LectureAdmin(admin.ModelAdmin):
+    list_display = ('course', 'location', 'day', 'starttime', 'endtime', 'weight')
+    # __str__ shows course title and location name
+    list_select_related = ('course', 'location')
+    list_filter = ('day',)
+    search_fields = ('course__title', 'location__name')
+    autocomplete_fields = ('course', 'location')
+    # Thousands of users: pick ids instead of rendering every user in a <select>
+    raw_id_fields = ('instructor', 'students')
+
+    def get_search_results(self, request, queryset, search_term):
+        queryset, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        return queryset.select_related('course', 'location'), may_have_duplicates
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.4 on 2026-10-19 00:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0001_initial'),
+        ('lecture', '0005_remove_lecture_instructor_lecture_instructor'),
+        ('location', '0003_remove_location_faculty_location_faculties'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='lecture',
+            index=models.Index(fields=['day', 'starttime', 'endtime'], name='lecture_slot'),
+        ),
+        migrations.AddIndex(
+            model_name='lecture',
+            index=models.Index(fields=['location', 'day', 'starttime'], name='lecture_room_day'),
+        ),
+    ]
@@ -19,6 +19,13 @@ class Lecture(models.Model):
     weight = models.FloatField(default=0.0)
     students = models.ManyToManyField(User, related_name='lectures_attended', null=True)
 
+    class Meta:
+        indexes = [
+            # LectureSerializer.validate's clash checks: by time slot (joined to the instructors) and by room
+            models.Index(fields=['day', 'starttime', 'endtime'], name='lecture_slot'),
+            models.Index(fields=['location', 'day', 'starttime'], name='lecture_room_day'),
+        ]
+
     def __str__(self):
         return f"{self.course.title} - {self.location.name}"
     
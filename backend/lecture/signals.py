@@ -26,4 +26,10 @@
 #         return
 
 #     # Add them to the new lecture
-#     instance.students.add(*student_ids)
\ No newline at end of file
+#     instance.students.add(*student_ids)
+
+from edu_track.conditional import track_versions
+from .models import Lecture
+
+# Versions for the ETags of the lecture endpoints (students/instructor m2m included)
+track_versions(Lecture)
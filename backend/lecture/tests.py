@@ -1,3 +1,46 @@
-from django.test import TestCase
+from edu_track.testing import QueryBudgetTestCase
+from .models import Lecture
 
-# Create your tests here.
+
+class LectureQueryBudgetTests(QueryBudgetTestCase):
+    routes = {
+        "Lecture-list", "Lecture-create", "Lecture-retrieve", "Lecture-update", "Lecture-destroy", "enroll-student",
+    }
+
+    def test_list(self):
+        self.assertBudget("get", "/lecture/", 6)
+
+    def test_list_page(self):
+        self.assertBudget("get", "/lecture/?page_size=20&count=1", 8)
+
+    def test_retrieve(self):
+        self.assertBudget("get", f"/lecture/{self.data.lectures[0].id}/", 6)
+
+    def test_create(self):
+        self.assertBudget("post", "/lecture/create/", 46, status=201, data={
+            "course": self.data.courses[0].id, "location": self.data.locations[0].id, "day": "الجمعة",
+            "starttime": "18:00", "endtime": "19:00", "instructor": [self.data.instructors[0].id],
+            "students": [student.id for student in self.data.students[:30]],
+        })
+
+    def test_update(self):
+        lecture = self.data.lectures[0]
+        self.assertBudget("put", f"/lecture/{lecture.id}/update/", 39, data={
+            "course": lecture.course_id, "location": lecture.location_id, "day": lecture.day,
+            "starttime": lecture.starttime.isoformat(), "endtime": lecture.endtime.isoformat(), "weight": 15, "instructor": [self.data.instructors[0].id],
+            "students": [student.id for student in self.data.enrolled[lecture.id]],
+        })
+
+    def test_destroy(self):
+        lecture = Lecture.objects.create(
+            course=self.data.courses[0], location=self.data.locations[0], day="الجمعة", starttime="20:00", endtime="21:00",
+        )
+        self.assertBudget("delete", f"/lecture/{lecture.id}/delete/", 9, status=204)
+
+    def test_enroll(self):
+        self.assertBudget("post", "/lecture/enroll/", 85, data={
+            "studentid": self.data.students[-1].id, "courseids": [course.id for course in self.data.courses[:4]],
+        })
+
+    def test_student_lectures_use_index(self):
+        self.assertUsesIndex(Lecture.students.through.objects.filter(user_id=self.user.id))
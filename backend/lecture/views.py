@@ -1,4 +1,6 @@
 from rest_framework.generics import ListAPIView, CreateAPIView, RetrieveAPIView, DestroyAPIView, UpdateAPIView
+from edu_track.conditional import ConditionalGetMixin
+from edu_track.response_cache import CachedResponseMixin
 from rest_framework.views import APIView
 from .models import Lecture
 from .serializers import LectureSerializer, EnrollStudentSerializer
@@ -9,12 +11,17 @@ from django.shortcuts import get_object_or_404
 from user.models import User
 from attendance.models import StudentMark
 from django.db import transaction
-from django.db.utils import OperationalError
-import time
+from django.db.models import Prefetch
 
 # Create your views here.
-class ListLecture(ListAPIView):
-    queryset =  Lecture.objects.all()
+class ListLecture(ConditionalGetMixin, CachedResponseMixin, ListAPIView):
+    etag_models = (Lecture, User)
+    cache_timeout = 5 * 60
+    # '__all__' includes both m2m id lists plus instructor_details
+    queryset =  Lecture.objects.prefetch_related(
+        Prefetch('instructor', queryset=User.objects.only('id', 'first_name', 'last_name')),
+        Prefetch('students', queryset=User.objects.only('id')),
+    )
     serializer_class = LectureSerializer
     permission_classes = [type('CustomPerm',(GroupPermission,),{'required_permission': 'lecture.view_lecture'})]
 
@@ -24,7 +31,8 @@ class CreateLecture(CreateAPIView):
     serializer_class = LectureSerializer
     permission_classes = [type('CustomPerm',(GroupPermission,),{'required_permission': 'lecture.add_lecture'})]
 
-class RetrieveLecture(RetrieveAPIView):
+class RetrieveLecture(ConditionalGetMixin, RetrieveAPIView):
+    etag_models = (Lecture, User)
     queryset =  Lecture.objects.all()
     serializer_class = LectureSerializer
     permission_classes = [type('CustomPerm',(GroupPermission,),{'required_permission': 'lecture.view_lecture'})]
@@ -53,33 +61,22 @@ class EnrollStudentInCourses(APIView):
             lectures = Lecture.objects.filter(course__in=courseids)
             if not lectures.exists():
                 return Response({"detail": "No lectures found for the given courses."}, status=status.HTTP_404_NOT_FOUND)
-            # Retry loop to handle sqlite 'database is locked' under concurrent access
-            max_retries = 5
-            delay = 0.15
-            for attempt in range(max_retries):
-                try:
-                    with transaction.atomic():
-                        for lecture in lectures:
-                            # Add student to lecture
-                            lecture.students.add(student)
-                            # Ensure a StudentMark row exists
-                            StudentMark.objects.get_or_create(
-                                student=student,
-                                lecture=lecture,
-                                defaults={
-                                    "attendance_mark": 0.0,
-                                    "instructor_mark": 0.0,
-                                    "final_mark": 0.0,
-                                },
-                            )
-                    break
-                except OperationalError as e:
-                    # Handle sqlite locking with backoff
-                    if 'database is locked' in str(e).lower() and attempt < max_retries - 1:
-                        time.sleep(delay)
-                        delay *= 1.5
-                        continue
-                    raise
+            # On SQLite this is a BEGIN IMMEDIATE transaction (settings.DATABASE_PROFILES), so
+            # concurrent enrolments wait for the write lock instead of failing with 'database is locked'
+            with transaction.atomic():
+                for lecture in lectures:
+                    # Add student to lecture
+                    lecture.students.add(student)
+                    # Ensure a StudentMark row exists
+                    StudentMark.objects.get_or_create(
+                        student=student,
+                        lecture=lecture,
+                        defaults={
+                            "attendance_mark": 0.0,
+                            "instructor_mark": 0.0,
+                            "final_mark": 0.0,
+                        },
+                    )
 
             return Response({"student": student.username, "enrolled lectures": [str(lec) for lec in lectures]}, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -2,4 +2,14 @@ from django.contrib import admin
 from .models import Location
 
 # Register your models here.
-admin.site.register(Location)
\ No newline at end of file
+@admin.register(Location)
+class LocationAdmin(admin.ModelAdmin):
+    list_display = ('name', 'slug', 'capacity')
+    list_filter = ('faculties',)
+    ordering = ('name',)
+    search_fields = ('name', 'slug')
+    filter_horizontal = ('faculties',)
+
+    def get_queryset(self, request):
+        # __str__ lists the location's faculties
+        return super().get_queryset(request).prefetch_related('faculties')
@@ -1,3 +1,24 @@
-from django.test import TestCase
+from edu_track.testing import QueryBudgetTestCase
+from .models import Location
 
-# Create your tests here.
+
+class LocationQueryBudgetTests(QueryBudgetTestCase):
+    routes = {"Location-list", "Location-create", "Location-retrieve", "Location-update", "Location-destroy"}
+
+    def test_list(self):
+        self.assertBudget("get", "/location/", 4)
+
+    def test_retrieve(self):
+        self.assertBudget("get", "/location/hall-0/", 4)
+
+    def test_create(self):
+        self.assertBudget("post", "/location/create/", 10, status=201, data={
+            "name": "Hall X", "slug": "hall-x", "capacity": 120, "faculties": [faculty.id for faculty in self.data.faculties],
+        })
+
+    def test_update(self):
+        self.assertBudget("patch", "/location/hall-0/update/", 4, data={"capacity": 90})
+
+    def test_destroy(self):
+        Location.objects.create(name="Empty", slug="empty")
+        self.assertBudget("delete", "/location/empty/delete/", 6, status=204)
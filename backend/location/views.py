@@ -1,11 +1,13 @@
 from rest_framework.generics import ListAPIView, CreateAPIView, RetrieveAPIView, DestroyAPIView, UpdateAPIView
+from edu_track.conditional import ConditionalGetMixin
 from .models import Location
 from .serializers import LocationSerializer
 from user.permissions import GroupPermission
 
 # Create your views here.
-class ListLocation(ListAPIView):
-    queryset =  Location.objects.all()
+class ListLocation(ConditionalGetMixin, ListAPIView):
+    etag_models = (Location,)
+    queryset =  Location.objects.prefetch_related('faculties')
     serializer_class = LocationSerializer
     permission_classes = [type('CustomPerm',(GroupPermission,),{'required_permission': 'location.view_location'})]
 
@@ -15,7 +17,8 @@ class CreateLocation(CreateAPIView):
     permission_classes = [type('CustomPerm',(GroupPermission,),{'required_permission': 'location.add_location'})]
 
 
-class RetrieveLocation(RetrieveAPIView):
+class RetrieveLocation(ConditionalGetMixin, RetrieveAPIView):
+    etag_models = (Location,)
     queryset =  Location.objects.all()
     serializer_class = LocationSerializer
     lookup_field = "slug"
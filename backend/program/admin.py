@@ -2,4 +2,17 @@ from django.contrib import admin
 from .models import Program
 
 # Register your models here.
-admin.site.register(Program)
+@admin.register(Program)
+class ProgramAdmin(admin.ModelAdmin):
+    list_display = ('name', 'slug', 'faculty')
+    # __str__ shows faculty and university names
+    list_select_related = ('faculty__university',)
+    list_filter = ('faculty',)
+    ordering = ('name',)
+    search_fields = ('name', 'slug')
+    autocomplete_fields = ('faculty',)
+
+    def get_search_results(self, request, queryset, search_term):
+        # Autocomplete results are rendered with __str__ too
+        queryset, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        return queryset.select_related('faculty__university'), may_have_duplicates
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ProgramConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'program'
+
+    def ready(self):
+        import program.signals
@@ -0,0 +1,9 @@
+from django.db.models.signals import post_delete, post_save
+from edu_track.catalog import bump_catalog_version
+from edu_track.conditional import track_versions
+from .models import Program
+
+post_save.connect(bump_catalog_version, sender=Program, dispatch_uid="program_catalog_version_save")
+post_delete.connect(bump_catalog_version, sender=Program, dispatch_uid="program_catalog_version_delete")
+
+track_versions(Program)
@@ -1,3 +1,24 @@
-from django.test import TestCase
+from edu_track.testing import QueryBudgetTestCase
+from .models import Program
 
-# Create your tests here.
+
+class ProgramQueryBudgetTests(QueryBudgetTestCase):
+    routes = {"Program-list", "Program-create", "Program-retrieve", "Program-update", "Program-destroy"}
+
+    def test_list(self):
+        self.assertBudget("get", "/program/", 3)
+
+    def test_retrieve(self):
+        self.assertBudget("get", "/program/program-0/", 4)
+
+    def test_create(self):
+        self.assertBudget("post", "/program/create/", 4, status=201, data={
+            "name": "Program X", "slug": "program-x", "faculty": self.data.faculties[0].id,
+        })
+
+    def test_update(self):
+        self.assertBudget("patch", "/program/program-0/update/", 4, data={"name": "Renamed"})
+
+    def test_destroy(self):
+        Program.objects.create(name="Empty", slug="empty", faculty=self.data.faculties[0])
+        self.assertBudget("delete", "/program/empty/delete/", 6, status=204)
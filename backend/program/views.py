@@ -1,10 +1,13 @@
 from rest_framework.generics import ListAPIView, CreateAPIView, RetrieveAPIView, DestroyAPIView, UpdateAPIView
+from edu_track.conditional import ConditionalGetMixin
 from .models import Program
+from faculty.models import Faculty
 from .serializers import ProgramSerializer
 from  user.permissions import GroupPermission
 
-class ListProgram(ListAPIView):
-    queryset =  Program.objects.all()
+class ListProgram(ConditionalGetMixin, ListAPIView):
+    etag_models = (Program, Faculty)
+    queryset =  Program.objects.select_related('faculty')
     serializer_class = ProgramSerializer
     permission_classes = [type('CustomPerm',(GroupPermission,),{'required_permission': 'program.view_program'})]
 
@@ -13,7 +16,8 @@ class CreateProgram(CreateAPIView):
     serializer_class = ProgramSerializer
     permission_classes = [type('CustomPerm',(GroupPermission,),{'required_permission': 'program.add_program'})]
 
-class RetrieveProgram(RetrieveAPIView):
+class RetrieveProgram(ConditionalGetMixin, RetrieveAPIView):
+    etag_models = (Program, Faculty)
     queryset =  Program.objects.all()
     serializer_class = ProgramSerializer
     lookup_field = "slug"
@@ -1,6 +1,31 @@
 from django.contrib import admin
+from edu_track.admin import LargeTableAdmin
 from .models import *
 
 # Register your models here.
-admin.site.register(SurveyQuestion)
-admin.site.register(SurveyAnswer)
\ No newline at end of file
+@admin.register(SurveyQuestion)
+class SurveyQuestionAdmin(admin.ModelAdmin):
+    list_display = ('id', 'text')
+    search_fields = ('text',)
+
+
+@admin.register(SurveyAnswer)
+class SurveyAnswerAdmin(LargeTableAdmin):
+    list_display = ('student', 'lecture', 'question', 'rating')
+    list_select_related = ('student', 'lecture__course', 'lecture__location', 'question')
+    list_filter = ('rating', 'question')
+    search_fields = ('student__username__exact',)
+    raw_id_fields = ('student', 'lecture', 'question')
+    ordering = ('-id',)
+
+
+@admin.register(SurveyRatingRollup)
+class SurveyRatingRollupAdmin(LargeTableAdmin):
+    # Maintained by survey/rollups.py, shown for inspection only
+    list_display = ('lecture', 'question', 'rating', 'count')
+    list_select_related = ('lecture__course', 'lecture__location', 'question')
+    list_filter = ('rating',)
+    readonly_fields = ('lecture', 'question', 'rating', 'count')
+
+    def has_add_permission(self, request):
+        return False
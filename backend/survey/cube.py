@@ -0,0 +1,277 @@
+import csv
+import io
+import os
+import time
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from lecture.models import Lecture
+from .models import SurveyAnswer
+from .rollups import RATING_LABELS, RATING_SCORES, labels
+
+# counts[lecture, question, level, rating] holds the answers; every other dimension
+# maps lectures to keys through a (lecture, key) membership list, so grouping by
+# e.g. faculty is counts contracted with a lecture x faculty 0/1 matrix.
+AXIS_DIMENSIONS = ("question", "level")
+MEMBERSHIP = {
+    "course": "course_id",
+    "instructor": "instructor",
+    "program": "course__programs",
+    "faculty": "course__programs__faculty",
+}
+CUBE_DIMENSIONS = ("faculty", "program", "level", "course", "instructor", "lecture", "question")
+
+CUBE_STALE_KEY = "survey:cube:stale"
+_RATING_INDEX = {rating: i for i, rating in enumerate(RATING_LABELS)}
+_SCORES = np.array([RATING_SCORES[rating] for rating in RATING_LABELS], dtype=np.float64)
+
+
+def cube_path():
+    return getattr(settings, "SURVEY_CUBE_PATH", os.path.join(settings.BASE_DIR, "var", "survey_cube.npz"))
+
+
+def mark_cube_stale():
+    # Edited/deleted answers can't be folded in incrementally, the next refresh rebuilds
+    cache.set(CUBE_STALE_KEY, True, None)
+
+
+class SurveyCube:
+    def __init__(self, keys, counts, members, max_answer_id, built_at=None):
+        self.keys = keys              # dimension -> array of ids (level -> array of labels)
+        self.counts = counts          # int64 (lectures, questions, levels, ratings)
+        self.members = members        # dimension -> (lecture index array, key index array)
+        self.max_answer_id = max_answer_id
+        self.built_at = built_at or time.time()
+        self._matrices = {}
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    # Building
+
+    @classmethod
+    def from_groups(cls, lecture_ids, question_ids, levels, ratings, counts, max_answer_id):
+        """Cube from grouped answer rows (parallel sequences), e.g. one GROUP BY result."""
+        lecture_ids = np.asarray(lecture_ids, dtype=np.int64)
+        question_ids = np.asarray(question_ids, dtype=np.int64)
+        levels = np.asarray(levels, dtype=str)
+        rating_idx = np.asarray(ratings, dtype=np.int64)
+        counts = np.asarray(counts, dtype=np.int64)
+
+        lecture_keys, lecture_idx = np.unique(lecture_ids, return_inverse=True)
+        question_keys, question_idx = np.unique(question_ids, return_inverse=True)
+        level_keys, level_idx = np.unique(levels, return_inverse=True)
+        dense = np.zeros((len(lecture_keys), len(question_keys), len(level_keys), len(RATING_LABELS)), dtype=np.int64)
+        np.add.at(dense, (lecture_idx, question_idx, level_idx, rating_idx), counts)
+
+        keys = {"lecture": lecture_keys, "question": question_keys, "level": level_keys}
+        members = {}
+        for dimension, lookup in MEMBERSHIP.items():
+            pairs = np.array(list(
+                Lecture.objects.filter(id__in=lecture_keys.tolist(), **{f"{lookup}__isnull": False})
+                .values_list("id", lookup).distinct().order_by()
+            ), dtype=np.int64).reshape(-1, 2)
+            keys[dimension], key_idx = np.unique(pairs[:, 1], return_inverse=True)
+            members[dimension] = (np.searchsorted(lecture_keys, pairs[:, 0]), key_idx.astype(np.int64))
+        return cls(keys, dense, members, max_answer_id)
+
+    @classmethod
+    def build(cls, answers=None, base=None):
+        """
+        One GROUP BY (lecture, question, student level, rating) over `answers`,
+        added on top of `base` (a previous cube) when given.
+        """
+        answers = SurveyAnswer.objects.all() if answers is None else answers
+        rows = (
+            answers.values_list("lecture_id", "question_id", "student__level", "rating")
+            .annotate(n=Count("id")).order_by()
+        )
+        columns = [[], [], [], [], []]
+        for lecture_id, question_id, level, rating, n in rows.iterator(chunk_size=5000):
+            if rating not in _RATING_INDEX:
+                continue
+            columns[0].append(lecture_id)
+            columns[1].append(question_id)
+            columns[2].append(level or "")
+            columns[3].append(_RATING_INDEX[rating])
+            columns[4].append(n)
+        max_answer_id = answers.order_by("-id").values_list("id", flat=True).first() or 0
+        if base is not None:
+            for column, values in zip(columns, base.groups()):
+                column.extend(values.tolist())
+            max_answer_id = max(max_answer_id, base.max_answer_id)
+        return cls.from_groups(*columns, max_answer_id=max_answer_id)
+
+    def groups(self):
+        """The non-zero cells back as grouped rows, see from_groups()."""
+        l, q, v, r = np.nonzero(self.counts)
+        return self.keys["lecture"][l], self.keys["question"][q], self.keys["level"][v], r, self.counts[l, q, v, r]
+
+    # Storage
+
+    def save(self, path=None):
+        path = path or cube_path()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        arrays = {"counts": self.counts, "meta": np.array([self.max_answer_id, self.built_at], dtype=np.float64)}
+        for dimension, values in self.keys.items():
+            arrays[f"keys_{dimension}"] = values
+        for dimension, (lecture_idx, key_idx) in self.members.items():
+            arrays[f"members_{dimension}"] = np.stack([lecture_idx, key_idx])
+        # Write next to the target and rename, so readers never see half a file
+        tmp = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez_compressed(tmp, **arrays)
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path=None):
+        with np.load(path or cube_path(), allow_pickle=False) as data:
+            keys = {name[5:]: data[name] for name in data.files if name.startswith("keys_")}
+            members = {name[8:]: tuple(data[name]) for name in data.files if name.startswith("members_")}
+            max_answer_id, built_at = data["meta"]
+            return cls(keys, data["counts"], members, int(max_answer_id), float(built_at))
+
+    # Querying
+
+    def membership(self, dimension):
+        """Dense lectures x keys 0/1 matrix for a membership dimension."""
+        if dimension not in self._matrices:
+            lecture_idx, key_idx = self.members[dimension]
+            matrix = np.zeros((len(self.keys["lecture"]), len(self.keys[dimension])), dtype=np.uint8)
+            matrix[lecture_idx, key_idx] = 1
+            self._matrices[dimension] = matrix
+        return self._matrices[dimension]
+
+    def _selection(self, dimension, values):
+        keys = self.keys[dimension]
+        if dimension != "level":
+            values = [int(value) for value in values]
+        return np.flatnonzero(np.isin(keys, values))
+
+    def slice(self, by=(), filters=None):
+        """
+        Aggregate over `filters` ({dimension: [ids]}) grouped by the `by` dimensions.
+        Returns (key arrays per `by` dimension, counts array shaped [*by, ratings]).
+        """
+        counts = self.counts
+        lectures = np.ones(len(self.keys["lecture"]), dtype=bool)
+        selected = {}
+        for dimension, values in (filters or {}).items():
+            selected[dimension] = index = self._selection(dimension, values)
+            if dimension == "question":
+                counts = counts[:, index]
+            elif dimension == "level":
+                counts = counts[:, :, index]
+            elif dimension == "lecture":
+                lectures &= np.isin(np.arange(len(lectures)), index)
+            else:
+                lectures &= self.membership(dimension)[:, index].any(axis=1)
+        counts = counts[lectures]
+
+        # Einsum over lqvr: lecture-level dimensions contribute an (l x key) matrix each
+        operands, subscripts, output, keys = [counts], ["lqvr"], "", []
+        letters = iter("abcdefghijk")
+        for dimension in by:
+            if dimension in AXIS_DIMENSIONS:
+                output += "q" if dimension == "question" else "v"
+                index = selected.get(dimension, np.arange(len(self.keys[dimension])))
+            elif dimension == "lecture":
+                output += "l"
+                index = np.flatnonzero(lectures)
+            else:
+                letter = next(letters)
+                matrix = self.membership(dimension)[lectures]
+                index = np.arange(matrix.shape[1])
+                if dimension in selected:
+                    index = selected[dimension]
+                    matrix = matrix[:, index]
+                operands.append(matrix)
+                subscripts.append("l" + letter)
+                output += letter
+            keys.append(self.keys[dimension][index])
+        result = np.einsum(",".join(subscripts) + "->" + output + "r", *operands, optimize=True)
+        return keys, result
+
+    def rows(self, by=(), filters=None):
+        """slice() as a list of {dimension: key, ..., distribution, total, average_score}, empty cells dropped."""
+        keys, result = self.slice(by, filters)
+        names = {dimension: labels(dimension, keys[i].tolist()) for i, dimension in enumerate(by) if dimension != "level"}
+        totals = result.sum(axis=-1)
+        rows = []
+        for cell in zip(*np.nonzero(totals)) if by else [()]:
+            distribution = result[cell]
+            total = int(totals[cell])
+            row = {}
+            for i, dimension in enumerate(by):
+                key = keys[i][cell[i]].item()
+                row[dimension] = key
+                if dimension != "level":
+                    row[f"{dimension}_label"] = names[dimension].get(key)
+            row["distribution"] = dict(zip(RATING_LABELS, distribution.tolist()))
+            row["total"] = total
+            row["average_score"] = round(float(distribution @ _SCORES) / total, 3) if total else None
+            rows.append(row)
+        return rows
+
+
+def to_csv(rows, by):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    header = []
+    for dimension in by:
+        header += [dimension] if dimension == "level" else [dimension, f"{dimension}_label"]
+    writer.writerow(header + RATING_LABELS + ["total", "average_score"])
+    for row in rows:
+        writer.writerow(
+            [row[column] for column in header]
+            + [row["distribution"][rating] for rating in RATING_LABELS]
+            + [row["total"], row["average_score"]]
+        )
+    # BOM so Excel opens the Arabic labels as UTF-8
+    return "\ufeff" + buffer.getvalue()
+
+
+def refresh_cube(full=False):
+    """
+    Bring the stored cube up to date and return (cube, mode).
+
+    New answers (id above the last build) are folded into the existing counts;
+    a full rebuild happens when asked, when there is no cube yet, or when answers
+    were edited or deleted since the last build.
+    """
+    base = None
+    if not full and not cache.get(CUBE_STALE_KEY):
+        try:
+            base = SurveyCube.load()
+        except (OSError, KeyError, ValueError):
+            base = None
+    if base is not None and SurveyAnswer.objects.filter(id__lte=base.max_answer_id).count() != base.total:
+        base = None
+    cache.delete(CUBE_STALE_KEY)
+    if base is None:
+        cube, mode = SurveyCube.build(), "full"
+    else:
+        cube, mode = SurveyCube.build(SurveyAnswer.objects.filter(id__gt=base.max_answer_id), base=base), "incremental"
+    cube.save()
+    _loaded.update(cube=cube, mtime=os.path.getmtime(cube_path()))
+    return cube, mode
+
+
+_loaded = {"cube": None, "mtime": None}
+
+
+def current_cube():
+    """The stored cube, kept in memory until the file changes; refreshed once it is older than SURVEY_CUBE_MAX_AGE."""
+    path = cube_path()
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return refresh_cube(full=True)[0]
+    if _loaded["mtime"] != mtime:
+        _loaded.update(cube=SurveyCube.load(path), mtime=mtime)
+    cube = _loaded["cube"]
+    if cache.get(CUBE_STALE_KEY) or time.time() - cube.built_at > getattr(settings, "SURVEY_CUBE_MAX_AGE", 300):
+        cube = refresh_cube()[0]
+    return cube
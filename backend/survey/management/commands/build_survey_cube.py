@@ -0,0 +1,18 @@
+import time
+from django.core.management.base import BaseCommand
+from survey.cube import cube_path, refresh_cube
+
+
+class Command(BaseCommand):
+    help = "Refresh the survey analytics cube, folding in new answers (or rebuilding it with --full)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="Rebuild from every answer instead of only new ones")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        cube, mode = refresh_cube(full=options["full"])
+        self.stdout.write(self.style.SUCCESS(
+            f"{mode} refresh: {cube.total} answers, counts {cube.counts.shape} -> {cube_path()} "
+            f"in {time.perf_counter() - started:.2f}s"
+        ))
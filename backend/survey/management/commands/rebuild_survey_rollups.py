@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from survey.rollups import rebuild
+
+
+class Command(BaseCommand):
+    help = "Recompute the survey rating rollups from the raw SurveyAnswer rows."
+
+    def handle(self, *args, **options):
+        rows = rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rows} rollup rows.'))
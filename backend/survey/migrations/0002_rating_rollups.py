@@ -0,0 +1,39 @@
+# Generated by Django 5.2.4 on 2026-10-18 23:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_rollups(apps, schema_editor):
+    SurveyAnswer = apps.get_model('survey', 'SurveyAnswer')
+    SurveyRatingRollup = apps.get_model('survey', 'SurveyRatingRollup')
+    rows = SurveyAnswer.objects.values('lecture_id', 'question_id', 'rating').annotate(n=models.Count('id')).order_by()
+    SurveyRatingRollup.objects.bulk_create(
+        [SurveyRatingRollup(lecture_id=r['lecture_id'], question_id=r['question_id'], rating=r['rating'], count=r['n']) for r in rows],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lecture', '0005_remove_lecture_instructor_lecture_instructor'),
+        ('survey', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SurveyRatingRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rating', models.CharField(choices=[('ممتاز', 'ممتاز'), ('جيد جدا', 'جيد جدا'), ('جيد', 'جيد'), ('مقبول', 'مقبول'), ('ضعيف', 'ضعيف')], max_length=10)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('lecture', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='survey_rollups', to='lecture.lecture')),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='survey_rollups', to='survey.surveyquestion')),
+            ],
+            options={
+                'unique_together': {('lecture', 'question', 'rating')},
+            },
+        ),
+        migrations.RunPython(populate_rollups, migrations.RunPython.noop),
+    ]
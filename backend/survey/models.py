@@ -18,5 +18,19 @@ class SurveyAnswer(models.Model):
     rating = models.CharField(choices=ratings) 
 
     class Meta:
+        # Its index also serves the (lecture, question) lookups of results and submissions
         unique_together = ('lecture', 'question', 'student')
 
+
+class SurveyRatingRollup(models.Model):
+    # Running count of answers per (lecture, question, rating), maintained by survey/rollups.py
+    lecture = models.ForeignKey(Lecture, on_delete=models.CASCADE, related_name="survey_rollups")
+    question = models.ForeignKey(SurveyQuestion, on_delete=models.CASCADE, related_name="survey_rollups")
+    rating = models.CharField(max_length=10, choices=ratings)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('lecture', 'question', 'rating')
+
+    def __str__(self):
+        return f"{self.lecture_id} / {self.question_id} / {self.rating}: {self.count}"
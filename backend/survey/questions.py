@@ -0,0 +1,23 @@
+from django.core.cache import cache
+from .models import SurveyQuestion
+
+# The questionnaire changes a few times a year; every survey page load reads it
+QUESTIONS_CACHE_KEY = "survey:questions"
+QUESTIONS_CACHE_TIMEOUT = 60 * 60
+
+
+def _load_questions():
+    return list(SurveyQuestion.objects.order_by("id").values("id", "text"))
+
+
+def cached_questions():
+    """All survey questions as [{"id", "text"}], served from the cache."""
+    return cache.get_or_set(QUESTIONS_CACHE_KEY, _load_questions, QUESTIONS_CACHE_TIMEOUT)
+
+
+def cached_question_ids():
+    return {question["id"] for question in cached_questions()}
+
+
+def invalidate_questions():
+    cache.delete(QUESTIONS_CACHE_KEY)
@@ -0,0 +1,137 @@
+from collections import Counter, defaultdict
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from course.models import Course
+from faculty.models import Faculty
+from lecture.models import Lecture
+from program.models import Program
+from user.models import User
+from .models import SurveyAnswer, SurveyQuestion, SurveyRatingRollup, ratings
+
+RATING_LABELS = [value for value, _ in ratings]
+# ممتاز = 5 ... ضعيف = 1
+RATING_SCORES = {value: len(ratings) - i for i, (value, _) in enumerate(ratings)}
+
+# Dimensions reachable from the rollup row directly (FK chains, no fan-out)
+DIRECT_DIMENSIONS = {
+    "lecture": "lecture_id",
+    "question": "question_id",
+    "course": "lecture__course_id",
+}
+# Many-to-many dimensions, resolved per lecture so an answer is counted once per key
+LECTURE_DIMENSIONS = {
+    "instructor": "instructor",
+    "program": "course__programs",
+    "faculty": "course__programs__faculty",
+}
+DIMENSIONS = list(DIRECT_DIMENSIONS) + list(LECTURE_DIMENSIONS)
+
+# Model and columns used to label each dimension's keys in one query
+LABELS = {
+    "lecture": (Lecture, ("course__title", "day", "starttime")),
+    "question": (SurveyQuestion, ("text",)),
+    "course": (Course, ("title",)),
+    "instructor": (User, ("first_name", "last_name")),
+    "program": (Program, ("name",)),
+    "faculty": (Faculty, ("name",)),
+}
+
+
+def apply_deltas(deltas):
+    """
+    Add `deltas` ({(lecture_id, question_id, rating): n}) to the rollup table.
+
+    Missing keys are inserted at zero in one statement (ignoring rows another
+    request created meanwhile), then one UPDATE ... SET count = count + n runs
+    per distinct n, so a whole survey submission costs a handful of queries.
+    """
+    by_delta = defaultdict(list)
+    for key, delta in deltas.items():
+        if delta:
+            by_delta[delta].append(key)
+    if not by_delta:
+        return
+    with transaction.atomic():
+        new_keys = [key for delta, keys in by_delta.items() if delta > 0 for key in keys]
+        SurveyRatingRollup.objects.bulk_create(
+            [SurveyRatingRollup(lecture_id=lecture_id, question_id=question_id, rating=rating, count=0)
+             for lecture_id, question_id, rating in new_keys],
+            ignore_conflicts=True,
+        )
+        for delta, keys in by_delta.items():
+            match = Q()
+            for lecture_id, question_id, rating in keys:
+                match |= Q(lecture_id=lecture_id, question_id=question_id, rating=rating)
+            SurveyRatingRollup.objects.filter(match).update(count=F("count") + delta)
+
+
+@transaction.atomic
+def rebuild():
+    """Recompute every rollup row from SurveyAnswer with one GROUP BY."""
+    SurveyRatingRollup.objects.all().delete()
+    rows = (
+        SurveyAnswer.objects.values("lecture_id", "question_id", "rating")
+        .annotate(n=Count("id"))
+        .order_by()
+    )
+    SurveyRatingRollup.objects.bulk_create(
+        [SurveyRatingRollup(lecture_id=r["lecture_id"], question_id=r["question_id"], rating=r["rating"], count=r["n"]) for r in rows],
+        batch_size=500,
+    )
+    return SurveyRatingRollup.objects.count()
+
+
+def labels(by, keys):
+    model, columns = LABELS[by]
+    return {
+        row[0]: " ".join(str(part) for part in row[1:] if part)
+        for row in model.objects.filter(id__in=keys).values_list("id", *columns)
+    }
+
+
+def _summary(key, label, distribution):
+    total = sum(distribution.values())
+    score = sum(RATING_SCORES[r] * n for r, n in distribution.items()) / total if total else None
+    return {
+        "key": key,
+        "label": label,
+        "distribution": {rating: distribution.get(rating, 0) for rating in RATING_LABELS},
+        "total": total,
+        "average_score": round(score, 3) if score is not None else None,
+    }
+
+
+def aggregate(by, filters=None):
+    """
+    Rating distribution per `by` dimension, read from the rollup table only.
+
+    `filters` maps dimension names to ids and narrows the rollup rows first,
+    e.g. aggregate("question", {"faculty": 3}).
+    """
+    rollups = SurveyRatingRollup.objects.filter(count__gt=0)
+    for dimension, value in (filters or {}).items():
+        if dimension in DIRECT_DIMENSIONS:
+            rollups = rollups.filter(**{DIRECT_DIMENSIONS[dimension]: value})
+        else:
+            lecture_ids = Lecture.objects.filter(**{LECTURE_DIMENSIONS[dimension]: value}).values("id")
+            rollups = rollups.filter(lecture_id__in=lecture_ids)
+
+    buckets = defaultdict(Counter)
+    if by in DIRECT_DIMENSIONS:
+        column = DIRECT_DIMENSIONS[by]
+        for row in rollups.values(column, "rating").annotate(n=Sum("count")).order_by():
+            buckets[row[column]][row["rating"]] += row["n"]
+    else:
+        per_lecture = defaultdict(Counter)
+        for row in rollups.values("lecture_id", "rating").annotate(n=Sum("count")).order_by():
+            per_lecture[row["lecture_id"]][row["rating"]] += row["n"]
+        pairs = (
+            Lecture.objects.filter(id__in=list(per_lecture), **{f"{LECTURE_DIMENSIONS[by]}__isnull": False})
+            .values_list("id", LECTURE_DIMENSIONS[by])
+            .distinct()
+        )
+        for lecture_id, key in pairs:
+            buckets[key].update(per_lecture[lecture_id])
+
+    names = labels(by, list(buckets))
+    return [_summary(key, names.get(key), dict(distribution)) for key, distribution in sorted(buckets.items())]
@@ -1,5 +1,10 @@
+from collections import Counter
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
-from .models import SurveyQuestion, SurveyAnswer
+from lecture.models import Lecture
+from .models import SurveyQuestion, SurveyAnswer, ratings
+from .questions import cached_question_ids
+from .rollups import apply_deltas
 
 class SurveyQuestionSerializer(serializers.ModelSerializer):
     class Meta:
@@ -10,3 +15,62 @@ class SurveyAnswerSerializer(serializers.ModelSerializer):
     class Meta:
         model = SurveyAnswer
         fields = '__all__'
+
+
+class SurveySubmissionAnswerSerializer(serializers.Serializer):
+    question = serializers.IntegerField()
+    rating = serializers.ChoiceField(choices=ratings)
+
+
+class SurveySubmissionSerializer(serializers.Serializer):
+    """
+    Every answer of one student for one lecture:
+    {"lecture": 7, "answers": [{"question": 1, "rating": "ممتاز"}, ...]}.
+    The student is always the requesting user.
+    """
+    lecture = serializers.PrimaryKeyRelatedField(queryset=Lecture.objects.only("id"))
+    answers = SurveySubmissionAnswerSerializer(many=True, allow_empty=False)
+
+    def validate(self, attrs):
+        student = self.context["request"].user
+        lecture = attrs["lecture"]
+        question_ids = [answer["question"] for answer in attrs["answers"]]
+
+        if len(set(question_ids)) != len(question_ids):
+            raise serializers.ValidationError({"answers": "Each question can only be answered once."})
+        unknown = set(question_ids) - cached_question_ids()
+        if unknown:
+            raise serializers.ValidationError({"answers": f"Unknown questions: {sorted(unknown)}"})
+        if not lecture.students.filter(pk=student.pk).exists():
+            raise serializers.ValidationError({"lecture": "You are not enrolled in this lecture."})
+        answered = set(
+            SurveyAnswer.objects.filter(lecture=lecture, student=student, question_id__in=question_ids)
+            .values_list("question_id", flat=True)
+        )
+        if answered:
+            raise serializers.ValidationError({"answers": f"Already answered questions: {sorted(answered)}"})
+        return attrs
+
+    def create(self, validated_data):
+        lecture = validated_data["lecture"]
+        student = self.context["request"].user
+        answers = [
+            SurveyAnswer(lecture=lecture, question_id=answer["question"], student=student, rating=answer["rating"])
+            for answer in validated_data["answers"]
+        ]
+        try:
+            with transaction.atomic():
+                SurveyAnswer.objects.bulk_create(answers)
+                # bulk_create skips post_save, so the rollups are counted here
+                apply_deltas(Counter((lecture.id, answer.question_id, answer.rating) for answer in answers))
+        except IntegrityError:
+            # A concurrent submission for the same lecture got in first
+            raise serializers.ValidationError({"answers": "This survey has already been submitted."})
+        return answers
+
+    def to_representation(self, answers):
+        return {
+            "lecture": answers[0].lecture_id,
+            "student": answers[0].student_id,
+            "created": len(answers),
+        }
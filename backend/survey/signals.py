@@ -0,0 +1,44 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from edu_track.conditional import track_versions
+from .cube import mark_cube_stale
+from .models import SurveyAnswer, SurveyQuestion
+from .questions import invalidate_questions
+from .rollups import apply_deltas
+
+
+@receiver(pre_save, sender=SurveyAnswer)
+def remember_rollup_key(sender, instance, **kwargs):
+    # Edits (e.g. from the admin) move a count from the old key to the new one
+    instance._rollup_key = None
+    if instance.pk:
+        instance._rollup_key = (
+            SurveyAnswer.objects.filter(pk=instance.pk).values_list("lecture_id", "question_id", "rating").first()
+        )
+
+
+@receiver(post_save, sender=SurveyAnswer)
+def count_answer(sender, instance, created, **kwargs):
+    new_key = (instance.lecture_id, instance.question_id, instance.rating)
+    old_key = getattr(instance, "_rollup_key", None)
+    if created or old_key is None:
+        apply_deltas({new_key: 1})
+    elif old_key != new_key:
+        apply_deltas({old_key: -1, new_key: 1})
+        mark_cube_stale()
+
+
+@receiver(post_delete, sender=SurveyAnswer)
+def uncount_answer(sender, instance, **kwargs):
+    apply_deltas({(instance.lecture_id, instance.question_id, instance.rating): -1})
+    mark_cube_stale()
+
+
+@receiver(post_save, sender=SurveyQuestion)
+@receiver(post_delete, sender=SurveyQuestion)
+def drop_cached_questions(sender, **kwargs):
+    invalidate_questions()
+
+
+# Versions key the cached question list responses (edu_track/response_cache.py)
+track_versions(SurveyQuestion)
@@ -1,3 +1,185 @@
-from django.test import TestCase
+from collections import Counter
+from django.db.models import Count
+from edu_track.testing import QueryBudgetTestCase, SeededTestCase
+from lecture.models import Lecture
+from .cube import refresh_cube
+from .models import SurveyAnswer, SurveyRatingRollup
+from .rollups import RATING_LABELS
 
-# Create your tests here.
+SMALL_SEED = {"students": 40, "courses": 4, "lectures_per_course": 2, "students_per_lecture": 10, "sessions": 1}
+
+
+class SurveyQueryBudgetTests(QueryBudgetTestCase):
+    routes = {
+        "SurveyQuestion-list", "SurveyQuestion-retrieve", "SurveyAnswer-list", "SurveyAnswer-retrieve",
+        "SurveyAnswer-create", "SurveyAnswer-submit", "SurveyResults", "SurveyCube", "SurveyCube-refresh",
+    }
+
+    def test_list_questions(self):
+        self.assertBudget("get", "/survey/", 3)
+
+    def test_retrieve_question(self):
+        self.assertBudget("get", f"/survey/{self.data.questions[0].id}/", 2)
+
+    def test_list_answers(self):
+        self.assertBudget("get", "/survey/answers/", 2)
+
+    def test_retrieve_answer(self):
+        self.assertBudget("get", f"/survey/answers/{SurveyAnswer.objects.first().id}/", 2)
+
+    def test_create_answer(self):
+        self.assertBudget("post", "/survey/answers/create/", 10, status=201, data={
+            "lecture": self.data.lectures[0].id, "question": self.data.questions[0].id, "student": self.user.id, "rating": "جيد",
+        })
+
+    def test_submit(self):
+        self.assertBudget("post", "/survey/answers/submit/", 12, status=201, data={
+            "lecture": self.data.lectures[0].id,
+            "answers": [{"question": question.id, "rating": "ممتاز"} for question in self.data.questions],
+        })
+
+    def test_results(self):
+        self.assertBudget("get", "/survey/results/?by=course", 3)
+        self.assertBudget("get", f"/survey/results/?by=question&faculty={self.data.faculties[0].id}", 3)
+
+    def test_cube(self):
+        self.client.post("/survey/cube/refresh/?full=1")
+        self.assertBudget("get", "/survey/cube/?by=faculty,question", 3)
+
+    def test_refresh_cube(self):
+        self.assertBudget("post", "/survey/cube/refresh/?full=1", 7)
+
+    def test_hot_filters_use_indexes(self):
+        lecture = self.data.surveyed[0]
+        self.assertUsesIndex(SurveyAnswer.objects.filter(lecture=lecture, question=self.data.questions[0]))
+        self.assertUsesIndex(SurveyRatingRollup.objects.filter(lecture=lecture))
+
+
+class SurveyRollupTests(SeededTestCase):
+    seed_options = SMALL_SEED
+
+    def assertRollupsMatchAnswers(self):
+        expected = {
+            (row["lecture_id"], row["question_id"], row["rating"]): row["n"]
+            for row in SurveyAnswer.objects.values("lecture_id", "question_id", "rating").annotate(n=Count("id")).order_by()
+        }
+        actual = {
+            (row.lecture_id, row.question_id, row.rating): row.count
+            for row in SurveyRatingRollup.objects.filter(count__gt=0)
+        }
+        self.assertEqual(actual, expected)
+
+    def test_signals_keep_rollups_in_step(self):
+        lecture = self.data.surveyed[0]
+        answer = SurveyAnswer.objects.create(
+            lecture=lecture, question=self.data.questions[0], student=self.data.enrolled[lecture.id][0], rating="جيد",
+        )
+        self.assertRollupsMatchAnswers()
+        answer.rating = "ممتاز"
+        answer.save()
+        self.assertRollupsMatchAnswers()
+        SurveyAnswer.objects.filter(lecture=lecture).exclude(pk=answer.pk).first().delete()
+        self.assertRollupsMatchAnswers()
+
+    def test_results(self):
+        results = self.client.get("/survey/results/?by=course").json()["results"]
+        self.assertEqual(
+            {row["key"]: row["total"] for row in results},
+            dict(Counter(SurveyAnswer.objects.values_list("lecture__course_id", flat=True))),
+        )
+        for row in results:
+            self.assertEqual(sum(row["distribution"].values()), row["total"])
+            self.assertTrue(1 <= row["average_score"] <= 5)
+
+        faculty = self.data.faculties[0]
+        lectures = Lecture.objects.filter(course__programs__faculty=faculty)
+        results = self.client.get(f"/survey/results/?by=question&faculty={faculty.id}").json()["results"]
+        self.assertTrue(results)
+        self.assertEqual(
+            {row["key"]: row["total"] for row in results},
+            dict(Counter(SurveyAnswer.objects.filter(lecture__in=lectures).values_list("question_id", flat=True))),
+        )
+        self.assertEqual(self.client.get("/survey/results/?by=weather").status_code, 400)
+
+
+class SurveySubmissionTests(SeededTestCase):
+    seed_options = SMALL_SEED
+
+    def test_submit_counts_every_answer(self):
+        # The seed leaves the first enrolled student (self.user for this lecture) unanswered
+        lecture = self.data.surveyed[0]
+        rollups = dict(SurveyRatingRollup.objects.filter(lecture=lecture, rating="ممتاز").values_list("question_id", "count"))
+        payload = {"lecture": lecture.id, "answers": [{"question": q.id, "rating": "ممتاز"} for q in self.data.questions]}
+
+        response = self.client.post("/survey/answers/submit/", payload, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["created"], len(self.data.questions))
+        for question in self.data.questions:
+            rollup = SurveyRatingRollup.objects.get(lecture=lecture, question=question, rating="ممتاز")
+            self.assertEqual(rollup.count, rollups.get(question.id, 0) + 1)
+
+        response = self.client.post("/survey/answers/submit/", payload, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Already answered", str(response.json()["answers"]))
+
+    def test_rejects_bad_submissions(self):
+        lecture = self.data.surveyed[0]
+        question = self.data.questions[0].id
+        for answers in (
+            [{"question": question, "rating": "ممتاز"}, {"question": question, "rating": "جيد"}],
+            [{"question": 999999, "rating": "ممتاز"}],
+            [{"question": question, "rating": "rubbish"}],
+        ):
+            with self.subTest(answers=answers):
+                response = self.client.post("/survey/answers/submit/", {"lecture": lecture.id, "answers": answers}, format="json")
+                self.assertEqual(response.status_code, 400)
+
+        # Students outside the lecture can't answer for it, even with the permission
+        outsider = next(student for student in self.data.students if student not in self.data.enrolled[lecture.id])
+        outsider.groups.add(*self.user.groups.all())
+        self.client.force_authenticate(outsider)
+        answers = [{"question": question, "rating": "ممتاز"}]
+        response = self.client.post("/survey/answers/submit/", {"lecture": lecture.id, "answers": answers}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("lecture", response.json())
+        self.assertFalse(SurveyAnswer.objects.filter(student=outsider, lecture=lecture).exists())
+
+
+class SurveyCubeTests(SeededTestCase):
+    seed_options = SMALL_SEED
+
+    def test_slices_match_the_answers(self):
+        cube, mode = refresh_cube(full=True)
+        self.assertEqual((mode, cube.total), ("full", SurveyAnswer.objects.count()))
+
+        rows = cube.rows(["question", "level"])
+        expected = Counter(SurveyAnswer.objects.values_list("question_id", "student__level"))
+        self.assertEqual({(row["question"], row["level"]): row["total"] for row in rows}, dict(expected))
+
+        faculty = self.data.faculties[0]
+        lectures = Lecture.objects.filter(course__programs__faculty=faculty)
+        [row] = cube.rows(filters={"faculty": [faculty.id], "question": [self.data.questions[0].id]})
+        answers = SurveyAnswer.objects.filter(lecture__in=lectures, question=self.data.questions[0])
+        self.assertEqual(row["total"], answers.count())
+        self.assertEqual(row["distribution"], {rating: answers.filter(rating=rating).count() for rating in RATING_LABELS})
+
+        # Instructors share lectures, so each one sees every answer of their lectures
+        instructor = self.data.instructors[0]
+        rows = {row["instructor"]: row["total"] for row in cube.rows(["instructor"])}
+        self.assertEqual(rows[instructor.id], SurveyAnswer.objects.filter(lecture__instructor=instructor).count())
+
+    def test_incremental_refresh_and_csv(self):
+        refresh_cube(full=True)
+        lecture = self.data.surveyed[1]
+        SurveyAnswer.objects.create(lecture=lecture, question=self.data.questions[0], student=self.data.enrolled[lecture.id][0], rating="جيد")
+        cube, mode = refresh_cube()
+        self.assertEqual((mode, cube.total), ("incremental", SurveyAnswer.objects.count()))
+
+        SurveyAnswer.objects.filter(lecture=lecture).first().delete()
+        cube, mode = refresh_cube()
+        self.assertEqual((mode, cube.total), ("full", SurveyAnswer.objects.count()))
+
+        response = self.client.get("/survey/cube/?by=question&export=csv")
+        lines = response.content.decode("utf-8-sig").splitlines()
+        self.assertEqual(lines[0].split(","), ["question", "question_label", *RATING_LABELS, "total", "average_score"])
+        self.assertEqual(len(lines) - 1, len(self.data.questions))
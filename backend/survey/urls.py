@@ -6,6 +6,10 @@ urlpatterns = [
     path('<int:pk>/', RetrieveSurveyQuestion.as_view(), name='SurveyQuestion-retrieve'),
     path('answers/', ListSurveyAnswer.as_view(), name='SurveyAnswer-list'),
     path('answers/create/', CreateSurveyAnswer.as_view(), name='SurveyAnswer-create'),
+    path('answers/submit/', SubmitSurvey.as_view(), name='SurveyAnswer-submit'),
     path('answers/<int:pk>/', RetrieveSurveyAnswer.as_view(), name='SurveyAnswer-retrieve'),
+    path('results/', SurveyResults.as_view(), name='SurveyResults'),
+    path('cube/', SurveyCubeView.as_view(), name='SurveyCube'),
+    path('cube/refresh/', RefreshSurveyCube.as_view(), name='SurveyCube-refresh'),
 ]
 
@@ -1,10 +1,19 @@
 from rest_framework.generics import ListAPIView, CreateAPIView, RetrieveAPIView, DestroyAPIView, UpdateAPIView
+from django.http import HttpResponse
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
 from .models import *
 from .serializers import *
+from .cube import CUBE_DIMENSIONS, current_cube, refresh_cube, to_csv
+from .rollups import DIMENSIONS, aggregate
 from user.permissions import GroupPermission
+from edu_track.response_cache import CachedResponseMixin
 
 # Create your views here.
-class ListSurveyQuestion(ListAPIView):
+class ListSurveyQuestion(CachedResponseMixin, ListAPIView):
+    cache_models = (SurveyQuestion,)
+    cache_timeout = 60 * 60
     queryset =  SurveyQuestion.objects.all()
     serializer_class = SurveyQuestionSerializer
     permission_classes = [type('CustomPerm',(GroupPermission,),{'required_permission': 'survey.view_surveyquestion'})]
@@ -28,3 +37,73 @@ class CreateSurveyAnswer(CreateAPIView):
     queryset =  SurveyAnswer.objects.all()
     serializer_class = SurveyAnswerSerializer
     permission_classes = [type('CustomPerm',(GroupPermission,),{'required_permission': 'survey.add_surveyanswer'})]
+
+class SubmitSurvey(CreateAPIView):
+    """All answers for one lecture in one request, inserted with a single bulk statement."""
+    serializer_class = SurveySubmissionSerializer
+    permission_classes = [type('CustomPerm',(GroupPermission,),{'required_permission': 'survey.add_surveyanswer'})]
+
+
+class SurveyResults(APIView):
+    """
+    Rating distributions from the rollup table: `?by=question&faculty=3&lecture=7`.
+    `by` is one of lecture, question, course, instructor, program, faculty; the same
+    names work as id filters.
+    """
+    permission_classes = [type('CustomPerm',(GroupPermission,),{'required_permission': 'survey.view_surveyanswer'})]
+
+    def get(self, request):
+        by = request.query_params.get("by", "lecture")
+        if by not in DIMENSIONS:
+            return Response({"error": f"by must be one of: {', '.join(DIMENSIONS)}"}, status=status.HTTP_400_BAD_REQUEST)
+        filters = {}
+        for dimension in DIMENSIONS:
+            value = request.query_params.get(dimension)
+            if value is None:
+                continue
+            if not value.isdigit():
+                return Response({"error": f"{dimension} must be an id"}, status=status.HTTP_400_BAD_REQUEST)
+            filters[dimension] = int(value)
+        return Response({"by": by, "filters": filters, "results": aggregate(by, filters)})
+
+
+class SurveyCubeView(APIView):
+    """
+    Slice and dice the survey analytics cube (survey/cube.py).
+
+    `?by=faculty,question&level=المستوى الأول&program=2,5` groups by any of
+    faculty, program, level, course, instructor, lecture and question; the same
+    names take comma separated filter values. `&export=csv` downloads the result.
+    """
+    permission_classes = [type('CustomPerm',(GroupPermission,),{'required_permission': 'survey.view_surveyanswer'})]
+
+    def get(self, request):
+        by = [name for name in request.query_params.get("by", "").split(",") if name]
+        unknown = [name for name in by if name not in CUBE_DIMENSIONS]
+        if unknown or len(set(by)) != len(by):
+            return Response({"error": f"by must be distinct values of: {', '.join(CUBE_DIMENSIONS)}"}, status=status.HTTP_400_BAD_REQUEST)
+        filters = {}
+        for dimension in CUBE_DIMENSIONS:
+            values = [value for value in request.query_params.get(dimension, "").split(",") if value]
+            if not values:
+                continue
+            if dimension != "level" and not all(value.isdigit() for value in values):
+                return Response({"error": f"{dimension} must be a list of ids"}, status=status.HTTP_400_BAD_REQUEST)
+            filters[dimension] = values
+
+        cube = current_cube()
+        rows = cube.rows(by, filters)
+        if request.query_params.get("export") == "csv":
+            response = HttpResponse(to_csv(rows, by), content_type="text/csv; charset=utf-8")
+            response["Content-Disposition"] = f'attachment; filename="survey-{"-".join(by) or "total"}.csv"'
+            return response
+        return Response({"by": by, "filters": filters, "max_answer_id": cube.max_answer_id, "results": rows})
+
+
+class RefreshSurveyCube(APIView):
+    """Fold new answers into the cube now (`?full=1` rebuilds it from scratch)."""
+    permission_classes = [type('CustomPerm',(GroupPermission,),{'required_permission': 'survey.change_surveyanswer'})]
+
+    def post(self, request):
+        cube, mode = refresh_cube(full=request.query_params.get("full") in ("1", "true"))
+        return Response({"mode": mode, "answers": cube.total, "max_answer_id": cube.max_answer_id})
@@ -1,4 +1,8 @@
 from django.contrib import admin
 from .models import University
 
-admin.site.register(University)
+@admin.register(University)
+class UniversityAdmin(admin.ModelAdmin):
+    list_display = ('name', 'slug')
+    ordering = ('name',)
+    search_fields = ('name', 'slug')
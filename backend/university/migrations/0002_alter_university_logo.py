@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-18 23:20
+
+import edu_track.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('university', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='university',
+            name='logo',
+            field=models.ImageField(storage=edu_track.storage.media_storage, upload_to='universities'),
+        ),
+    ]
@@ -1,9 +1,10 @@
 from django.db import models
+from edu_track.storage import media_storage
 
 class University(models.Model):    
     name = models.CharField(max_length=15, unique=True)
     slug = models.SlugField(max_length=20, unique=True)  
-    logo = models.ImageField(upload_to='universities')
+    logo = models.ImageField(upload_to='universities', storage=media_storage)
 
     class Meta:
         verbose_name_plural = "Universities" 
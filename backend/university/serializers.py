@@ -1,8 +1,9 @@
 from rest_framework import serializers
 from .models import University
+from edu_track.images import RenditionsField, LOGO_RENDITIONS
 
 class UniversitySerializer(serializers.ModelSerializer):
-   
+    logo_renditions = RenditionsField(LOGO_RENDITIONS, source="logo")
     class Meta:
         model = University
         fields = '__all__'
@@ -1,3 +1,25 @@
-from django.test import TestCase
+from edu_track.testing import QueryBudgetTestCase, image_upload
+from .models import University
 
-# Create your tests here.
+
+class UniversityQueryBudgetTests(QueryBudgetTestCase):
+    routes = {
+        "university-list", "university-create", "university-retrieve", "university-update", "university-destroy",
+    }
+
+    def test_list(self):
+        self.assertBudget("get", "/university/", 3)
+
+    def test_retrieve(self):
+        self.assertBudget("get", "/university/edutrack/", 3)
+
+    def test_create(self):
+        self.assertBudget("post", "/university/create/", 4, status=201, format="multipart",
+                          data={"name": "Second", "slug": "second", "logo": image_upload()})
+
+    def test_update(self):
+        self.assertBudget("patch", "/university/edutrack/update/", 4, data={"name": "EduTrack 2"})
+
+    def test_destroy(self):
+        University.objects.create(name="Empty", slug="empty", logo=self.data.university.logo.name)
+        self.assertBudget("delete", "/university/empty/delete/", 6, status=204)
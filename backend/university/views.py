@@ -1,8 +1,10 @@
 from rest_framework.generics import ListAPIView, CreateAPIView, RetrieveAPIView, DestroyAPIView, UpdateAPIView
+from edu_track.conditional import ConditionalGetMixin
 from .models import University
 from .serializers import UniversitySerializer
 from  user.permissions import GroupPermission
-class ListUniversity(ListAPIView):
+class ListUniversity(ConditionalGetMixin, ListAPIView):
+    etag_models = (University,)
     queryset =  University.objects.all()
     serializer_class = UniversitySerializer
     permission_classes = [type('CustomPerm',(GroupPermission,),{'required_permission': 'university.view_university'})]
@@ -13,7 +15,8 @@ class CreateUniversity(CreateAPIView):
     permission_classes = [type('CustomPerm',(GroupPermission,),{'required_permission': 'university.add_university'})]
 
 
-class RetrieveUniversity(RetrieveAPIView):
+class RetrieveUniversity(ConditionalGetMixin, RetrieveAPIView):
+    etag_models = (University,)
     queryset =  University.objects.all()
     serializer_class = UniversitySerializer
     lookup_field = "slug"
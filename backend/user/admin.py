@@ -1,5 +1,24 @@
 from django.contrib import admin
+from edu_track.admin import LargeTableAdmin
 from .models import *
 
 # Register your models here.
-admin.site.register(User)
\ No newline at end of file
+@admin.register(User)
+class UserAdmin(LargeTableAdmin):
+    list_display = ('username', 'email', 'first_name', 'last_name', 'faculty', 'program', 'level', 'is_active')
+    # Faculty/program __str__ include their parents' names
+    list_select_related = ('faculty__university', 'program__faculty__university')
+    list_filter = ('level', 'is_active', 'is_staff', 'groups')
+    # Case-sensitive lookups: '^'/'=' would compile to istartswith/iexact, which wrap the
+    # column in UPPER() and can never use its index. Exact matches use the B-tree indexes;
+    # prefix LIKE uses the *_like pattern indexes Django adds on PostgreSQL
+    search_fields = ('username__startswith', 'email__startswith', 'nationalid__exact')
+    autocomplete_fields = ('university', 'faculty', 'program')
+    filter_horizontal = ('groups', 'user_permissions')
+    ordering = ('-id',)
+
+    def formfield_for_manytomany(self, db_field, request, **kwargs):
+        # Permission __str__ reads its content type; load them with the permissions
+        if db_field.name == 'user_permissions':
+            kwargs['queryset'] = db_field.remote_field.model.objects.select_related('content_type')
+        return super().formfield_for_manytomany(db_field, request, **kwargs)
@@ -0,0 +1,149 @@
+import pandas as pd
+from django.db import transaction
+from edu_track.conditional import model_version_name
+from edu_track.versions import bump
+from .models import User
+from .search import SEARCH_FIELDS, index_users
+
+# Columns the Excel sheet controls, keyed by model attname (FKs as *_id)
+IMPORT_FIELDS = [
+    "first_name", "last_name", "email", "username", "englishfullname",
+    "address", "phonenumber", "placeofbirth", "nationality", "zipcode",
+    "gender", "maritalstatus", "religion", "level",
+    "faculty_id", "program_id", "university_id",
+]
+
+# SQLite caps bound parameters per statement, keep IN (...) lists below it
+LOOKUP_CHUNK = 5000
+WRITE_BATCH = 500
+
+
+def _field_name(attname):
+    return attname[:-3] if attname.endswith("_id") else attname
+
+
+def _normalize(frame):
+    # Compare as plain python objects with a single missing marker (None)
+    frame = frame.astype(object)
+    return frame.where(frame.notna(), None)
+
+
+def _fetch_existing(national_ids):
+    """Load the sheet's existing users with one query per LOOKUP_CHUNK ids."""
+    records = []
+    for start in range(0, len(national_ids), LOOKUP_CHUNK):
+        chunk = national_ids[start:start + LOOKUP_CHUNK]
+        records.extend(
+            User.objects.filter(nationalid__in=chunk).values("id", "nationalid", *IMPORT_FIELDS)
+        )
+    existing = pd.DataFrame.from_records(records, columns=["id", "nationalid", *IMPORT_FIELDS])
+    return existing.drop_duplicates("nationalid", keep="first").set_index("nationalid")
+
+
+def plan_import(incoming):
+    """
+    Diff a cleaned sheet against the database.
+
+    `incoming` is indexed by national id and holds one column per IMPORT_FIELDS
+    entry. Returns a dict with the rows to create and the updates to apply,
+    grouped by the exact set of changed columns so each group becomes a single
+    bulk_update touching only those columns.
+    """
+    incoming = _normalize(incoming[IMPORT_FIELDS])
+    incoming = incoming[~incoming.index.duplicated(keep="last")]
+    existing = _fetch_existing(incoming.index.tolist())
+
+    to_create = incoming[~incoming.index.isin(existing.index)]
+    common = incoming.index[incoming.index.isin(existing.index)]
+
+    new = incoming.loc[common, IMPORT_FIELDS]
+    old = _normalize(existing.loc[common, IMPORT_FIELDS])
+    changed = (new != old) & ~(new.isna() & old.isna())
+    changed_rows = changed.any(axis=1)
+
+    update_groups = []
+    if changed_rows.any():
+        diff = changed[changed_rows]
+        for pattern, rows in diff.groupby(list(diff.columns), sort=False).groups.items():
+            columns = [col for col, flag in zip(diff.columns, pattern) if flag]
+            update_groups.append((columns, new.loc[rows, columns], existing.loc[rows, "id"]))
+
+    return {
+        "create": to_create,
+        "updates": update_groups,
+        "existing_ids": dict(zip(existing.index, existing["id"])),
+        "unchanged": int((~changed_rows).sum()),
+    }
+
+
+def _sync_group(user_ids, group):
+    """Make `group` the only group of every user id, touching only users that differ."""
+    through = User.groups.through
+    memberships = {}
+    for start in range(0, len(user_ids), LOOKUP_CHUNK):
+        chunk = user_ids[start:start + LOOKUP_CHUNK]
+        for user_id, group_id in through.objects.filter(user_id__in=chunk).values_list("user_id", "group_id"):
+            memberships.setdefault(user_id, set()).add(group_id)
+
+    stale = [uid for uid in user_ids if memberships.get(uid) != {group.id}]
+    if not stale:
+        return 0
+    for start in range(0, len(stale), LOOKUP_CHUNK):
+        through.objects.filter(user_id__in=stale[start:start + LOOKUP_CHUNK]).delete()
+    through.objects.bulk_create(
+        [through(user_id=uid, group_id=group.id) for uid in stale],
+        batch_size=WRITE_BATCH,
+    )
+    return len(stale)
+
+
+def apply_import(incoming, group):
+    """Apply the plan for `incoming` and return a summary of what was written."""
+    plan = plan_import(incoming)
+
+    users_to_create = []
+    for national_id, row in plan["create"].iterrows():
+        user = User(nationalid=national_id, **row.to_dict())
+        user.set_password(national_id)
+        users_to_create.append(user)
+
+    with transaction.atomic():
+        User.objects.bulk_create(users_to_create, batch_size=WRITE_BATCH)
+
+        updated_ids = []
+        reindex_ids = []
+        for columns, values, ids in plan["updates"]:
+            users = [
+                User(id=int(user_id), **dict(zip(columns, row)))
+                for user_id, row in zip(ids, values.itertuples(index=False, name=None))
+            ]
+            User.objects.bulk_update(users, [_field_name(col) for col in columns], batch_size=WRITE_BATCH)
+            updated_ids.extend(user.id for user in users)
+            if set(columns) & set(SEARCH_FIELDS):
+                reindex_ids.extend(user.id for user in users)
+
+        created_ids = [user.pk for user in users_to_create]
+        if users_to_create and None in created_ids:
+            # Backends without RETURNING on bulk insert leave pk unset
+            created_ids = list(User.objects.filter(
+                nationalid__in=[user.nationalid for user in users_to_create]
+            ).values_list("id", flat=True))
+
+        user_ids = [int(uid) for uid in plan["existing_ids"].values()] + created_ids
+        regrouped = _sync_group(user_ids, group)
+
+        # bulk_create/bulk_update skip post_save, so refresh the search documents here
+        index_users(created_ids + reindex_ids)
+        # ...and invalidate the ETags and cached responses that embed users
+        if created_ids or updated_ids:
+            transaction.on_commit(lambda: bump(model_version_name(User)))
+
+    return {
+        "processed": len(user_ids),
+        "created": len(users_to_create),
+        "updated": len(updated_ids),
+        "unchanged": plan["unchanged"],
+        "regrouped": regrouped,
+        "created_ids": created_ids,
+        "updated_ids": updated_ids,
+    }
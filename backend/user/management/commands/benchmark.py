@@ -0,0 +1,58 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from edu_track.benchmark import SCENARIOS, Bench, BenchmarkError, baseline_path, compare, load_report, save_report
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test a local server (manage.py runserver, gunicorn, ...) seeded by generate_university with "
+        "concurrent virtual users. Prints throughput and p50/p95/p99 latency per endpoint as JSON and "
+        "compares them with the stored baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("scenarios", nargs="*", metavar="scenario", help=f"Any of {', '.join(SCENARIOS)} (default: all)")
+        parser.add_argument("--url", default="http://127.0.0.1:8000", help="Local server only")
+        parser.add_argument("--prefix", default="syn", help="--prefix the data was generated with")
+        parser.add_argument("--users", type=int, default=20, help="Concurrent virtual users")
+        parser.add_argument("--iterations", type=int, default=5, help="Work per virtual user in each scenario")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--output", help="Also write the report to this file")
+        parser.add_argument("--baseline", default=None, help="Baseline report (default: BENCHMARK_BASELINE)")
+        parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline")
+        parser.add_argument("--tolerance", type=float, default=0.1, help="Allowed p95/throughput change, as a fraction")
+        parser.add_argument("--fail-on-regression", action="store_true")
+
+    def handle(self, *args, **options):
+        names = options["scenarios"] or list(SCENARIOS)
+        unknown = set(names) - set(SCENARIOS)
+        if unknown:
+            raise CommandError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+        log = lambda message: self.stderr.write(message)
+        try:
+            bench = Bench(options["url"], prefix=options["prefix"], users=options["users"],
+                          iterations=options["iterations"], seed=options["seed"])
+            report = bench.report(names, log=log)
+        except BenchmarkError as e:
+            raise CommandError(str(e))
+
+        path = options["baseline"] or baseline_path()
+        baseline = load_report(path)
+        if baseline:
+            report["baseline"] = baseline["created"]
+            report["comparison"] = compare(report, baseline, options["tolerance"])
+            for row in report["comparison"]:
+                change = row["change"]
+                line = (f"{row['scenario']:<12} {row['endpoint']:<44} p95 {change['p95_ms'] or 0:+.0%}  "
+                        f"throughput {change['throughput_rps'] or 0:+.0%}")
+                log(self.style.ERROR(line) if row["regressed"] else line)
+
+        self.stdout.write(json.dumps(report, indent=2, ensure_ascii=False))
+        if options["output"]:
+            save_report(report, options["output"])
+        if options["save_baseline"]:
+            save_report(report, path)
+            log(self.style.SUCCESS(f"Baseline saved to {path}"))
+        regressions = [row for row in report.get("comparison", ()) if row["regressed"]]
+        if regressions and options["fail_on_regression"]:
+            raise CommandError(f"{len(regressions)} endpoints regressed beyond {options['tolerance']:.0%}")
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from edu_track.images import generate_renditions, AVATAR_RENDITIONS, LOGO_RENDITIONS, EXAM_RENDITIONS
+from exam.models import ExamTable
+from faculty.models import Faculty
+from university.models import University
+from user.models import User
+
+TARGETS = [
+    (User, "picture", AVATAR_RENDITIONS),
+    (Faculty, "logo", LOGO_RENDITIONS),
+    (University, "logo", LOGO_RENDITIONS),
+    (ExamTable, "image", EXAM_RENDITIONS),
+]
+
+
+class Command(BaseCommand):
+    help = "Generate thumbnail/WebP renditions for every uploaded picture, logo and exam table image."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Re-encode renditions that already exist')
+
+    def handle(self, *args, **options):
+        for model, field, specs in TARGETS:
+            done = 0
+            names = model.objects.exclude(**{field: ""}).exclude(**{f"{field}__isnull": True}).values_list(field, flat=True)
+            for name in names.distinct().iterator():
+                fieldfile = model._meta.get_field(field).attr_class(None, model._meta.get_field(field), name)
+                if generate_renditions(fieldfile, specs, force=options['force']):
+                    done += 1
+            self.stdout.write(f'{model.__name__}.{field}: {done} images')
+        self.stdout.write(self.style.SUCCESS('Renditions are up to date.'))
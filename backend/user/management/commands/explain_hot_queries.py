@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+from edu_track.hot_queries import hot_queries, plan_problems
+
+
+class Command(BaseCommand):
+    help = "Print the query plan of each hot query and whether it uses its index. --check fails on regressions."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sql", action="store_true", help="Print the SQL as well")
+        parser.add_argument("--check", action="store_true", help="Exit non-zero when a plan scans its table or misses its index")
+
+    def handle(self, *args, **options):
+        queries = hot_queries()
+        if not queries:
+            raise CommandError("No lecture with students, instructors and survey answers to build the queries from.")
+        failed = []
+        for query in queries:
+            plan, problems = plan_problems(query.queryset, query.index)
+            status = self.style.ERROR("; ".join(problems)) if problems else self.style.SUCCESS(f"uses {query.index or 'an index'}")
+            self.stdout.write(self.style.MIGRATE_HEADING(query.name) + f"  {status}")
+            if options["sql"]:
+                self.stdout.write(f"  {query.queryset.query}")
+            for line in plan.splitlines():
+                self.stdout.write(f"  {line}")
+            if problems:
+                failed.append(query.name)
+        if failed and options["check"]:
+            raise CommandError(f"Query plans regressed: {', '.join(failed)}")
@@ -0,0 +1,95 @@
+import os
+import time
+from django.core.files import File
+from django.core.management.base import BaseCommand
+from edu_track.images import RENDITIONS_DIR
+from edu_track.storage import BLOBS_DIR, blob_references, content_addressed_fields, media_storage
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete media blobs no model references any more (and their renditions). "
+        "With --adopt, first move legacy uploads into the content-addressed store so duplicates collapse."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--adopt', action='store_true', help='Hash legacy (pre blob store) files, repoint rows at blobs and drop the unreferenced originals')
+        parser.add_argument('--grace-hours', type=float, default=24, help='Keep unreferenced blobs younger than this, they may belong to an upload in flight (default 24)')
+        parser.add_argument('--dry-run', action='store_true', help='Report only, delete nothing')
+
+    def handle(self, *args, **options):
+        storage = media_storage()
+        dry_run = options['dry_run']
+        if options['adopt']:
+            self.adopt(storage, dry_run)
+
+        references = blob_references()
+        cutoff = time.time() - options['grace_hours'] * 3600
+        removed = freed = kept = 0
+        blobs_root = storage.path(BLOBS_DIR)
+        for root, _, files in os.walk(blobs_root):
+            for filename in files:
+                path = os.path.join(root, filename)
+                name = os.path.relpath(path, storage.location).replace(os.sep, '/')
+                if references.get(name) or os.path.getmtime(path) > cutoff:
+                    kept += 1
+                    continue
+                freed += os.path.getsize(path)
+                removed += 1
+                if not dry_run:
+                    storage.delete(name)
+                    self.delete_renditions(storage, name)
+
+        shared = sum(1 for count in references.values() if count > 1)
+        verb = 'Would remove' if dry_run else 'Removed'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {removed} unreferenced blobs ({freed / 1024:.0f} KB); kept {kept}, {shared} shared by several rows.'
+        ))
+
+    def delete_renditions(self, storage, name):
+        root = os.path.splitext(name)[0]
+        renditions = storage.path(RENDITIONS_DIR)
+        if not os.path.isdir(renditions):
+            return
+        for spec in os.listdir(renditions):
+            for ext in ('webp', 'jpeg', 'png'):
+                rendition = f'{RENDITIONS_DIR}/{spec}/{root}.{ext}'
+                if storage.exists(rendition):
+                    storage.delete(rendition)
+
+    def adopt(self, storage, dry_run):
+        legacy_dirs = set()
+        adopted = 0
+        for model, field in content_addressed_fields():
+            rows = model.objects.exclude(**{field.name: ''}).exclude(**{f'{field.name}__isnull': True})
+            legacy = rows.exclude(**{f'{field.name}__startswith': f'{BLOBS_DIR}/'})
+            blob_for = {}
+            for name in legacy.values_list(field.name, flat=True).distinct().iterator():
+                if not storage.exists(name):
+                    self.stdout.write(self.style.WARNING(f'{model.__name__}.{field.name}: missing file {name}'))
+                    continue
+                if os.path.dirname(name):
+                    # Never sweep MEDIA_ROOT itself, only upload_to directories
+                    legacy_dirs.add(os.path.dirname(name))
+                if dry_run:
+                    adopted += 1
+                    continue
+                with storage.open(name, 'rb') as source:
+                    blob_for[name] = storage.save(name, File(source))
+            for name, blob in blob_for.items():
+                adopted += model.objects.filter(**{field.name: name}).update(**{field.name: blob})
+
+        self.stdout.write(f'Adopted {adopted} legacy rows into the blob store.')
+        if dry_run:
+            return
+        # The originals (and Django's _AbC123 re-upload copies) are garbage once nothing points at them
+        references = blob_references()
+        removed = 0
+        for directory in legacy_dirs:
+            _, files = storage.listdir(directory)
+            for filename in files:
+                name = f'{directory}/{filename}'
+                if not references.get(name):
+                    storage.delete(name)
+                    removed += 1
+        self.stdout.write(f'Removed {removed} legacy files no row references.')
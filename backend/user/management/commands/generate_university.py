@@ -0,0 +1,45 @@
+import datetime
+from django.core.management.base import BaseCommand, CommandError
+from edu_track.synthetic import GenerationError, Scale, SyntheticUniversity
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a synthetic university for load testing: catalog, clash-free timetable, students and "
+        "instructors, enrolments and a full term of attendance, marks and survey answers. "
+        "Deterministic for a given --seed. Use a throwaway database."
+    )
+
+    def add_arguments(self, parser):
+        defaults = Scale()
+        parser.add_argument("--students", type=int, default=defaults.students)
+        parser.add_argument("--universities", type=int, default=defaults.universities)
+        parser.add_argument("--faculties", type=int, default=defaults.faculties, help="Per university")
+        parser.add_argument("--programs", type=int, default=defaults.programs, help="Per faculty")
+        parser.add_argument("--courses", type=int, default=defaults.courses, help="Per program")
+        parser.add_argument("--sections", type=int, default=defaults.sections, help="Lectures per course")
+        parser.add_argument("--rooms", type=int, default=defaults.rooms, help="Per faculty")
+        parser.add_argument("--courses-per-student", type=int, default=defaults.courses_per_student)
+        parser.add_argument("--weeks", type=int, default=defaults.weeks, help="Attendance sessions per lecture")
+        parser.add_argument("--survey-rate", type=float, default=defaults.survey_rate, help="Share of enrolments that answer the survey")
+        parser.add_argument("--term-start", default=defaults.term_start.isoformat(), help="YYYY-MM-DD")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--prefix", default="syn", help="Prefix of every generated slug and username")
+
+    def handle(self, *args, **options):
+        try:
+            term_start = datetime.date.fromisoformat(options["term_start"])
+        except ValueError:
+            raise CommandError("--term-start must be YYYY-MM-DD")
+        scale = Scale(
+            universities=options["universities"], faculties=options["faculties"], programs=options["programs"],
+            courses=options["courses"], sections=options["sections"], rooms=options["rooms"],
+            students=options["students"], courses_per_student=options["courses_per_student"],
+            weeks=options["weeks"], survey_rate=options["survey_rate"], term_start=term_start,
+        )
+        generator = SyntheticUniversity(scale, seed=options["seed"], prefix=options["prefix"], log=self.stdout.write)
+        try:
+            stats = generator.run()
+        except GenerationError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(f"Generated {stats}"))
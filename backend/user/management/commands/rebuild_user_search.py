@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from user.models import UserSearchDocument
+from user.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the user directory search index from scratch (needed after raw SQL or queryset.update() writes)."
+
+    def handle(self, *args, **options):
+        rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {UserSearchDocument.objects.count()} users.'))
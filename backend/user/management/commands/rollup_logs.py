@@ -0,0 +1,55 @@
+from datetime import timedelta
+from django.contrib.admin.models import LogEntry
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from user.models import LogDailySummary
+
+
+class Command(BaseCommand):
+    help = "Roll admin log entries older than --days into LogDailySummary rows and delete them from the live table."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=90, help='Keep this many days of individual log entries (default 90)')
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would be rolled up')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        old = LogEntry.objects.filter(action_time__lt=cutoff)
+        groups = list(
+            old.annotate(day=TruncDate('action_time'))
+            .values('day', 'user_id', 'content_type_id', 'action_flag')
+            .annotate(n=Count('id'))
+        )
+        total = sum(g['n'] for g in groups)
+        if options['dry_run'] or not groups:
+            self.stdout.write(f'{total} entries older than {cutoff:%Y-%m-%d} in {len(groups)} daily groups.')
+            return
+
+        with transaction.atomic():
+            # Merge into summaries left by earlier runs for the same days
+            days = {g['day'] for g in groups}
+            existing = {
+                (s.day, s.user_id, s.content_type_id, s.action_flag): s
+                for s in LogDailySummary.objects.select_for_update().filter(day__in=days)
+            }
+            to_create, to_update = [], []
+            for g in groups:
+                key = (g['day'], g['user_id'], g['content_type_id'], g['action_flag'])
+                if key in existing:
+                    existing[key].count += g['n']
+                    to_update.append(existing[key])
+                else:
+                    to_create.append(LogDailySummary(
+                        day=g['day'], user_id=g['user_id'], content_type_id=g['content_type_id'],
+                        action_flag=g['action_flag'], count=g['n'],
+                    ))
+            LogDailySummary.objects.bulk_create(to_create, batch_size=500)
+            LogDailySummary.objects.bulk_update(to_update, ['count'], batch_size=500)
+            deleted, _ = old.delete()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Rolled {deleted} entries into {len(to_create)} new and {len(to_update)} updated daily summaries.'
+        ))
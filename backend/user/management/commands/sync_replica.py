@@ -0,0 +1,36 @@
+import sqlite3
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the primary SQLite database into every DATABASE_REPLICAS file, the local stand-in for "
+        "replication. With --every it keeps copying, so the replicas lag by up to that many seconds."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--every", type=float, help="Repeat every N seconds until interrupted")
+
+    def handle(self, *args, **options):
+        primary = connections["default"]
+        if primary.vendor != "sqlite":
+            raise CommandError("Only SQLite replicas are copied here; real replicas stream from the primary.")
+        if not settings.REPLICA_DATABASES:
+            raise CommandError("No replicas configured; set DATABASE_REPLICAS.")
+        while True:
+            primary.ensure_connection()
+            for alias in settings.REPLICA_DATABASES:
+                start = time.perf_counter()
+                target = sqlite3.connect(connections[alias].settings_dict["NAME"])
+                try:
+                    # Online backup: consistent even while the server keeps writing
+                    primary.connection.backup(target)
+                finally:
+                    target.close()
+                self.stdout.write(f"{alias}: synced in {time.perf_counter() - start:.2f}s")
+            if not options["every"]:
+                break
+            time.sleep(options["every"])
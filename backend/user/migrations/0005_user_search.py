@@ -0,0 +1,77 @@
+# Generated by Django 5.2.4 on 2026-10-18 23:15
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE user_usersearchdocument_fts USING fts5("
+    "document, content='user_usersearchdocument', content_rowid='user_id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='1 2 3')",
+    "CREATE TRIGGER user_usersearchdocument_ai AFTER INSERT ON user_usersearchdocument BEGIN "
+    "INSERT INTO user_usersearchdocument_fts(rowid, document) VALUES (new.user_id, new.document); END",
+    "CREATE TRIGGER user_usersearchdocument_ad AFTER DELETE ON user_usersearchdocument BEGIN "
+    "INSERT INTO user_usersearchdocument_fts(user_usersearchdocument_fts, rowid, document) "
+    "VALUES ('delete', old.user_id, old.document); END",
+    "CREATE TRIGGER user_usersearchdocument_au AFTER UPDATE ON user_usersearchdocument BEGIN "
+    "INSERT INTO user_usersearchdocument_fts(user_usersearchdocument_fts, rowid, document) "
+    "VALUES ('delete', old.user_id, old.document); "
+    "INSERT INTO user_usersearchdocument_fts(rowid, document) VALUES (new.user_id, new.document); END",
+]
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS user_usersearchdocument_au",
+    "DROP TRIGGER IF EXISTS user_usersearchdocument_ad",
+    "DROP TRIGGER IF EXISTS user_usersearchdocument_ai",
+    "DROP TABLE IF EXISTS user_usersearchdocument_fts",
+]
+POSTGRES_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX user_usersearchdocument_trgm ON user_usersearchdocument USING gin (document gin_trgm_ops)",
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS user_usersearchdocument_trgm",
+]
+
+
+def create_index(apps, schema_editor):
+    statements = {"sqlite": SQLITE_FORWARD, "postgresql": POSTGRES_FORWARD}.get(schema_editor.connection.vendor, [])
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def drop_index(apps, schema_editor):
+    statements = {"sqlite": SQLITE_BACKWARD, "postgresql": POSTGRES_BACKWARD}.get(schema_editor.connection.vendor, [])
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def index_existing_users(apps, schema_editor):
+    from user.search import SEARCH_FIELDS, build_document
+
+    User = apps.get_model('user', 'User')
+    UserSearchDocument = apps.get_model('user', 'UserSearchDocument')
+    docs = [
+        UserSearchDocument(user_id=row['id'], document=build_document(row))
+        for row in User.objects.values('id', *SEARCH_FIELDS).iterator(chunk_size=2000)
+    ]
+    UserSearchDocument.objects.bulk_create(docs, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0004_alter_user_level'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserSearchDocument',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('document', models.TextField(blank=True)),
+            ],
+        ),
+        migrations.RunPython(create_index, drop_index),
+        migrations.RunPython(index_existing_users, migrations.RunPython.noop),
+    ]
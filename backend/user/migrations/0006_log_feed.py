@@ -0,0 +1,38 @@
+# Generated by Django 5.2.4 on 2026-10-18 23:18
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin', '0003_logentry_add_action_flag_choices'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('user', '0005_user_search'),
+    ]
+
+    operations = [
+        # Keyset pagination of /logs/ seeks on (action_time, id); LogEntry belongs to
+        # django.contrib.admin so the index is added with SQL rather than Meta.indexes
+        migrations.RunSQL(
+            "CREATE INDEX IF NOT EXISTS user_logentry_time_id ON django_admin_log (action_time, id)",
+            "DROP INDEX IF EXISTS user_logentry_time_id",
+        ),
+        migrations.CreateModel(
+            name='LogDailySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('action_flag', models.PositiveSmallIntegerField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('content_type', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='contenttypes.contenttype')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='log_summaries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'Log daily summaries',
+                'unique_together': {('day', 'user', 'content_type', 'action_flag')},
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-18 23:20
+
+import edu_track.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0006_log_feed'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='picture',
+            field=models.ImageField(blank=True, null=True, storage=edu_track.storage.media_storage, upload_to='pictures'),
+        ),
+    ]
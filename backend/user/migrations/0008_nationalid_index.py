@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-19 00:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0007_alter_user_picture'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='nationalid',
+            field=models.CharField(blank=True, db_index=True, max_length=14, null=True),
+        ),
+    ]
@@ -1,8 +1,10 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
+from django.contrib.contenttypes.models import ContentType
 from university.models import University
 from faculty.models import Faculty
 from program.models import Program
+from edu_track.storage import media_storage
 
 # Create your models here.
 class User(AbstractUser):
@@ -10,11 +12,12 @@ class User(AbstractUser):
     email = models.EmailField(unique=True)
     englishfullname = models.CharField(max_length=50, blank=True, null=True)
     address = models.CharField(max_length=200, blank=True, null=True)
-    picture = models.ImageField(upload_to="pictures", blank=True, null=True)
+    picture = models.ImageField(upload_to="pictures", storage=media_storage, blank=True, null=True)
     phonenumber = models.CharField(max_length=11, blank=True, null=True)
     birthday = models.DateField(blank=True, null=True)
     placeofbirth = models.CharField(max_length=15, blank=True, null=True)
-    nationalid = models.CharField(max_length=14, blank=True, null=True)
+    # The Excel importer matches rows to users by national id
+    nationalid = models.CharField(max_length=14, blank=True, null=True, db_index=True)
     nationality = models.CharField(max_length=20, blank=True, null=True)
     zipcode = models.CharField(max_length=8, blank=True, null=True)
     gender = models.CharField(max_length=4, choices=[('ذكر', 'ذكر'), ('أنثى', 'أنثى')], blank=True, null=True)
@@ -40,6 +43,29 @@ class User(AbstractUser):
 
     def __str__(self):
         return self.username
-    
-    
-    
\ No newline at end of file
+
+
+class UserSearchDocument(models.Model):
+    # Normalized name/id/email text of one user. Indexed by an FTS5 table on SQLite
+    # and a pg_trgm GIN index on PostgreSQL, see user/search.py
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name="search_document")
+    document = models.TextField(blank=True)
+
+    def __str__(self):
+        return self.document
+
+
+class LogDailySummary(models.Model):
+    # Admin LogEntry rows older than the retention window, rolled up per day (see rollup_logs)
+    day = models.DateField()
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, related_name="log_summaries", null=True, blank=True)
+    content_type = models.ForeignKey(ContentType, on_delete=models.SET_NULL, related_name="+", null=True, blank=True)
+    action_flag = models.PositiveSmallIntegerField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ("day", "user", "content_type", "action_flag")
+        verbose_name_plural = "Log daily summaries"
+
+    def __str__(self):
+        return f"{self.day} - {self.action_flag} x{self.count}"
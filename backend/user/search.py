@@ -0,0 +1,93 @@
+import re
+import unicodedata
+from django.db import connection
+from .models import User, UserSearchDocument
+
+SEARCH_FIELDS = ("first_name", "last_name", "englishfullname", "nationalid", "username", "email")
+
+FTS_TABLE = "user_usersearchdocument_fts"
+INDEX_CHUNK = 2000
+
+# Harakat, superscript alef and tatweel carry no meaning for matching names
+_DIACRITICS = re.compile("[\u064B-\u0652\u0670\u0640]")
+_FOLD = str.maketrans({
+    "أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا",
+    "ى": "ي", "ئ": "ي",
+    "ؤ": "و",
+    "ة": "ه",
+    **{chr(0x0660 + d): str(d) for d in range(10)},
+    **{chr(0x06F0 + d): str(d) for d in range(10)},
+})
+_TOKEN = re.compile(r"\w+")
+
+
+def normalize(text):
+    """Fold Arabic letter variants, strip diacritics and casefold Latin text."""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKC", str(text))
+    text = _DIACRITICS.sub("", text).translate(_FOLD)
+    return text.casefold()
+
+
+def tokenize(text):
+    return _TOKEN.findall(normalize(text))
+
+
+def build_document(values):
+    return " ".join(tokenize(" ".join(str(values[f]) for f in SEARCH_FIELDS if values.get(f))))
+
+
+def index_users(user_ids):
+    """(Re)build the search documents of `user_ids` with bulk statements."""
+    user_ids = list(user_ids)
+    for start in range(0, len(user_ids), INDEX_CHUNK):
+        chunk = user_ids[start:start + INDEX_CHUNK]
+        docs = [
+            UserSearchDocument(user_id=row["id"], document=build_document(row))
+            for row in User.objects.filter(id__in=chunk).values("id", *SEARCH_FIELDS)
+        ]
+        UserSearchDocument.objects.filter(user_id__in=chunk).delete()
+        UserSearchDocument.objects.bulk_create(docs, batch_size=500)
+
+
+def rebuild_index():
+    UserSearchDocument.objects.all().delete()
+    ids = User.objects.order_by("id").values_list("id", flat=True)
+    index_users(list(ids))
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+
+
+def search_user_ids(query, limit=20):
+    """Return ids of the best matching users, best first. Every term is prefix matched."""
+    terms = tokenize(query)
+    if not terms:
+        return []
+
+    if connection.vendor == "sqlite":
+        # Quote each term so user input can't inject FTS5 syntax, then prefix match it
+        match = " AND ".join('"%s"*' % term for term in terms)
+        with connection.cursor() as cursor:
+            # FTS5 keeps only the best `limit` rows while scanning, so every match is ranked
+            cursor.execute(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s ORDER BY rank LIMIT %s",
+                [match, limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    if connection.vendor == "postgresql":
+        # ILIKE is served by the pg_trgm GIN index, similarity() ranks the survivors
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT user_id FROM user_usersearchdocument WHERE document ILIKE ALL(%s) "
+                "ORDER BY similarity(document, %s) DESC, user_id LIMIT %s",
+                [["%" + term + "%" for term in terms], " ".join(terms), limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    queryset = UserSearchDocument.objects.all()
+    for term in terms:
+        queryset = queryset.filter(document__icontains=term)
+    return list(queryset.order_by("user_id").values_list("user_id", flat=True)[:limit])
@@ -8,6 +8,7 @@ from djoser.serializers import (
 from faculty.serializers import FacultySerializer
 from program.serializers import ProgramSerializer
 from .models import User
+from edu_track.images import RenditionsField, AVATAR_RENDITIONS
 from django.contrib.auth.models import Group
 from django.contrib.admin.models import LogEntry
 
@@ -19,11 +20,27 @@ class GroupSerializer(ModelSerializer):
         depth = 1 
 
 
+# Fields that map 1:1 to a column, so they can be served straight from values()
+FLAT_USER_FIELDS = {
+    "id", "username", "first_name", "last_name", "email", "englishfullname", "address", "religion",
+    "phonenumber", "birthday", "placeofbirth", "nationalid", "nationality", "zipcode",
+    "gender", "maritalstatus", "level", "university",
+}
+
+# Named slim projections for `/auth/users/?view=<name>`
+USER_PROJECTIONS = {
+    "names": ("id", "first_name", "last_name"),
+    "directory": ("id", "username", "first_name", "last_name", "englishfullname", "email", "level"),
+    "roster": ("id", "username", "first_name", "last_name", "englishfullname", "nationalid", "level"),
+}
+
+
 class UserSerializer(ModelSerializer):
     # use faculty serializer to show the data of it as all feilds
     faculty = FacultySerializer(  read_only=True)
     program = ProgramSerializer(  read_only=True)
     groups = GroupSerializer(many=True,  read_only=True)
+    picture_renditions = RenditionsField(AVATAR_RENDITIONS, source="picture")
 
 
     class Meta:
@@ -33,9 +50,18 @@ class UserSerializer(ModelSerializer):
         fields = (
             "id", "username", "first_name", "last_name", "email", "englishfullname", "address", "religion", "picture", 
             "phonenumber", "birthday", "placeofbirth", "nationalid", "nationality", "zipcode", 
-            "gender", "maritalstatus", "level", "groups", "program", "faculty", "university", "lectures_attended"
+            "gender", "maritalstatus", "level", "groups", "program", "faculty", "university", "lectures_attended",
+            "picture_renditions",
         )
 
+    def __init__(self, *args, **kwargs):
+        # Sparse fieldsets: `fields=(...)` keeps only the requested subset
+        fields = kwargs.pop("fields", None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
 
   
         
@@ -46,6 +72,31 @@ class LogSerializer(ModelSerializer):
         depth = 1
 
 
+# Columns of the log feed, joined in the same query (see LogList)
+LOG_FEED_COLUMNS = (
+    "id", "action_time", "object_id", "object_repr", "change_message", "action_flag",
+    "user_id", "user__username", "content_type_id", "content_type__app_label", "content_type__model",
+)
+
+
+def flat_log(row):
+    """Shape a LOG_FEED_COLUMNS values() row like LogSerializer, minus the full user/content type objects."""
+    return {
+        "id": row["id"],
+        "action_time": row["action_time"],
+        "user": {"id": row["user_id"], "username": row["user__username"]},
+        "content_type": {
+            "id": row["content_type_id"],
+            "app_label": row["content_type__app_label"],
+            "model": row["content_type__model"],
+        } if row["content_type_id"] else None,
+        "object_id": row["object_id"],
+        "object_repr": row["object_repr"],
+        "change_message": row["change_message"],
+        "action_flag": row["action_flag"],
+    }
+
+
 # --- Registration serializers for Djoser ---
 # Djoser's default create serializer may ignore first_name/last_name unless explicitly included.
 # We extend the base serializers and expose these fields so they are persisted.
@@ -0,0 +1,21 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from edu_track.conditional import track_versions
+from edu_track.images import renditions_on_save, AVATAR_RENDITIONS
+from .models import User
+from .search import SEARCH_FIELDS, index_users
+
+
+@receiver(post_save, sender=User)
+def update_search_document(sender, instance, update_fields=None, **kwargs):
+    # Logins save only last_login, skip saves that can't change the indexed text
+    if update_fields is not None and not set(update_fields) & set(SEARCH_FIELDS):
+        return
+    index_users([instance.pk])
+
+
+# Avatars get their thumbnails at upload time so list pages never resize on the fly
+post_save.connect(renditions_on_save("picture", AVATAR_RENDITIONS), sender=User, weak=False, dispatch_uid="user_picture_renditions")
+
+# Lecture responses embed instructor names; logins alone don't change anything shown
+track_versions(User, ignore_fields=("last_login",))
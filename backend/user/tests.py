@@ -1,3 +1,292 @@
+from datetime import timedelta
+from io import BytesIO, StringIO
+import pandas as pd
+from django.contrib.admin.models import ADDITION, CHANGE, LogEntry
+from django.contrib.auth.models import Group, Permission
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from course.models import Course
+from edu_track.testing import LEVELS, PASSWORD, QueryBudgetTestCase
+from lecture.models import Lecture
+from location.models import Location
+from .importer import IMPORT_FIELDS, apply_import, plan_import
+from .models import LogDailySummary, User
+from .search import normalize, rebuild_index, search_user_ids, tokenize
 
-# Create your tests here.
+
+def roster_upload(rows=50):
+    frame = pd.DataFrame({
+        "الرقم القومي": [f"{30100000000000 + i}" for i in range(rows)],
+        "الاسم بالانجليزي": [f"Imported Student{i}" for i in range(rows)],
+        "الكلية": ["Faculty 0"] * rows,
+        "القسم": ["Program 0"] * rows,
+        "المستوى": [str(1 + i % 4) for i in range(rows)],
+        "رقم الهاتف": [f"0100000{i:04d}" for i in range(rows)],
+    })
+    buffer = BytesIO()
+    frame.to_excel(buffer, sheet_name="Sheet1", index=False)
+    return SimpleUploadedFile("students.xlsx", buffer.getvalue())
+
+
+class UserQueryBudgetTests(QueryBudgetTestCase):
+    routes = {
+        "group-list", "log-list", "user-search", "upload-excel", "api-root",
+        "user-list", "user-detail", "user-me", "user-activation", "user-resend-activation",
+        "user-reset-password", "user-reset-password-confirm", "user-reset-username", "user-reset-username-confirm",
+        "user-set-password", "user-set-username", "jwt-create", "jwt-refresh", "jwt-verify",
+    }
+
+    def test_groups(self):
+        self.assertBudget("get", "/groups/", 4)
+
+    def test_logs(self):
+        self.assertBudget("get", "/logs/", 1)
+        self.assertBudget("get", f"/logs/?user={self.data.instructors[0].id}&content_type=course.course", 1)
+
+    def test_search(self):
+        self.assertBudget("get", "/users/search/?q=Student1", 3)
+
+    def test_upload_excel(self):
+        # Parses the workbook and hashes a password per new user
+        self.assertBudget("post", "/upload-excel/", 14, status=201, ms=5000, format="multipart", data={"file": roster_upload(10)})
+
+    def test_api_root(self):
+        self.assertBudget("get", "/auth/", 0)
+
+    def test_list_users(self):
+        self.assertBudget("get", "/auth/users/", 4)
+        self.assertBudget("get", "/auth/users/?view=names", 1)
+        self.assertBudget("get", "/auth/users/?page_size=50", 4)
+
+    def test_retrieve_user(self):
+        self.assertBudget("get", f"/auth/users/{self.data.students[1].id}/", 4)
+
+    def test_update_user(self):
+        self.assertBudget("patch", f"/auth/users/{self.user.id}/", 12, data={"address": "Cairo"})
+
+    def test_create_user(self):
+        self.assertBudget("post", "/auth/users/", 10, status=201, data={
+            "username": "newcomer", "email": "newcomer@edutrack.test", "first_name": "New", "last_name": "Comer",
+            "password": "A-strong-pass-931", "re_password": "A-strong-pass-931",
+        })
+
+    def test_me(self):
+        self.assertBudget("get", "/auth/users/me/", 4)
+
+    def test_activation(self):
+        self.assertBudget("post", "/auth/users/activation/", 1, status=400, data={"uid": "MQ", "token": "bad"})
+
+    def test_resend_activation(self):
+        User.objects.filter(pk=self.data.students[2].pk).update(is_active=False)
+        self.assertBudget("post", "/auth/users/resend_activation/", 1, status=204, data={"email": self.data.students[2].email})
+
+    def test_reset_password(self):
+        self.assertBudget("post", "/auth/users/reset_password/", 1, status=204, data={"email": self.user.email})
+
+    def test_reset_password_confirm(self):
+        self.assertBudget("post", "/auth/users/reset_password_confirm/", 1, status=400, data={
+            "uid": "MQ", "token": "bad", "new_password": "A-strong-pass-931", "re_new_password": "A-strong-pass-931",
+        })
+
+    def test_reset_username(self):
+        # Unknown address, so no mail is rendered (USERNAME_RESET_CONFIRM_URL isn't configured)
+        self.assertBudget("post", "/auth/users/reset_username/", 1, status=400, data={"email": "nobody@edutrack.test"})
+
+    def test_reset_username_confirm(self):
+        self.assertBudget("post", "/auth/users/reset_username_confirm/", 2, status=400, data={
+            "uid": "MQ", "token": "bad", "new_username": "renamed",
+        })
+
+    def test_set_password(self):
+        self.assertBudget("post", "/auth/users/set_password/", 4, status=204, data={
+            "current_password": PASSWORD, "new_password": "A-strong-pass-931", "re_new_password": "A-strong-pass-931",
+        })
+
+    def test_set_username(self):
+        self.assertBudget("post", "/auth/users/set_username/", 5, status=204, data={
+            "current_password": PASSWORD, "new_username": "renamed",
+        })
+
+    def test_jwt(self):
+        response = self.assertBudget("post", "/auth/jwt/create/", 1, client=self.client_class(), data={
+            "username": self.user.username, "password": PASSWORD,
+        })
+        tokens = response.json()
+        self.assertBudget("post", "/auth/jwt/refresh/", 1, data={"refresh": tokens["refresh"]})
+        self.assertBudget("post", "/auth/jwt/verify/", 0, data={"token": tokens["access"]})
+
+    def test_hot_filters_use_indexes(self):
+        self.assertUsesIndex(User.objects.filter(username=self.user.username))
+        self.assertUsesIndex(User.objects.filter(email=self.user.email))
+
+
+class ExcelImportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.group = Group.objects.create(name="Students")
+        cls.other = Group.objects.create(name="Instructor")
+
+    def sheet(self, **overrides):
+        rows = {f"{30200000000000 + i}": {field: None for field in IMPORT_FIELDS} for i in range(3)}
+        for national_id, row in rows.items():
+            row.update(first_name="Imported", last_name=national_id[-1], email=national_id, username=national_id)
+        for national_id, values in overrides.items():
+            rows[national_id].update(values)
+        return pd.DataFrame.from_dict(rows, orient="index")
+
+    def test_plan_and_apply(self):
+        result = apply_import(self.sheet(), self.group)
+        self.assertEqual((result["created"], result["updated"], result["regrouped"]), (3, 0, 3))
+        user = User.objects.get(nationalid="30200000000001")
+        self.assertTrue(user.check_password("30200000000001"))
+        self.assertEqual(list(user.groups.all()), [self.group])
+
+        # Re-importing the same sheet writes nothing
+        plan = plan_import(self.sheet())
+        self.assertEqual((len(plan["create"]), plan["updates"], plan["unchanged"]), (0, [], 3))
+
+        user.groups.set([self.other])
+        sheet = self.sheet(**{"30200000000001": {"address": "Cairo"}, "30200000000002": {"address": "Giza", "level": LEVELS[1]}})
+        plan = plan_import(sheet)
+        self.assertEqual(sorted(columns for columns, _, _ in plan["updates"]), [["address"], ["address", "level"]])
+        self.assertEqual(plan["unchanged"], 1)
+
+        with self.assertNumQueries(8):
+            result = apply_import(sheet, self.group)
+        self.assertEqual((result["created"], result["updated"], result["unchanged"], result["regrouped"]), (0, 2, 1, 1))
+        self.assertEqual(User.objects.get(nationalid="30200000000002").level, LEVELS[1])
+        self.assertEqual(list(user.groups.all()), [self.group])
+
+    def test_import_invalidates_lecture_etags(self):
+        apply_import(self.sheet(), self.group)
+        instructor = User.objects.get(nationalid="30200000000001")
+        course = Course.objects.create(title="Imported Course", slug="imported-course")
+        room = Location.objects.create(name="Imported Hall", slug="imported-hall", capacity=40)
+        lecture = Lecture.objects.create(course=course, location=room, day="السبت", starttime="08:00", endtime="10:00")
+        lecture.instructor.add(instructor)
+        reader = User.objects.create(username="reader", email="reader@edutrack.test")
+        readers = Group.objects.create(name="Lecture readers")
+        readers.permissions.add(Permission.objects.get(content_type__app_label="lecture", codename="view_lecture"))
+        reader.groups.add(readers)
+        client = APIClient()
+        client.force_authenticate(reader)
+        etag = client.get("/lecture/")["ETag"]
+        self.assertEqual(client.get("/lecture/", HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # A bulk_update rename fires no post_save; the import bumps the version itself
+        with self.captureOnCommitCallbacks(execute=True):
+            apply_import(self.sheet(**{"30200000000001": {"first_name": "Renamed"}}), self.group)
+        response = client.get("/lecture/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]["instructor_details"][0]["first_name"], "Renamed")
+
+
+class UserProjectionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [
+            User.objects.create(username=f"user{i}", email=f"user{i}@edutrack.test", first_name=f"First{i}", last_name="Last")
+            for i in range(3)
+        ]
+        cls.users[0].is_staff = True
+        cls.users[0].save(update_fields=["is_staff"])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.users[0])
+
+    def test_named_view(self):
+        response = self.client.get("/auth/users/?view=names")
+        self.assertEqual(response.json(), [
+            {"id": user.id, "first_name": user.first_name, "last_name": "Last"} for user in self.users
+        ])
+
+    def test_sparse_fields(self):
+        with self.assertNumQueries(1):
+            rows = self.client.get("/auth/users/?fields=id,username").json()
+        self.assertEqual(rows[1], {"id": self.users[1].id, "username": "user1"})
+
+        # Nested fields fall back to the serializer, still limited to what was asked for
+        rows = self.client.get(f"/auth/users/{self.users[1].id}/?fields=username,faculty,groups").json()
+        self.assertEqual(rows, {"username": "user1", "faculty": None, "groups": []})
+
+    def test_unknown_fields(self):
+        self.assertEqual(self.client.get("/auth/users/?fields=id,password").status_code, 400)
+        self.assertEqual(self.client.get("/auth/users/?view=everything").status_code, 400)
+
+
+class UserSearchTests(TestCase):
+    def test_normalize(self):
+        # Hamza forms, alef maqsura, ta marbuta, harakat, tatweel and Arabic-Indic digits all fold
+        self.assertEqual(normalize("أَحْمَد"), normalize("احمد"))
+        self.assertEqual(normalize("مصطفى فاطمة"), "مصطفي فاطمه")
+        self.assertEqual(normalize("إبراهيـــم"), "ابراهيم")
+        self.assertEqual(normalize("٢٩٩٠١"), "29901")
+        self.assertEqual(tokenize("Ahmed  ALI-Hassan"), ["ahmed", "ali", "hassan"])
+
+    def test_arabic_search(self):
+        user = User.objects.create(username="u1", email="u1@edutrack.test", first_name="أحمد", last_name="عليّ")
+        User.objects.create(username="u2", email="u2@edutrack.test", first_name="محمود", last_name="علي")
+        self.assertEqual(search_user_ids("احمد"), [user.id])
+        self.assertEqual(search_user_ids("اح عل"), [user.id])
+        self.assertEqual(search_user_ids(""), [])
+
+    def test_best_match_beyond_first_rows(self):
+        # Many weak matches inserted before the best one must not crowd it out of the ranking
+        User.objects.bulk_create([
+            User(username=f"u{i}", email=f"u{i}@edutrack.test", first_name="Omar",
+                 englishfullname=f"Omar Khaled Mahmoud Abdelrahman Elsayed {i}")
+            for i in range(600)
+        ])
+        best = User.objects.create(username="best", email="best@edutrack.test", first_name="Omar", last_name="Omar")
+        rebuild_index()
+        ids = search_user_ids("omar", limit=5)
+        self.assertEqual(len(ids), 5)
+        self.assertEqual(ids[0], best.id)
+
+
+class LogFeedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username="admin", email="admin@edutrack.test")
+        cls.content_type = ContentType.objects.get_for_model(User)
+        cls.now = now = timezone.now()
+        # Pairs share an action_time so paging has to break ties on id
+        LogEntry.objects.bulk_create([
+            LogEntry(user=cls.user, content_type=cls.content_type, object_id=str(i), object_repr=f"row {i}",
+                     action_flag=ADDITION if i % 2 else CHANGE, change_message="[]",
+                     action_time=now - timedelta(days=100 + i // 2))
+            for i in range(7)
+        ])
+
+    def test_cursor_pages(self):
+        client = APIClient()
+        seen, url = [], "/logs/?page_size=3"
+        while url:
+            body = client.get(url).json()
+            self.assertLessEqual(len(body["results"]), 3)
+            seen.extend(row["id"] for row in body["results"])
+            url = body["next"]
+        expected = list(LogEntry.objects.order_by("-action_time", "-id").values_list("id", flat=True))
+        self.assertEqual(seen, expected)
+        self.assertEqual(client.get("/logs/?cursor=garbage").status_code, 404)
+
+    def test_rollup_merges_reruns(self):
+        call_command("rollup_logs", days=102, stdout=StringIO())
+        self.assertEqual(LogEntry.objects.count(), 4)
+        self.assertEqual(sum(LogDailySummary.objects.values_list("count", flat=True)), 3)
+
+        # A late entry for an already rolled up day is merged into its summary
+        oldest = self.now - timedelta(days=103)
+        LogEntry.objects.create(user=self.user, content_type=self.content_type, object_id="6", object_repr="row 6",
+                                action_flag=CHANGE, change_message="[]", action_time=oldest)
+        call_command("rollup_logs", days=90, stdout=StringIO())
+        self.assertFalse(LogEntry.objects.exists())
+        summaries = LogDailySummary.objects.filter(user=self.user, content_type=self.content_type)
+        self.assertEqual(summaries.count(), 7)
+        self.assertEqual(sum(summary.count for summary in summaries), 8)
+        self.assertEqual(summaries.get(day=oldest.date(), action_flag=CHANGE).count, 2)
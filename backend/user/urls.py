@@ -1,9 +1,15 @@
 from django.urls import path
-from .views import GroupList, LogList, UploadExcelView
+from rest_framework.routers import SimpleRouter
+from .views import GroupList, LogList, UploadExcelView, UserViewSet, UserSearch
+
+# Overrides djoser's /auth/users/ routes, so this urlconf is included before djoser's
+router = SimpleRouter()
+router.register("auth/users", UserViewSet)
 
 urlpatterns = [
     path("groups/", GroupList.as_view(), name="group-list"),
     path("logs/", LogList.as_view(), name="log-list"),
+    path("users/search/", UserSearch.as_view(), name="user-search"),
     
     path("upload-excel/", UploadExcelView.as_view(), name="upload-excel"),
-]
\ No newline at end of file
+] + router.urls
@@ -1,7 +1,7 @@
 import os   
 from rest_framework import generics
 from django.contrib.auth.models import Group
-from .serializers import GroupSerializer, LogSerializer
+from .serializers import GroupSerializer, UserSerializer, FLAT_USER_FIELDS, USER_PROJECTIONS, LOG_FEED_COLUMNS, flat_log
 from django.contrib.admin.models import LogEntry
 from rest_framework.response import Response
 from rest_framework import status
@@ -12,8 +12,14 @@ import pandas as pd
 from django.conf import settings
 from django.core.files.storage import default_storage
 from .models import User, Faculty, Program, University
-from django.db.models import Q
-from django.db import transaction
+from django.db.models import Q, Prefetch
+from djoser.views import UserViewSet as BaseUserViewSet
+from rest_framework.exceptions import ValidationError
+from lecture.models import Lecture
+from edu_track.pagination import KeysetPagination
+from .importer import apply_import
+from .search import search_user_ids
+from .permissions import GroupPermission
 
 
 # Create your views here.
@@ -22,14 +28,131 @@ class GroupList(generics.ListAPIView):
     serializer_class = GroupSerializer
 
 class LogList(generics.ListAPIView):
-    queryset = LogEntry.objects.all().order_by("-action_time")
-    serializer_class = LogSerializer
+    """
+    Newest-first admin log feed, keyset paginated on (action_time, id).
 
+    Filters: ?user=<id>, ?content_type=<id or app_label.model>, ?action_flag=1|2|3.
+    Rows come from a single values() query with the user and content type joined in.
+    """
+    queryset = LogEntry.objects.all()
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-action_time", "-id")
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        params = self.request.query_params
+        try:
+            if params.get("user"):
+                queryset = queryset.filter(user_id=int(params["user"]))
+            if params.get("action_flag"):
+                queryset = queryset.filter(action_flag=int(params["action_flag"]))
+        except ValueError:
+            raise ValidationError({"detail": "user and action_flag must be integers"})
+        content_type = params.get("content_type")
+        if content_type:
+            if content_type.isdigit():
+                queryset = queryset.filter(content_type_id=int(content_type))
+            else:
+                app_label, _, model = content_type.partition(".")
+                queryset = queryset.filter(content_type__app_label=app_label, content_type__model=model)
+        return queryset.values(*LOG_FEED_COLUMNS)
+
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.get_queryset())
+        return self.get_paginated_response([flat_log(row) for row in page])
+
+
+class UserViewSet(BaseUserViewSet):
+    """
+    Djoser's users endpoint with sparse fieldsets.
+
+    `?fields=id,first_name,last_name` or `?view=names` on list/retrieve.
+    When every requested field is a plain column the rows come straight from
+    values(); otherwise the full serializer runs on a prefetched queryset so
+    the query count stays flat however many users are listed.
+    """
+
+    def requested_fields(self):
+        if self.action not in ("list", "retrieve"):
+            return None
+        view = self.request.query_params.get("view")
+        if view:
+            if view not in USER_PROJECTIONS:
+                raise ValidationError({"view": f"Unknown view '{view}'. Choose from: {', '.join(USER_PROJECTIONS)}."})
+            return USER_PROJECTIONS[view]
+        fields = self.request.query_params.get("fields")
+        if not fields:
+            return None
+        fields = tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+        unknown = set(fields) - set(UserSerializer.Meta.fields)
+        if unknown:
+            raise ValidationError({"fields": f"Unknown fields: {', '.join(sorted(unknown))}."})
+        return fields
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action not in ("list", "retrieve"):
+            return queryset
+        fields = self.requested_fields() or UserSerializer.Meta.fields
+        if "faculty" in fields:
+            queryset = queryset.select_related("faculty")
+        if "program" in fields:
+            queryset = queryset.select_related("program__faculty")
+        if "groups" in fields:
+            queryset = queryset.prefetch_related(
+                Prefetch("groups", queryset=Group.objects.prefetch_related("permissions"))
+            )
+        if "lectures_attended" in fields:
+            queryset = queryset.prefetch_related(
+                Prefetch("lectures_attended", queryset=Lecture.objects.only("id"))
+            )
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.requested_fields()
+        if fields is not None:
+            kwargs["fields"] = fields
+        return super().get_serializer(*args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        fields = self.requested_fields()
+        if fields is None or not set(fields) <= FLAT_USER_FIELDS:
+            return super().list(request, *args, **kwargs)
+
+        # Slim path: plain dicts, no model instances and no nested serializers
+        queryset = self.filter_queryset(self.get_queryset()).order_by("id").values(*fields)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(list(queryset))
 
 
 
 
 
+
+class UserSearch(APIView):
+    """`/users/search/?q=<text>&limit=20` over Arabic and English names, national id, username and email."""
+    permission_classes = [type('CustomPerm',(GroupPermission,),{'required_permission': 'user.view_user'})]
+
+    def get(self, request):
+        query = request.query_params.get("q", "").strip()
+        try:
+            limit = min(max(int(request.query_params.get("limit", 20)), 1), 100)
+        except ValueError:
+            return Response({"error": "limit must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        ids = search_user_ids(query, limit)
+        rows = {row["id"]: row for row in User.objects.filter(id__in=ids).values(*USER_PROJECTIONS["roster"])}
+        # Keep the index's ranking order
+        return Response([rows[i] for i in ids if i in rows])
+
+
+def _text(series):
+    # Excel cells come back as str/float/NaN; keep real values as stripped text and blanks as None
+    text = series.astype(object).where(series.notna(), None).map(lambda v: str(v).strip() if v is not None else None)
+    return text.where(text != '', None)
+
+
 class UploadExcelView(APIView):
     def post(self, request):
         file = request.FILES.get("file")
@@ -86,75 +209,38 @@ class UploadExcelView(APIView):
             df['level_raw'] = df.get("المستوى", df.get("المستوي", pd.Series())).astype(str)
             df['level'] = df['level_raw'].apply(lambda x: level_map.get(x) if x in level_map else None)
 
-            # --- 3. Process Users in Batches ---
-            existing_users_national_ids = set(User.objects.filter(
-                nationalid__in=df['national_id'].tolist()).values_list('nationalid', flat=True)
-            )
+            # --- 3. Diff the sheet against existing users and write only what changed ---
+            df['faculty_id'] = df['faculty_obj'].map(lambda f: f.id if isinstance(f, Faculty) else None).astype("Int64")
+            df['program_id'] = df['program_obj'].map(lambda p: p.id if isinstance(p, Program) else None).astype("Int64")
+            incoming = pd.DataFrame({
+                "first_name": df['first_name'],
+                "last_name": df['last_name'],
+                "email": df['national_id'],
+                "username": df['national_id'],
+                "englishfullname": _text(df['english_name']),
+                "address": _text(df.get("العنوان", pd.Series(None, index=df.index))),
+                "phonenumber": _text(df.get("رقم الهاتف", pd.Series(None, index=df.index))),
+                "placeofbirth": _text(df.get("محل الميلاد", pd.Series(None, index=df.index))),
+                "nationality": _text(df.get("الجنسية", pd.Series(None, index=df.index))),
+                "zipcode": _text(df.get("الرمز البريدي", pd.Series(None, index=df.index))),
+                "gender": df['gender'],
+                "maritalstatus": df['maritalstatus'],
+                "religion": df['religion'],
+                "level": df['level'],
+                "faculty_id": df['faculty_id'],
+                "program_id": df['program_id'],
+                "university_id": university.id,
+            }).set_index(df['national_id'])
+
+            result = apply_import(incoming, group)
 
-            users_to_create = []
-            users_to_update = []
-            created_count = 0
-            
-            for _, row in df.iterrows():
-                defaults = {
-                    "first_name": row['first_name'],
-                    "last_name": row['last_name'],
-                    "email": row['national_id'],
-                    "username": row['national_id'],
-                    "englishfullname": row['english_name'] or None,
-                    "address": row.get("العنوان") or None,
-                    "phonenumber": str(row.get("رقم الهاتف")) if row.get("رقم الهاتف") else None,
-                    "placeofbirth": row.get("محل الميلاد") or None,
-                    "nationality": row.get("الجنسية") or None,
-                    "nationalid": row['national_id'],
-                    "zipcode": str(row.get("الرمز البريدي")) if row.get("الرمز البريدي") else None,
-                    "gender": row['gender'],
-                    "maritalstatus": row['maritalstatus'],
-                    "religion": row['religion'],
-                    "level": row['level'],
-                    "faculty": row['faculty_obj'],
-                    "program": row['program_obj'],
-                    "university": university,
-                }
-               
-                if row['national_id'] not in existing_users_national_ids:
-                    user = User(**defaults)
-                    user.set_password(row['national_id'])
-                    users_to_create.append(user)
-                    created_count += 1
-                else:
-                    user = User.objects.get(nationalid=row['national_id'])
-                    for key, value in defaults.items():
-                        setattr(user, key, value)
-                    user.set_password(row['national_id'])
-                    users_to_update.append(user)
-
-            with transaction.atomic():
-                # Bulk create new users
-                User.objects.bulk_create(users_to_create)
-
-                # Bulk update existing users
-                if users_to_update:
-                    User.objects.bulk_update(users_to_update, [
-                        "first_name", "last_name", "email", "username", "englishfullname",
-                        "address", "phonenumber", "placeofbirth", "nationality", "zipcode",
-                        "gender", "maritalstatus", "religion", "level", "faculty",
-                        "program", "university", "password", "nationalid"  # Password is also updatable
-                    ])
-
-            # --- 4. Bulk Group Assignment ---
-            all_processed_users = User.objects.filter(nationalid__in=df['national_id'].tolist())
-            
-            # Remove all users from any existing groups first, then add to group 2
-            for user in all_processed_users:
-                user.groups.clear()
-                user.groups.add(group)
             # Prepare response
             response_data = {
                 "success": "تم استيراد المستخدمين بنجاح",
-                "processed": len(df),
-                "created": created_count,
-                "updated": len(df) - created_count
+                "processed": result["processed"],
+                "created": result["created"],
+                "updated": result["updated"],
+                "unchanged": result["unchanged"],
             }
             
             if unmatched_faculties:
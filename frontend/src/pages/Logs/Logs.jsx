@@ -280,6 +280,7 @@ const Logs = () => {
   const [error, setError] = useState(null);
   const [hasMore, setHasMore] = useState(false);
   const [loadingMore, setLoadingMore] = useState(false);
+  const [nextUrl, setNextUrl] = useState(null);
   const { user, loading: authLoading } = useAuth();
 
   const PAGE_SIZE = 10;
@@ -292,9 +293,9 @@ const Logs = () => {
       return;
     }
 
-    const fetchPage = async (offset = 0) => {
+    const fetchPage = async () => {
       try {
-        const resp = await fetch(`${api.baseURL}/logs/?limit=${PAGE_SIZE}&offset=${offset}`, {
+        const resp = await fetch(`${api.baseURL}/logs/?page_size=${PAGE_SIZE}`, {
           method: 'GET',
           headers: api.getAuthHeaders(),
           cache: 'no-store',
@@ -307,6 +308,7 @@ const Logs = () => {
           setHasMore(false);
         } else if (data.results) {
           setLogs(data.results);
+          setNextUrl(data.next || null);
           setHasMore(Boolean(data.next));
         } else {
           const list = data.results || data.data || [];
@@ -321,7 +323,7 @@ const Logs = () => {
       }
     };
 
-    fetchPage(0);
+    fetchPage();
   }, [user, authLoading]);
 
   const stats = useMemo(() => {
@@ -354,11 +356,11 @@ const Logs = () => {
   }, [logs, stats.actionsToday, stats.totalLogs, stats.uniqueUsers]);
 
   const loadMore = async () => {
-    if (!hasMore || loadingMore) return;
+    if (!hasMore || loadingMore || !nextUrl) return;
     setLoadingMore(true);
     try {
-      const offset = logs.length;
-      const resp = await fetch(`${api.baseURL}/logs/?limit=${PAGE_SIZE}&offset=${offset}`, {
+      // The feed is cursor paginated: follow the server-provided `next` link
+      const resp = await fetch(nextUrl, {
         method: 'GET',
         headers: api.getAuthHeaders(),
         cache: 'no-store',
@@ -370,6 +372,7 @@ const Logs = () => {
         setHasMore(false);
       } else if (data.results) {
         setLogs(prev => [...prev, ...data.results]);
+        setNextUrl(data.next || null);
         setHasMore(Boolean(data.next));
       } else {
         const list = data.results || data.data || [];
@@ -173,38 +173,25 @@ export default function SurveyForm() {
         throw new Error('بيانات المستخدم أو المحاضرة غير متوفرة');
       }
 
-      // Submit each answer separately to backend
-      const payloads = (values.questions || [])
+      // All answers go to the backend in one request
+      const answers = (values.questions || [])
         .filter(q => q.score)
         .map(q => ({
-          lecture: lectureId,
           question: q.id,
-          student: user.id,
           rating: RATING_MAP[q.score],
         }));
 
-      // Submit all answers; tolerate duplicates (unique_together) as non-fatal
-      const results = await Promise.allSettled(payloads.map(p => surveyApi.createAnswer(p)));
-      const successes = results.filter(r => r.status === 'fulfilled').length;
-      const failures = results.filter(r => r.status === 'rejected');
-      const duplicates = failures.filter(r => {
-        const data = r.reason?.response?.data;
-        const msg = (data?.non_field_errors?.[0]) || data?.detail || r.reason?.message || '';
-        return /unique|already exists|unique set|موجود بالفعل/i.test(String(msg));
-      });
-      const realFailures = failures.filter(r => !duplicates.includes(r));
-
-      if (successes > 0 && realFailures.length === 0) {
-        toast.success(`تم إرسال ${successes} إجابة${duplicates.length ? ` (تم تجاهل ${duplicates.length} مكررة)` : ''}. شكراً لمشاركتك.`);
-      } else if (successes > 0 && realFailures.length > 0) {
-        const firstErr = realFailures[0]?.reason;
-        toast.apiError(firstErr, `تم حفظ ${successes} وإخفاق ${realFailures.length}.`);
-      } else if (successes === 0 && duplicates.length > 0 && realFailures.length === 0) {
-        toast.info('لقد قمت بالإجابة على هذه الاستبيان مسبقاً. لم يتم حفظ إجابات جديدة.');
-      } else {
-        // All failed for other reasons
-        const firstErr = realFailures[0]?.reason || failures[0]?.reason;
-        throw firstErr || new Error('فشل إرسال الإجابات');
+      try {
+        const result = await surveyApi.submitSurvey({ lecture: lectureId, answers });
+        toast.success(`تم إرسال ${result?.created ?? answers.length} إجابة. شكراً لمشاركتك.`);
+      } catch (err) {
+        const data = err?.response?.data;
+        const msg = [].concat(data?.answers || data?.detail || err?.message || '').join(' ');
+        if (/already/i.test(msg)) {
+          toast.info('لقد قمت بالإجابة على هذه الاستبيان مسبقاً. لم يتم حفظ إجابات جديدة.');
+        } else {
+          throw err;
+        }
       }
 
       // Mark survey as submitted (simple client-side gate)
@@ -52,6 +52,30 @@ export const surveyApi = {
     }
   },
 
+  // Submit every answer for a lecture in one request (POST /survey/answers/submit/)
+  submitSurvey: async ({ lecture, answers }) => {
+    try {
+      const response = await fetch(`${api.baseURL}/survey/answers/submit/`, {
+        method: 'POST',
+        headers: getAuthHeaders(),
+        body: JSON.stringify({ lecture, answers })
+      });
+
+      if (!response.ok) {
+        const errorJson = await response.json().catch(() => ({}));
+        const err = new Error(errorJson.detail || errorJson.error || 'فشل إرسال الإجابات');
+        err.response = { data: errorJson };
+        err.status = response.status;
+        throw err;
+      }
+
+      return await response.json();
+    } catch (error) {
+      console.error('Error submitting survey:', error);
+      throw error;
+    }
+  },
+
   // List existing answers for a student and lecture
   listAnswers: async () => {
     try {